@@ -4,8 +4,20 @@ from hasura_tooling import (
     compare_hasura_permissions_definitions_lib,
     create_or_append_relationship_e2e_tests,
     get_empty_or_missing_api_tables_lib,
+    hasura_cron_load,
+    hasura_event_trigger_traffic,
+    hasura_filter_canonical,
+    hasura_filter_evaluator,
+    hasura_metadata_changeset,
+    hasura_metadata_diff,
+    hasura_metadata_index,
     hasura_metadata_integrity_checker,
     hasura_metadata_sdk,
+    hasura_metadata_sdk_slots,
+    hasura_metadata_sdk_stream,
+    hasura_metadata_v3,
+    hasura_permission_matrix,
+    hasura_query_index,
     lookup_alias_by_actual_table_name,
     relationship_e2e_query_add_notnull,
     shard_hasura_tables_yaml_lib,
@@ -13,9 +25,13 @@ from hasura_tooling import (
     update_fn_create_relationships,
     update_fn_delete_all_permissions_by_roles,
     update_permissions_e2e_test_mapping_metadata,
+    util_file_writer,
     util_filepath_and_fileloader,
     util_introspection,
+    util_parse_cache,
+    util_persistent_metadata,
     util_postgres_query,
+    util_snapshot_cache,
     util_yaml_dumper,
     create_bq_metadata_by_role,
     remote_schema_permissions,
@@ -1,8 +1,7 @@
-import yaml
 import os
 
-from hasura_tooling.util_filepath_and_fileloader import sharded_tables_dir
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.util_filepath_and_fileloader import load_yaml, sharded_tables_dir
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
 from hasura_tooling.update_fn_create_generic_permissions_by_data_supersets import (
     permissions_block_template,
 )
@@ -19,7 +18,7 @@ def append_allow_agg_and_computed_fields_to_shards():
         for f in files:
             if f != "_table.yaml":
                 with open(os.path.join(subdir, f), "r") as p:
-                    shard_contents = yaml.safe_load(p)
+                    shard_contents = load_yaml(p)
                 if "computed_fields" not in shard_contents["permission"].keys():
                     shard_contents["permission"]["computed_fields"] = []
                 if "allow_aggregations" not in shard_contents["permission"].keys():
@@ -34,14 +33,13 @@ def append_allow_agg_and_computed_fields_to_shards():
                     shard_contents["permission"]["computed_fields"],
                     shard_contents["permission"]["filter"],
                 )
-                with open(os.path.join(subdir, f), "w") as p:
-                    yaml.dump(
-                        formatted_output_shard,
-                        p,
-                        Dumper=IndentedListYamlDumper,
-                        default_flow_style=False,
-                        sort_keys=False,
-                    )
+                dump_yaml_file(
+                    os.path.join(subdir, f),
+                    formatted_output_shard,
+                    Dumper=IndentedListYamlDumper,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
 
 
 if __name__ == "__main__":
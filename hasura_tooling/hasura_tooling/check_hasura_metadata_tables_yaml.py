@@ -1,9 +1,9 @@
 import logging
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from hasura_tooling.util_filepath_and_fileloader import (
-    yield_by_table_metadata,
+    yield_by_table_metadata_parallel,
 )
 from hasura_tooling.util_postgres_query import (
     concatenate_tuples_dict_list_to_single_dict_row,
@@ -78,12 +78,18 @@ def test_header_shard_for_duplicate_keys(table_yaml_shard_filepath: str):
         raise err
 
 
-def collect_tables_and_columns_from_tables_yaml() -> dict:
+def collect_tables_and_columns_from_tables_yaml(
+    processes: Optional[int] = None,
+) -> dict:
+    """
+    {table name: columns of its select permissions}, parsing the tables metadata with
+    `processes` worker processes (default: one per core).
+    """
     logging.info(
         "Collecting all tables & columns from graphql2/metadata/tables.yaml... please wait a min or three."
     )
     all_cols_and_tables_in_metadata: Dict[str, set] = {}
-    for table in yield_by_table_metadata():
+    for table in yield_by_table_metadata_parallel(processes):
         table_name = table["table"]["name"]
         all_cols_and_tables_in_metadata[table_name] = set()
         if "select_permissions" in table.keys():
@@ -1,8 +1,9 @@
-import yaml
 import os
 from typing import Dict, Any
 
+from hasura_tooling.hasura_filter_canonical import filters_equivalent
 from hasura_tooling.util_filepath_and_fileloader import (
+    load_yaml_file,
     sharded_tables_dir,
 )
 
@@ -27,9 +28,8 @@ def get_role_permdef_shards(role: str) -> dict:
             # parsing logic: table_name always follow `metadata/tables`.
             # This is safer than taking the last element blindly.
             table_name = subdir.split("/")[subdir.split("/").index("tables") + 1]
-            with open(os.path.join(subdir, role_file_name), "r") as p:
-                role_perm_def = yaml.safe_load(p)
-                role_aggregated_permdef[table_name] = role_perm_def["permission"]
+            role_perm_def = load_yaml_file(os.path.join(subdir, role_file_name))
+            role_aggregated_permdef[table_name] = role_perm_def["permission"]
     return role_aggregated_permdef
 
 
@@ -46,6 +46,12 @@ def diff_2_perm_def_dicts(perm1: dict, perm2: dict, case: str) -> dict:
       1. permissions present only in perm1 and absent in perm2.
       2. permissions present only in perm2 and absent in perm1.
       3. permissions present in both, but differ in definition (ex: columns, row limit, filter, etc).
+
+    Permissions loaded with load_yaml() (or decoded by hasura_metadata_sdk) have their names
+    interned, so identical column lists and filters compare element by element on identity,
+    and the column set differences are only computed for column lists that differ.
+    Filters are compared by canonical form (see hasura_filter_canonical), so equivalent
+    filters written differently, ex: a reordered `_and`, aren't a filter diff.
     """
     only_in_perm1 = dict()
     only_in_perm2 = dict()
@@ -60,20 +66,21 @@ def diff_2_perm_def_dicts(perm1: dict, perm2: dict, case: str) -> dict:
             perm2_permdef = perm2[perm1_tablename]
             # get columns diff
             table_in_both_diff_temp: Dict[str, Any] = dict()
-            cols_only_in_perm1 = set(perm1_permdef["columns"]) - set(
-                perm2_permdef["columns"]
-            )
-            if len(cols_only_in_perm1) > 0:
-                table_in_both_diff_temp[
-                    f"columns_only_in_{get_print_dict_case_keys(case)[0]}"
-                ] = cols_only_in_perm1
-            cols_only_in_perm2 = set(perm2_permdef["columns"]) - set(
-                perm1_permdef["columns"]
-            )
-            if len(cols_only_in_perm2) > 0:
-                table_in_both_diff_temp[
-                    f"columns_only_in_{get_print_dict_case_keys(case)[1]}"
-                ] = cols_only_in_perm2
+            perm1_cols = perm1_permdef["columns"]
+            perm2_cols = perm2_permdef["columns"]
+            if perm1_cols != perm2_cols:
+                perm1_cols_set = set(perm1_cols)
+                perm2_cols_set = set(perm2_cols)
+                cols_only_in_perm1 = perm1_cols_set - perm2_cols_set
+                if len(cols_only_in_perm1) > 0:
+                    table_in_both_diff_temp[
+                        f"columns_only_in_{get_print_dict_case_keys(case)[0]}"
+                    ] = cols_only_in_perm1
+                cols_only_in_perm2 = perm2_cols_set - perm1_cols_set
+                if len(cols_only_in_perm2) > 0:
+                    table_in_both_diff_temp[
+                        f"columns_only_in_{get_print_dict_case_keys(case)[1]}"
+                    ] = cols_only_in_perm2
             # get row limit diff
             if perm1_permdef["limit"] != perm2_permdef["limit"]:
                 table_in_both_diff_temp["row_limit_diff"] = {
@@ -81,7 +88,7 @@ def diff_2_perm_def_dicts(perm1: dict, perm2: dict, case: str) -> dict:
                     get_print_dict_case_keys(case)[1]: perm2_permdef["limit"],
                 }
             # get filter diff
-            if perm1_permdef["filter"] != perm2_permdef["filter"]:
+            if not filters_equivalent(perm1_permdef["filter"], perm2_permdef["filter"]):
                 table_in_both_diff_temp["filter_diff"] = {
                     get_print_dict_case_keys(case)[0]: perm1_permdef["filter"],
                     get_print_dict_case_keys(case)[1]: perm2_permdef["filter"],
@@ -1,12 +1,12 @@
 import os
 from typing import Any, Dict, List
-import yaml
 
 from hasura_tooling.util_filepath_and_fileloader import (
+    load_yaml_file,
     sharded_tables_dir,
     bigquery_api_metadata_folder,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
 
 
 def load_yaml_files(role: str, metadata_folder: str) -> dict:
@@ -24,12 +24,10 @@ def load_yaml_files(role: str, metadata_folder: str) -> dict:
         all_tables[table_name] = dict()
 
         table_yaml_header = os.path.join(table_folder, "_table.yaml")
-        with open(table_yaml_header, "r") as table_yaml_header_file:
-            _table_yaml_content = yaml.safe_load(table_yaml_header_file)
+        _table_yaml_content = load_yaml_file(table_yaml_header)
 
         role_yaml_filename = os.path.join(table_folder, role + ".yaml")
-        with open(role_yaml_filename, "r") as role_yaml_file:
-            role_yaml_content = yaml.safe_load(role_yaml_file)
+        role_yaml_content = load_yaml_file(role_yaml_filename)
         all_tables[table_name] = {**_table_yaml_content, **role_yaml_content}
 
     return all_tables
@@ -190,23 +188,21 @@ def create_bq_api_metadata_by_role(role: str, bq_project: str, overwrite: bool):
         filename = os.path.join(
             bigquery_api_metadata_folder(bq_project), f"{role}_{table_name}.yaml"
         )
-        with open(filename, "w+") as yaml_file:
-            yaml.dump(
-                bq_api_yaml_content,
-                yaml_file,
-                Dumper=IndentedListYamlDumper,
-                default_flow_style=False,
-                sort_keys=False,
-            )
+        dump_yaml_file(
+            filename,
+            bq_api_yaml_content,
+            Dumper=IndentedListYamlDumper,
+            default_flow_style=False,
+            sort_keys=False,
+        )
 
     tables_list.sort()
 
     filename = os.path.join(bigquery_api_metadata_folder(bq_project), "tables.yaml")
-    with open(filename, "w+") as yaml_file:
-        yaml.dump(
-            tables_list,
-            yaml_file,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=True,
-        )
+    dump_yaml_file(
+        filename,
+        tables_list,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=True,
+    )
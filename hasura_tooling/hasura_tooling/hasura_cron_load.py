@@ -0,0 +1,290 @@
+"""
+Webhook load of the cron triggers of Hasura metadata, simulated minute by minute.
+
+    load = simulate_cron_load(metadata.cron_triggers, datetime(2024, 1, 1), days=365)
+    load.histogram()  # {webhook deliveries in a minute: number of minutes}
+    for minute, deliveries in load.hot_minutes(10):
+        print(minute, deliveries, load.triggers_firing_at(minute))
+
+Schedules are standard 5 field cron expressions (minute, hour, day of month, month, day
+of week), evaluated in UTC like Hasura does, with `*`, lists, ranges, steps, month and
+day names, and the `@hourly`, `@daily`, `@weekly`, `@monthly` and `@yearly` macros. Like
+cron, when both the day of month and the day of week are restricted, a day matching
+either fires.
+
+A schedule is expanded with NumPy: its firing minutes within a day are a 1440 minute
+profile, set on every matching day of the window, so a year of a schedule takes
+milliseconds, and triggers with the same schedule and retries are expanded once.
+
+Retries are modeled from the triggers' `retry_conf`: with a `failure_rate`, the n-th
+retry of a firing is delivered (timeout_seconds + retry_interval_seconds) * n seconds
+after it, with weight failure_rate ** n, so `failure_rate=1` is the worst case where
+every delivery fails.
+
+NumPy is an optional dependency, see the `numpy` extra in pyproject.toml.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from hasura_tooling.hasura_metadata_sdk import CronTrigger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MINUTES_PER_DAY = 24 * 60
+
+# Hasura's RetryConfST defaults
+DEFAULT_NUM_RETRIES = 0
+DEFAULT_RETRY_INTERVAL_SECONDS = 10
+DEFAULT_TIMEOUT_SECONDS = 60
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = [
+    "JAN",
+    "FEB",
+    "MAR",
+    "APR",
+    "MAY",
+    "JUN",
+    "JUL",
+    "AUG",
+    "SEP",
+    "OCT",
+    "NOV",
+    "DEC",
+]
+_DAY_NAMES = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """The values of each field of a cron expression, days of week 0 (Sunday) to 6."""
+
+    minutes: Set[int]
+    hours: Set[int]
+    days_of_month: Set[int]
+    months: Set[int]
+    days_of_week: Set[int]
+    # whether the field isn't `*`, for cron's day of month or day of week matching
+    days_of_month_restricted: bool
+    days_of_week_restricted: bool
+
+    def matches_day(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        day_of_month = day.day in self.days_of_month
+        day_of_week = day.isoweekday() % 7 in self.days_of_week
+        if self.days_of_month_restricted and self.days_of_week_restricted:
+            return day_of_month or day_of_week
+        return day_of_month and day_of_week
+
+    def matches(self, minute: datetime) -> bool:
+        return (
+            minute.minute in self.minutes
+            and minute.hour in self.hours
+            and self.matches_day(minute)
+        )
+
+
+def parse_cron_schedule(schedule: str) -> CronSchedule:
+    """Raises ValueError for an expression that isn't a 5 field cron expression."""
+    expression = _MACROS.get(schedule.strip().lower(), schedule)
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"Expecting 5 cron fields: {schedule!r}")
+    minutes, hours, days_of_month, months, days_of_week = fields
+    return CronSchedule(
+        minutes=_parse_field(minutes, 0, 59),
+        hours=_parse_field(hours, 0, 23),
+        days_of_month=_parse_field(days_of_month, 1, 31),
+        months=_parse_field(months, 1, 12, _MONTH_NAMES, 1),
+        days_of_week={
+            day % 7 for day in _parse_field(days_of_week, 0, 7, _DAY_NAMES, 0)
+        },
+        days_of_month_restricted=not days_of_month.startswith("*"),
+        days_of_week_restricted=not days_of_week.startswith("*"),
+    )
+
+
+@dataclass
+class CronLoad:
+    """Webhook deliveries per minute from `start` (UTC), `deliveries[i]` is the
+    expected number of deliveries in the minute `start + i minutes`.
+    """
+
+    start: datetime
+    deliveries: "np.ndarray"
+    deliveries_by_trigger: Dict[str, float]
+    schedules: Dict[str, CronSchedule]
+
+    def minute(self, index: int) -> datetime:
+        return self.start + timedelta(minutes=index)
+
+    def histogram(self) -> Dict[float, int]:
+        """{deliveries in a minute: number of minutes with that many deliveries}."""
+        values, counts = np.unique(self.deliveries, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def peak(self) -> Tuple[datetime, float]:
+        """The first minute with the most deliveries."""
+        index = int(np.argmax(self.deliveries))
+        return self.minute(index), self.deliveries[index].item()
+
+    def hot_minutes(self, min_deliveries: float) -> List[Tuple[datetime, float]]:
+        """(minute, deliveries) of the minutes with at least `min_deliveries`, in time
+        order.
+        """
+        indices = np.flatnonzero(self.deliveries >= min_deliveries)
+        return [
+            (self.minute(index), self.deliveries[index].item())
+            for index in indices.tolist()
+        ]
+
+    def triggers_firing_at(self, minute: datetime) -> List[str]:
+        """Names of the triggers scheduled at `minute`, retries aren't included."""
+        return [
+            name
+            for name, schedule in self.schedules.items()
+            if schedule.matches(minute)
+        ]
+
+
+def simulate_cron_load(
+    cron_triggers: Optional[Iterable[CronTrigger]],
+    start: datetime,
+    days: int = 365,
+    failure_rate: float = 0.0,
+) -> CronLoad:
+    """Expands the schedules of `cron_triggers` over `days` days from `start`, truncated
+    to the minute. A naive `start` is UTC. Retries past the window aren't counted.
+    """
+    if np is None:
+        raise ImportError("simulate_cron_load needs numpy, install the 'numpy' extra")
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    start = start.replace(second=0, microsecond=0)
+    # whole days from the start's midnight, sliced to the window at the end
+    first_day = start.replace(hour=0, minute=0)
+    offset = start.hour * 60 + start.minute
+    n_days = days + (1 if offset else 0)
+    day_dates = [first_day + timedelta(days=i) for i in range(n_days)]
+    day_months = np.array([day.month for day in day_dates])
+    day_days_of_month = np.array([day.day for day in day_dates])
+    day_days_of_week = np.array([day.isoweekday() % 7 for day in day_dates])
+
+    n_minutes = days * MINUTES_PER_DAY
+    # triggers with the same schedule and retries are expanded once
+    expanded: Dict[Tuple[str, int, int], Tuple["np.ndarray", float]] = {}
+    trigger_counts: Dict[Tuple[str, int, int], int] = {}
+    deliveries_by_trigger: Dict[str, float] = {}
+    schedules: Dict[str, CronSchedule] = {}
+    for cron_trigger in cron_triggers or []:
+        schedule = schedules[cron_trigger.name] = parse_cron_schedule(
+            cron_trigger.schedule
+        )
+        num_retries, retry_delay_seconds = _retries(cron_trigger)
+        key = (cron_trigger.schedule, num_retries, retry_delay_seconds)
+        if key not in expanded:
+            month_days = _lookup(schedule.months, 13)[day_months]
+            days_of_month = _lookup(schedule.days_of_month, 32)[day_days_of_month]
+            days_of_week = _lookup(schedule.days_of_week, 7)[day_days_of_week]
+            if schedule.days_of_month_restricted and schedule.days_of_week_restricted:
+                matching_days = month_days & (days_of_month | days_of_week)
+            else:
+                matching_days = month_days & days_of_month & days_of_week
+            day_profile = np.zeros(MINUTES_PER_DAY, dtype=bool)
+            day_profile[
+                (
+                    np.array(sorted(schedule.hours))[:, None] * 60
+                    + np.array(sorted(schedule.minutes))[None, :]
+                ).ravel()
+            ] = True
+            firings = np.zeros((n_days, MINUTES_PER_DAY), dtype=bool)
+            firings[matching_days] = day_profile
+            firings = firings.ravel()[offset : offset + n_minutes]
+
+            trigger_deliveries = firings.astype(np.float64)
+            weight = 1.0
+            for retry in range(1, num_retries + 1):
+                weight *= failure_rate
+                shift = retry * retry_delay_seconds // 60
+                if weight == 0 or shift >= n_minutes:
+                    break
+                trigger_deliveries[shift:] += weight * firings[: n_minutes - shift]
+            expanded[key] = trigger_deliveries, trigger_deliveries.sum().item()
+        deliveries_by_trigger[cron_trigger.name] = expanded[key][1]
+        trigger_counts[key] = trigger_counts.get(key, 0) + 1
+
+    deliveries = np.zeros(n_minutes, dtype=np.float64)
+    for key, count in trigger_counts.items():
+        deliveries += count * expanded[key][0]
+    return CronLoad(start, deliveries, deliveries_by_trigger, schedules)
+
+
+def _parse_field(
+    field: str,
+    minimum: int,
+    maximum: int,
+    names: Optional[List[str]] = None,
+    first_name_value: int = 0,
+) -> Set[int]:
+    def value(text: str) -> int:
+        if names is not None and text.upper() in names:
+            return names.index(text.upper()) + first_name_value
+        if not text.isdigit() or not minimum <= int(text) <= maximum:
+            raise ValueError(f"Invalid cron field value {text!r} in {field!r}")
+        return int(text)
+
+    values: Set[int] = set()
+    for part in field.split(","):
+        part_range, _, step_text = part.partition("/")
+        step = int(step_text) if step_text.isdigit() and int(step_text) > 0 else None
+        if step_text and step is None:
+            raise ValueError(f"Invalid cron step in {field!r}")
+        if part_range == "*":
+            first, last = minimum, maximum
+        elif "-" in part_range:
+            first_text, last_text = part_range.split("-", 1)
+            first, last = value(first_text), value(last_text)
+        else:
+            first = value(part_range)
+            # `5/15` is 5, 20, 35, 50
+            last = maximum if step else first
+        values.update(range(first, last + 1, step or 1))
+    return values
+
+
+def _lookup(values: Set[int], size: int) -> "np.ndarray":
+    table = np.zeros(size, dtype=bool)
+    table[sorted(values)] = True
+    return table
+
+
+def _retries(cron_trigger: CronTrigger) -> Tuple[int, int]:
+    """(number of retries, seconds between a delivery and its retry) of a trigger,
+    waiting for a delivery to time out before its retry, the worst case.
+    """
+    retry_conf = cron_trigger.retry_conf
+    num_retries = DEFAULT_NUM_RETRIES
+    retry_interval_seconds = DEFAULT_RETRY_INTERVAL_SECONDS
+    timeout_seconds = DEFAULT_TIMEOUT_SECONDS
+    if retry_conf is not None:
+        if retry_conf.num_retries is not None:
+            num_retries = retry_conf.num_retries
+        if retry_conf.retry_interval_seconds is not None:
+            retry_interval_seconds = retry_conf.retry_interval_seconds
+        if retry_conf.timeout_seconds is not None:
+            timeout_seconds = retry_conf.timeout_seconds
+    return num_retries, timeout_seconds + retry_interval_seconds
@@ -0,0 +1,203 @@
+"""
+Event trigger traffic, estimated from the tables' write rates in `pg_stat_user_tables`.
+
+    snapshot, previous = cached_counter_snapshots(pg_stat_counters_cache_filepath())
+    traffic = estimate_event_trigger_traffic(
+        yield_by_table_metadata(), table_rates(snapshot, previous)
+    )
+    traffic[0]  # TriggerTraffic of the trigger with the most events per second
+    webhook_traffic(traffic)  # [(webhook, events per second)], busiest first
+
+The insert, update and delete counters of every user table are fetched in one query,
+with `run_postgres_query` by default, so from the database of the PG* environment
+variables, ex: a local Postgres loaded with a production-like workload, or by any
+`run_query` returning rows like it. Snapshots of the counters are cached for
+`max_age_seconds`, see `pg_stat_counters_cache_filepath`. Rates are the
+counter deltas between the two latest cached snapshots, or, with a single snapshot, the
+counters since the statistics were last reset (or the server started).
+
+A trigger's events per second are the rates of the operations in its definition. The
+counters don't tell which columns an update changed, so for an update spec listing
+columns the update rate is an upper bound, see `TriggerTraffic.upper_bound`.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from hasura_tooling.hasura_metadata_sdk import EventTriggerColumnsEnum, TableEntry
+from hasura_tooling.util_postgres_query import run_postgres_query
+from hasura_tooling.util_snapshot_cache import read_snapshot, write_snapshot
+
+OPERATIONS = ("insert", "update", "delete")
+
+COUNTERS_QUERY = """
+SELECT
+    s.schemaname AS schema_name,
+    s.relname AS table_name,
+    s.n_tup_ins AS inserts,
+    s.n_tup_upd AS updates,
+    s.n_tup_del AS deletes,
+    EXTRACT(EPOCH FROM now()) AS taken_at,
+    EXTRACT(
+        EPOCH FROM now() - COALESCE(d.stats_reset, pg_postmaster_start_time())
+    ) AS seconds_since_reset
+FROM pg_stat_user_tables s
+CROSS JOIN pg_stat_database d
+WHERE d.datname = current_database()
+"""
+
+_CACHE_MANIFEST = [("pg_stat_counters", "1")]
+
+# (schema, table name)
+TableKey = Tuple[str, str]
+
+
+class OperationCounts(NamedTuple):
+    """Rows inserted, updated and deleted, or their rates per second."""
+
+    insert: float
+    update: float
+    delete: float
+
+
+@dataclass
+class CounterSnapshot:
+    """The write counters of the user tables at `taken_at` (epoch seconds)."""
+
+    taken_at: float
+    seconds_since_reset: float
+    tables: Dict[TableKey, OperationCounts]
+
+
+class TriggerTraffic(NamedTuple):
+    table: TableKey
+    trigger: str
+    webhook: str
+    events_per_second: float
+    by_operation: Dict[str, float]
+    # the update rate counts every update, but the trigger only fires on some columns
+    upper_bound: bool
+
+
+def fetch_counter_snapshot(
+    run_query: Callable[[str], List[Dict]] = run_postgres_query,
+) -> CounterSnapshot:
+    """Fetches the counters of every user table in one query."""
+    rows = run_query(COUNTERS_QUERY)
+    if not rows:
+        return CounterSnapshot(time.time(), 0.0, {})
+    return CounterSnapshot(
+        taken_at=float(rows[0]["taken_at"]),
+        seconds_since_reset=float(rows[0]["seconds_since_reset"]),
+        tables={
+            (row["schema_name"], row["table_name"]): OperationCounts(
+                int(row["inserts"]), int(row["updates"]), int(row["deletes"])
+            )
+            for row in rows
+        },
+    )
+
+
+def cached_counter_snapshots(
+    cache_path: Optional[str],
+    max_age_seconds: float = 300,
+    run_query: Callable[[str], List[Dict]] = run_postgres_query,
+) -> Tuple[CounterSnapshot, Optional[CounterSnapshot]]:
+    """(latest snapshot, the one before it), from the snapshot file at `cache_path`
+    while the latest is less than `max_age_seconds` old, otherwise fetching a new
+    snapshot and caching it with the previous latest. `cache_path=None` disables the
+    cache.
+    """
+    snapshots: List[CounterSnapshot] = []
+    if cache_path is not None:
+        snapshots = read_snapshot(cache_path, _CACHE_MANIFEST) or []
+    if not snapshots or time.time() - snapshots[-1].taken_at >= max_age_seconds:
+        snapshots = [*snapshots[-1:], fetch_counter_snapshot(run_query)]
+        if cache_path is not None:
+            write_snapshot(cache_path, _CACHE_MANIFEST, snapshots)
+    previous = snapshots[-2] if len(snapshots) > 1 else None
+    return snapshots[-1], previous
+
+
+def table_rates(
+    snapshot: CounterSnapshot, previous: Optional[CounterSnapshot] = None
+) -> Dict[TableKey, OperationCounts]:
+    """Rows written per second by table, between `previous` and `snapshot`, or since
+    the statistics reset for the tables whose counters were reset in between.
+    """
+    elapsed = snapshot.taken_at - previous.taken_at if previous else 0.0
+    # a reset after the previous snapshot makes the deltas meaningless
+    reset_between = snapshot.seconds_since_reset < elapsed
+    rates = {}
+    for key, counts in snapshot.tables.items():
+        previous_counts = previous.tables.get(key) if previous else None
+        if (
+            previous_counts is not None
+            and elapsed > 0
+            and not reset_between
+            and all(c >= p for c, p in zip(counts, previous_counts))
+        ):
+            rates[key] = OperationCounts(
+                *((c - p) / elapsed for c, p in zip(counts, previous_counts))
+            )
+        elif snapshot.seconds_since_reset > 0:
+            rates[key] = OperationCounts(
+                *(c / snapshot.seconds_since_reset for c in counts)
+            )
+        else:
+            rates[key] = OperationCounts(0.0, 0.0, 0.0)
+    return rates
+
+
+def estimate_event_trigger_traffic(
+    tables: Iterable[Any], rates: Dict[TableKey, OperationCounts]
+) -> List[TriggerTraffic]:
+    """The traffic of the event triggers of `tables`, TableEntry or raw table metadata,
+    busiest first. Tables without counters have no traffic.
+    """
+    traffic = []
+    for table in tables:
+        table_entry = (
+            table if isinstance(table, TableEntry) else TableEntry.from_dict(table)
+        )
+        key = (table_entry.table.schema, table_entry.table.name)
+        table_rate = rates.get(key, OperationCounts(0.0, 0.0, 0.0))
+        for event_trigger in table_entry.event_triggers or []:
+            definition = event_trigger.definition
+            by_operation = {
+                operation: getattr(table_rate, operation)
+                for operation in OPERATIONS
+                if getattr(definition, operation) is not None
+            }
+            traffic.append(
+                TriggerTraffic(
+                    table=key,
+                    trigger=event_trigger.name,
+                    webhook=_webhook(event_trigger),
+                    events_per_second=sum(by_operation.values()),
+                    by_operation=by_operation,
+                    upper_bound=definition.update is not None
+                    and definition.update.columns is not EventTriggerColumnsEnum.EMPTY,
+                )
+            )
+    traffic.sort(key=lambda t: t.events_per_second, reverse=True)
+    return traffic
+
+
+def webhook_traffic(traffic: Iterable[TriggerTraffic]) -> List[Tuple[str, float]]:
+    """(webhook, events per second of its triggers), busiest first."""
+    by_webhook: Dict[str, float] = {}
+    for trigger_traffic in traffic:
+        by_webhook[trigger_traffic.webhook] = (
+            by_webhook.get(trigger_traffic.webhook, 0.0)
+            + trigger_traffic.events_per_second
+        )
+    return sorted(by_webhook.items(), key=lambda item: item[1], reverse=True)
+
+
+def _webhook(event_trigger: Any) -> str:
+    if event_trigger.webhook is not None:
+        return event_trigger.webhook
+    # like Hasura's template syntax for URLs from environment variables
+    return f"{{{{{event_trigger.webhook_from_env}}}}}"
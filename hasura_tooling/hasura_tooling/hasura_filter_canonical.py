@@ -0,0 +1,193 @@
+"""
+Canonical form of permission filters (Hasura boolean expressions), for comparing and
+deduplicating filters written differently.
+
+    filters_equivalent(
+        {"_and": [{"b": {"_eq": 1}}, {"a": {"_in": ["X-Hasura-User-Id"]}}]},
+        {"a": {"_eq": "x-hasura-user-id"}, "b": {"_eq": 1.0}},
+    )  # True
+
+    registry = FilterRegistry()
+    fingerprint = registry.add(permission["filter"])
+
+`canonical_filter` rewrites a filter to one form:
+- `_and` and `_or` operands are flattened, deduplicated and sorted, a single operand
+  replaces its `_and`/`_or`, and `{}` (true) operands are dropped from `_and`
+- a column's operators become one `_and` operand each, ex: for
+  `{"id": {"_gt": 1, "_lt": 5}}`, while a relationship's filter, even one of only
+  `_and`/`_or`/`_not`/`_exists`, stays one canonical expression
+- `_in`/`_nin` lists are sorted and deduplicated, a single value becomes `_eq`/`_neq`
+- `_not` of a `_not` is its operand
+- integral floats become ints, ex: filter values decoded by hasura_metadata_sdk
+- session variable names are lower case, like Hasura matches them
+
+The rewrites keep SQL null semantics, so filters with the same canonical form select
+the same rows. Filters that are equivalent in other ways, ex: `_gt: 1` and `_gte: 2`
+on an int column, can still have different canonical forms.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+SESSION_VARIABLE_PREFIX = "x-hasura-"
+BOOLEAN_OPERATORS = frozenset(["_and", "_or", "_not", "_exists"])
+
+
+def canonical_filter(filter: Optional[dict]) -> dict:
+    """Returns the canonical form of `filter`, an empty or None filter is `{}`."""
+    return _canonical_expression(filter or {})
+
+
+def filter_fingerprint(filter: Optional[dict]) -> str:
+    """Hex digest of the canonical form of `filter`."""
+    return hashlib.blake2b(
+        _json_key(canonical_filter(filter)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def filters_equivalent(filter1: Optional[dict], filter2: Optional[dict]) -> bool:
+    """True if the filters are equal, or have the same canonical form."""
+    return filter1 == filter2 or canonical_filter(filter1) == canonical_filter(filter2)
+
+
+class FilterRegistry:
+    """Stores each distinct filter once, keyed by `filter_fingerprint`, so comparing the
+    filters of all roles is comparing fingerprints.
+    """
+
+    def __init__(self):
+        self._filters: Dict[str, Any] = {}
+
+    def add(self, filter: Optional[dict]) -> str:
+        """Returns the fingerprint of `filter`, storing `filter` if no equivalent filter
+        was added before.
+        """
+        fingerprint = filter_fingerprint(filter)
+        self._filters.setdefault(fingerprint, filter)
+        return fingerprint
+
+    def intern(self, filter: Optional[dict]) -> Any:
+        """Returns the first added filter equivalent to `filter`, adding `filter` if
+        there is none, ex: to share one filter object between the roles that use it.
+        """
+        return self._filters[self.add(filter)]
+
+    def __getitem__(self, fingerprint: str) -> Any:
+        return self._filters[fingerprint]
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self._filters
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._filters)
+
+
+def _canonical_expression(expression: Any) -> dict:
+    if not isinstance(expression, dict):
+        raise ValueError(f"Invalid boolean expression: {expression!r}")
+    operands: List[dict] = []
+    for key, value in expression.items():
+        if key == "_and":
+            operands.extend(_canonical_expression(operand) for operand in value)
+        elif key == "_or":
+            operands.append(_or([_canonical_expression(operand) for operand in value]))
+        elif key == "_not":
+            operands.append(_not(_canonical_expression(value)))
+        elif key == "_exists":
+            operands.append(
+                {
+                    "_exists": {
+                        "_table": _canonical_value(value["_table"]),
+                        "_where": _canonical_expression(value.get("_where", {})),
+                    }
+                }
+            )
+        elif key.startswith("_"):
+            operands.append({key: _canonical_value(value)})
+        else:
+            operands.extend(_canonical_column(key, value))
+    return _and(operands)
+
+
+def _canonical_column(column: str, operators: Any) -> List[dict]:
+    if not isinstance(operators, dict):
+        return [{column: _canonical_value(operators)}]
+    if (
+        not operators
+        or not BOOLEAN_OPERATORS.isdisjoint(operators)
+        or not all(operator.startswith("_") for operator in operators)
+    ):
+        # a filter on a relationship's rows, kept as one expression: for an array
+        # relationship, `{"_and": [P], "_or": [Q]}` is one row matching both, unlike
+        # `_and` operands matched by any rows each
+        return [{column: _canonical_expression(operators)}]
+    operands = []
+    for operator, value in operators.items():
+        value = _canonical_value(value)
+        if operator in ("_in", "_nin") and isinstance(value, list):
+            value = _sorted_unique(value)
+            if len(value) == 1:
+                operator = "_eq" if operator == "_in" else "_neq"
+                value = value[0]
+        operands.append({column: {operator: value}})
+    return operands
+
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.lower().startswith(SESSION_VARIABLE_PREFIX):
+        return value.lower()
+    if isinstance(value, list):
+        return [_canonical_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _canonical_value(v) for k, v in value.items()}
+    return value
+
+
+def _and(operands: List[dict]) -> dict:
+    flat_operands = []
+    for operand in operands:
+        if list(operand) == ["_and"]:
+            flat_operands.extend(operand["_and"])
+        elif operand:
+            flat_operands.append(operand)
+    flat_operands = _sorted_unique(flat_operands)
+    if len(flat_operands) == 1:
+        return flat_operands[0]
+    return {"_and": flat_operands} if flat_operands else {}
+
+
+def _or(operands: List[dict]) -> dict:
+    flat_operands = []
+    for operand in operands:
+        if not operand:
+            # true
+            return {}
+        if list(operand) == ["_or"]:
+            flat_operands.extend(operand["_or"])
+        else:
+            flat_operands.append(operand)
+    flat_operands = _sorted_unique(flat_operands)
+    if len(flat_operands) == 1:
+        return flat_operands[0]
+    return {"_or": flat_operands}
+
+
+def _not(operand: dict) -> dict:
+    if list(operand) == ["_not"]:
+        return operand["_not"]
+    return {"_not": operand}
+
+
+def _sorted_unique(values: List[Any]) -> List[Any]:
+    by_key = {_json_key(value): value for value in values}
+    return [by_key[key] for key in sorted(by_key)]
+
+
+def _json_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
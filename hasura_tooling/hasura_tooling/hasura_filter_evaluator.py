@@ -0,0 +1,322 @@
+"""
+Offline evaluation of permission filters (Hasura boolean expressions) over fixture rows.
+
+    predicate = compile_filter(select_permission.filter)
+    rows = {"id": np.array([1, 2, 3]), "owner_id": np.array(["a", "b", None])}
+    mask = predicate(rows, {"x-hasura-user-id": "a"})  # array([ True, False, False])
+
+A filter is compiled once into a tree of NumPy operations over column arrays, and the
+compiled predicates are cached by the filter's `content_fingerprint`, so the filters
+shared by many roles compile once. Supported:
+- `_and`, `_or`, `_not`
+- column operators `_eq`, `_neq`, `_in`, `_nin`, `_gt`, `_gte`, `_lt`, `_lte` and
+  `_is_null`
+- session variables (`X-Hasura-*` values), substituted at evaluation and cast to the
+  column's dtype, like Hasura casts them to the column's type. The value of `_in` and
+  `_nin` can be a session variable holding an array, a Postgres array literal, ex:
+  `{1,2}`, or a JSON array, ex: `[1, 2]`
+
+Nulls are None in object arrays and NaN in float arrays, and compare like SQL nulls:
+comparing a null is unknown, so `{"_not": {"col": {"_eq": 1}}}` excludes null rows.
+Relationship and `_exists` filters need the other tables' rows and are rejected.
+
+NumPy is an optional dependency, see the `numpy` extra in pyproject.toml.
+"""
+
+import json
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from hasura_tooling.hasura_metadata_sdk import content_fingerprint
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SESSION_VARIABLE_PREFIX = "x-hasura-"
+
+# (rows where the expression is true, rows where it's false), the others are unknown
+Masks = Tuple["np.ndarray", "np.ndarray"]
+_Node = Callable[[Mapping[str, "np.ndarray"], Mapping[str, str], int], Masks]
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "_eq": lambda column, value: column == value,
+    "_neq": lambda column, value: column != value,
+    "_gt": lambda column, value: column > value,
+    "_gte": lambda column, value: column >= value,
+    "_lt": lambda column, value: column < value,
+    "_lte": lambda column, value: column <= value,
+}
+
+
+class CompiledFilter:
+    """A filter compiled to NumPy operations, see `compile_filter`."""
+
+    def __init__(self, filter: Optional[dict]):
+        self.filter = filter
+        self.fingerprint = content_fingerprint(filter or {})
+        self._columns: set = set()
+        self._session_variables: set = set()
+        self._evaluate = self._compile_expression(filter or {})
+
+    @property
+    def columns(self) -> FrozenSet[str]:
+        """The columns that the rows passed to the predicate need."""
+        return frozenset(self._columns)
+
+    @property
+    def session_variables(self) -> FrozenSet[str]:
+        """The session variables the filter uses, lower case."""
+        return frozenset(self._session_variables)
+
+    def __call__(
+        self,
+        rows: Mapping[str, "np.ndarray"],
+        session_variables: Mapping[str, str] = None,
+    ) -> "np.ndarray":
+        """Boolean mask of the `rows`, {column: array}, that the filter selects. Raises
+        KeyError for a missing column or session variable.
+        """
+        session = {
+            name.lower(): value for name, value in (session_variables or {}).items()
+        }
+        row_count = len(next(iter(rows.values()))) if rows else 0
+        true_mask, _ = self._evaluate(rows, session, row_count)
+        return true_mask
+
+    def _compile_expression(self, expression: Any) -> _Node:
+        if not isinstance(expression, dict):
+            raise ValueError(f"Invalid boolean expression: {expression!r}")
+        nodes: List[_Node] = []
+        for key, value in expression.items():
+            if key == "_and":
+                nodes.append(_and([self._compile_expression(e) for e in value]))
+            elif key == "_or":
+                nodes.append(_or([self._compile_expression(e) for e in value]))
+            elif key == "_not":
+                nodes.append(_not(self._compile_expression(value)))
+            elif key.startswith("_"):
+                raise ValueError(f"Unsupported boolean expression operator {key!r}")
+            else:
+                nodes.append(self._compile_column(key, value))
+        return _and(nodes)
+
+    def _compile_column(self, column: str, operators: Any) -> _Node:
+        if not isinstance(operators, dict) or not all(
+            operator.startswith("_") for operator in operators
+        ):
+            raise ValueError(
+                f"Unsupported filter on {column!r}, relationship filters and filters "
+                f"without operators can't be evaluated offline: {operators!r}"
+            )
+        self._columns.add(column)
+        nodes = []
+        for operator, value in operators.items():
+            if operator == "_is_null":
+                nodes.append(_is_null(column, bool(value)))
+            elif operator in ("_in", "_nin"):
+                nodes.append(_in(column, self._compile_values(value), operator))
+            elif operator in _COMPARISONS:
+                nodes.append(
+                    _compare(column, self._compile_value(value), _COMPARISONS[operator])
+                )
+            else:
+                raise ValueError(f"Unsupported column operator {operator!r}")
+        return _and(nodes)
+
+    def _compile_value(self, value: Any) -> Callable[[Mapping[str, str]], Any]:
+        if isinstance(value, str) and value.lower().startswith(SESSION_VARIABLE_PREFIX):
+            name = value.lower()
+            self._session_variables.add(name)
+            return lambda session: session[name]
+        return lambda session: value
+
+    def _compile_values(self, values: Any) -> Callable[[Mapping[str, str]], List[Any]]:
+        if isinstance(values, list):
+            compiled_values = [self._compile_value(value) for value in values]
+            return lambda session: [value(session) for value in compiled_values]
+        if isinstance(values, str) and values.lower().startswith(
+            SESSION_VARIABLE_PREFIX
+        ):
+            name = values.lower()
+            self._session_variables.add(name)
+            return lambda session: _parse_array(session[name])
+        raise ValueError(
+            f"Invalid _in/_nin value, not a list or a session variable: {values!r}"
+        )
+
+
+_compiled_filters: Dict[str, CompiledFilter] = {}
+
+
+def compile_filter(filter: Optional[dict]) -> CompiledFilter:
+    """Returns the compiled predicate of a permission filter, ex:
+    `SelectPermission.filter`, from the cache when a filter with the same fingerprint
+    was compiled before. An empty or None filter selects every row.
+    """
+    if np is None:
+        raise ImportError("compile_filter needs numpy, install the 'numpy' extra")
+    fingerprint = content_fingerprint(filter or {})
+    if fingerprint not in _compiled_filters:
+        _compiled_filters[fingerprint] = CompiledFilter(filter)
+    return _compiled_filters[fingerprint]
+
+
+def clear_compiled_filters() -> None:
+    _compiled_filters.clear()
+
+
+def _null_mask(column: "np.ndarray") -> "np.ndarray":
+    if column.dtype.kind == "O":
+        return np.equal(column, None)
+    if column.dtype.kind in "fc":
+        return np.isnan(column)
+    return np.zeros(len(column), dtype=bool)
+
+
+def _cast(value: Any, column: "np.ndarray") -> Any:
+    """Strings, ex: session variables, are cast like Hasura casts them to the column's
+    type.
+    """
+    if isinstance(value, str) and column.dtype.kind in "biuf":
+        if column.dtype.kind == "b":
+            return value.lower() in ("true", "t", "1")
+        return column.dtype.type(value)
+    return value
+
+
+def _parse_array(text: str) -> List[Any]:
+    """The values of an array session variable, a Postgres array literal of strings and
+    nulls, or a JSON array. Raises ValueError for other values.
+    """
+    text = text.strip()
+    if text.startswith("["):
+        values = json.loads(text)
+        if isinstance(values, list) and not any(
+            isinstance(value, (list, dict)) for value in values
+        ):
+            return values
+    elif text.startswith("{") and text.endswith("}"):
+        return _parse_array_literal(text[1:-1])
+    raise ValueError(f"Invalid array session variable value: {text!r}")
+
+
+def _parse_array_literal(text: str) -> List[Any]:
+    # the elements of a one dimensional array literal, between its braces
+    if not text.strip():
+        return []
+    values: List[Any] = []
+    position = 0
+    while True:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if text.startswith('"', position):
+            chars = []
+            position += 1
+            while position < len(text) and text[position] != '"':
+                if text[position] == "\\":
+                    position += 1
+                chars.append(text[position : position + 1])
+                position += 1
+            if position >= len(text):
+                raise ValueError(f"Unterminated array literal element: {text!r}")
+            values.append("".join(chars))
+            position += 1
+        else:
+            end = text.find(",", position)
+            end = len(text) if end == -1 else end
+            element = text[position:end].strip()
+            if not element or any(char in element for char in '{}"\\'):
+                raise ValueError(f"Invalid array literal: {{{text}}}")
+            values.append(None if element.upper() == "NULL" else element)
+            position = end
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if position == len(text):
+            return values
+        if text[position] != ",":
+            raise ValueError(f"Invalid array literal: {{{text}}}")
+        position += 1
+
+
+def _compare(
+    column: str,
+    value: Callable[[Mapping[str, str]], Any],
+    comparison: Callable[[Any, Any], Any],
+) -> _Node:
+    def evaluate(rows, session, row_count) -> Masks:
+        array = rows[column]
+        not_null = ~_null_mask(array)
+        result = np.zeros(row_count, dtype=bool)
+        result[not_null] = comparison(array[not_null], _cast(value(session), array))
+        return result, not_null & ~result
+
+    return evaluate
+
+
+def _in(
+    column: str, values: Callable[[Mapping[str, str]], List[Any]], operator: str
+) -> _Node:
+    def evaluate(rows, session, row_count) -> Masks:
+        array = rows[column]
+        not_null = ~_null_mask(array)
+        session_values = values(session)
+        result = np.zeros(row_count, dtype=bool)
+        result[not_null] = np.isin(
+            array[not_null],
+            [_cast(value, array) for value in session_values if value is not None],
+        )
+        # like SQL, a value that isn't in a list with a null is unknown
+        not_in = np.zeros(row_count, dtype=bool)
+        if None not in session_values:
+            not_in = not_null & ~result
+        if operator == "_nin":
+            return not_in, result
+        return result, not_in
+
+    return evaluate
+
+
+def _is_null(column: str, is_null: bool) -> _Node:
+    def evaluate(rows, session, row_count) -> Masks:
+        null = _null_mask(rows[column])
+        return (null, ~null) if is_null else (~null, null)
+
+    return evaluate
+
+
+def _and(nodes: List[_Node]) -> _Node:
+    if len(nodes) == 1:
+        return nodes[0]
+
+    def evaluate(rows, session, row_count) -> Masks:
+        true_mask = np.ones(row_count, dtype=bool)
+        false_mask = np.zeros(row_count, dtype=bool)
+        for node in nodes:
+            node_true, node_false = node(rows, session, row_count)
+            true_mask &= node_true
+            false_mask |= node_false
+        return true_mask, false_mask
+
+    return evaluate
+
+
+def _or(nodes: List[_Node]) -> _Node:
+    def evaluate(rows, session, row_count) -> Masks:
+        true_mask = np.zeros(row_count, dtype=bool)
+        false_mask = np.ones(row_count, dtype=bool)
+        for node in nodes:
+            node_true, node_false = node(rows, session, row_count)
+            true_mask |= node_true
+            false_mask &= node_false
+        return true_mask, false_mask
+
+    return evaluate
+
+
+def _not(node: _Node) -> _Node:
+    def evaluate(rows, session, row_count) -> Masks:
+        true_mask, false_mask = node(rows, session, row_count)
+        return false_mask, true_mask
+
+    return evaluate
@@ -0,0 +1,261 @@
+"""
+Batched edits of table metadata, applied in memory and written out once.
+
+    changeset = Changeset()
+    changeset.add(AddPermission("test_table", "test_role", {"columns": ["id"]}))
+    changeset.add(RemoveColumns("other_table", ("deprecated_column",)))
+    changeset.add(RemovePermission("other_table", "old_role"))
+
+    tables = read_table_shards()
+    write_table_shards(apply_changeset(tables, changeset), tables)
+
+Operations edit the raw table metadata of 'tables.yaml' and the table shards, keyed by table
+name like `MetadataIndex`, rather than the SDK models, whose encoders don't write back the
+files they were decoded from byte for byte. `apply_changeset` leaves its input unchanged and
+returns new frozen versions (see `util_persistent_metadata`) of the tables it edited.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Union
+
+from hasura_tooling.hasura_metadata_index import _check_kind
+from hasura_tooling.util_persistent_metadata import (
+    FrozenList,
+    FrozenMap,
+    assoc_in,
+    freeze,
+    unwrap,
+)
+
+RELATIONSHIP_KINDS = ("object", "array")
+
+
+@dataclass(frozen=True)
+class AddTable:
+    """Adds a table, ex: `table_permissions_metadata_header(table)`, raises ValueError if
+    it already exists.
+    """
+
+    table: str
+    metadata: Any
+
+    def __post_init__(self):
+        if unwrap(self.metadata)["table"]["name"] != self.table:
+            raise ValueError(f"Table metadata of {self.table!r} names another table")
+
+
+@dataclass(frozen=True)
+class AddPermission:
+    """Adds `role`'s `kind` permission, replacing `role`'s existing one in place."""
+
+    table: str
+    role: str
+    permission: Any
+    kind: str = "select"
+
+    def __post_init__(self):
+        _check_kind(self.kind)
+
+
+@dataclass(frozen=True)
+class RemovePermission:
+    """Removes `role`'s `kind` permission, raises KeyError if there is none, unless
+    `missing_ok`.
+    """
+
+    table: str
+    role: str
+    kind: str = "select"
+    missing_ok: bool = False
+
+    def __post_init__(self):
+        _check_kind(self.kind)
+
+
+@dataclass(frozen=True)
+class SetColumns:
+    """Replaces the columns of `role`'s `kind` permission, raises KeyError if there is no
+    such permission.
+    """
+
+    table: str
+    role: str
+    columns: Sequence[str]
+    kind: str = "select"
+
+    def __post_init__(self):
+        _check_kind(self.kind)
+
+
+@dataclass(frozen=True)
+class RemoveColumns:
+    """Removes `columns` from the `kind` permissions of every role on the table, ex: when
+    they are deprecated. Permissions on all columns ('*') are left as is.
+    """
+
+    table: str
+    columns: Sequence[str]
+    kind: str = "select"
+
+    def __post_init__(self):
+        _check_kind(self.kind)
+
+
+@dataclass(frozen=True)
+class AddRelationship:
+    """Appends an object or array relationship, raises ValueError if the table already has
+    a relationship of that kind with the same name.
+    """
+
+    table: str
+    relationship: Any
+    kind: str = "object"
+
+    def __post_init__(self):
+        if self.kind not in RELATIONSHIP_KINDS:
+            raise ValueError(
+                f"Invalid relationship kind {self.kind!r}, expected one of "
+                f"{RELATIONSHIP_KINDS}"
+            )
+
+
+_OPERATION_TYPES = (
+    AddTable,
+    AddPermission,
+    RemovePermission,
+    SetColumns,
+    RemoveColumns,
+    AddRelationship,
+)
+Operation = Union[_OPERATION_TYPES]  # type: ignore
+
+
+class Changeset:
+    """An ordered batch of operations, see `apply_changeset`."""
+
+    def __init__(self, operations: Iterable[Operation] = ()):
+        self.operations: List[Operation] = list(operations)
+
+    def add(self, operation: Operation) -> "Changeset":
+        self.operations.append(operation)
+        return self
+
+    def __iter__(self) -> Iterator[Operation]:
+        return iter(self.operations)
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def table_names(self) -> List[str]:
+        """Names of the tables the operations edit, in order of first edit."""
+        return list(dict.fromkeys(operation.table for operation in self.operations))
+
+
+def apply_changeset(
+    tables: Mapping[str, Any], changeset: Iterable[Operation]
+) -> Dict[str, FrozenMap]:
+    """Applies the operations in order and returns {table name: new version} for the tables
+    they edit. Each table is edited once, with all of its operations, so a permission
+    edited by several operations is copied once.
+
+    `tables` is {table name: table metadata}, ex: from `read_table_shards`, and isn't
+    modified. Raises KeyError for operations on a table missing from `tables`.
+    """
+    operations_by_table: Dict[str, List[Operation]] = {}
+    for operation in changeset:
+        operations_by_table.setdefault(operation.table, []).append(operation)
+    edited_tables: Dict[str, FrozenMap] = {}
+    for table_name, operations in operations_by_table.items():
+        table_edit = _TableEdit(table_name, tables.get(table_name))
+        for operation in operations:
+            table_edit.apply(operation)
+        edited_tables[table_name] = table_edit.result()
+    return edited_tables
+
+
+class _TableEdit:
+    """The pending version of one table, with its permissions by role, so that editing a
+    permission doesn't copy the permissions list.
+    """
+
+    def __init__(self, table_name: str, table: Any):
+        self.table_name = table_name
+        self.table = freeze(table)
+        self._permissions: Dict[str, Dict[str, FrozenMap]] = {}
+
+    def apply(self, operation: Operation) -> None:
+        if isinstance(operation, AddTable):
+            if self.table is not None:
+                raise ValueError(f"Table {self.table_name!r} already exists")
+            self.table = freeze(operation.metadata)
+            return
+        if not isinstance(operation, _OPERATION_TYPES):
+            raise TypeError(f"Unknown changeset operation {operation!r}")
+        if self.table is None:
+            raise KeyError(self.table_name)
+        if isinstance(operation, AddRelationship):
+            self._add_relationship(operation)
+            return
+        permissions = self._permissions_by_role(operation.kind)
+        if isinstance(operation, AddPermission):
+            permissions[operation.role] = FrozenMap(
+                role=operation.role, permission=operation.permission
+            )
+        elif isinstance(operation, RemovePermission):
+            if operation.role in permissions:
+                del permissions[operation.role]
+            elif not operation.missing_ok:
+                raise KeyError((self.table_name, operation.role))
+        elif isinstance(operation, SetColumns):
+            if operation.role not in permissions:
+                raise KeyError((self.table_name, operation.role))
+            permissions[operation.role] = assoc_in(
+                permissions[operation.role],
+                ("permission", "columns"),
+                list(operation.columns),
+            )
+        elif isinstance(operation, RemoveColumns):
+            removed_columns = set(operation.columns)
+            for role, permission_entry in permissions.items():
+                columns = permission_entry["permission"].get("columns")
+                if isinstance(columns, FrozenList) and not removed_columns.isdisjoint(
+                    columns
+                ):
+                    permissions[role] = assoc_in(
+                        permission_entry,
+                        ("permission", "columns"),
+                        [column for column in columns if column not in removed_columns],
+                    )
+
+    def _permissions_by_role(self, kind: str) -> Dict[str, FrozenMap]:
+        if kind not in self._permissions:
+            permissions: Dict[str, FrozenMap] = {}
+            for permission_entry in self.table.get(f"{kind}_permissions") or []:
+                role = permission_entry["role"]
+                if role in permissions:
+                    raise ValueError(
+                        f"Duplicate {kind} permissions of role {role!r} on table "
+                        f"{self.table_name!r}"
+                    )
+                permissions[role] = permission_entry
+            self._permissions[kind] = permissions
+        return self._permissions[kind]
+
+    def _add_relationship(self, operation: AddRelationship) -> None:
+        key = f"{operation.kind}_relationships"
+        relationships = self.table.get(key) or FrozenList()
+        name = unwrap(operation.relationship)["name"]
+        if any(relationship["name"] == name for relationship in relationships):
+            raise ValueError(
+                f"Table {self.table_name!r} already has a {operation.kind} relationship "
+                f"{name!r}"
+            )
+        self.table = self.table.set(key, relationships.append(operation.relationship))
+
+    def result(self) -> FrozenMap:
+        table = self.table
+        for kind, permissions in self._permissions.items():
+            key = f"{kind}_permissions"
+            if permissions or key in table:
+                table = table.set(key, FrozenList(permissions.values()))
+        return table
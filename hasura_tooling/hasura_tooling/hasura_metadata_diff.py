@@ -0,0 +1,153 @@
+"""
+Structural diff of two Hasura metadata models, for release reviews.
+
+    changes = diff_metadata(old_metadata, new_metadata)
+    changes = diff_tables(old_table_entries, new_table_entries)
+
+    for change in changes:
+        print(change)  # ex: "removed tables/public.test_table/select_permissions/role"
+
+Lists of models are matched by key instead of by position: tables by `QualifiedTable`,
+permissions by role, and relationships, triggers, actions, etc. by name. Matched entries
+with equal content fingerprints (see `content_fingerprint`) are skipped, the others are
+compared field by field, so reordering a list, or the columns of a permission, isn't a
+change. Runs in time linear in the size of the two models.
+"""
+
+from dataclasses import dataclass, is_dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Tuple
+
+from hasura_tooling.hasura_metadata_sdk import (
+    HasuraMetadataV2,
+    QualifiedFunction,
+    QualifiedTable,
+    TableEntry,
+    _field_names,
+    content_fingerprint,
+)
+
+# fields that identify an item in a list of models, in order of precedence
+ENTRY_KEY_FIELDS = ("table", "role", "name", "function", "collection")
+
+
+class ChangeKind(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+@dataclass(frozen=True)
+class MetadataChange:
+    """A difference at `path`, ex: ("tables", "public.test_table", "select_permissions",
+    "test_role"). `old` is None for ADDED, `new` is None for REMOVED.
+    """
+
+    kind: ChangeKind
+    path: Tuple[str, ...]
+    old: Any = None
+    new: Any = None
+
+    def __str__(self) -> str:
+        return f"{self.kind.value} {'/'.join(self.path)}"
+
+
+def diff_metadata(old: HasuraMetadataV2, new: HasuraMetadataV2) -> List[MetadataChange]:
+    changes: List[MetadataChange] = []
+    _diff_models((), old, new, changes)
+    return changes
+
+
+def diff_tables(
+    old: Iterable[TableEntry], new: Iterable[TableEntry]
+) -> List[MetadataChange]:
+    """Diffs two sets of tables, ex: decoded from two checkouts of the table shards."""
+    changes: List[MetadataChange] = []
+    _diff_keyed_lists(("tables",), list(old), list(new), changes)
+    return changes
+
+
+def _diff_models(
+    path: Tuple[str, ...], old: Any, new: Any, changes: List[MetadataChange]
+) -> None:
+    for name in _model_field_names(old):
+        _diff_values(path + (name,), getattr(old, name), getattr(new, name), changes)
+
+
+def _diff_values(
+    path: Tuple[str, ...], old: Any, new: Any, changes: List[MetadataChange]
+) -> None:
+    if old is None and new is None:
+        return
+    if old is None:
+        changes.append(MetadataChange(ChangeKind.ADDED, path, new=new))
+    elif new is None:
+        changes.append(MetadataChange(ChangeKind.REMOVED, path, old=old))
+    elif _is_keyed_list(old) and _is_keyed_list(new):
+        # entries are fingerprinted one by one, a list fingerprint would be redundant
+        _diff_keyed_lists(path, old, new, changes)
+    elif content_fingerprint(old) == content_fingerprint(new):
+        return
+    elif _is_model(old) and _model_field_names(old) == _model_field_names(new):
+        _diff_models(path, old, new, changes)
+    else:
+        changes.append(MetadataChange(ChangeKind.MODIFIED, path, old, new))
+
+
+def _diff_keyed_lists(
+    path: Tuple[str, ...], old: List[Any], new: List[Any], changes: List[MetadataChange]
+) -> None:
+    old_entries = _entries_by_key(old)
+    new_entries = _entries_by_key(new)
+    for key, old_entry in old_entries.items():
+        new_entry = new_entries.get(key)
+        if new_entry is None:
+            changes.append(
+                MetadataChange(ChangeKind.REMOVED, path + (key,), old=old_entry)
+            )
+        else:
+            _diff_values(path + (key,), old_entry, new_entry, changes)
+    for key, new_entry in new_entries.items():
+        if key not in old_entries:
+            changes.append(
+                MetadataChange(ChangeKind.ADDED, path + (key,), new=new_entry)
+            )
+
+
+def _is_model(value: Any) -> bool:
+    return is_dataclass(value) and not isinstance(value, type)
+
+
+def _is_keyed_list(value: Any) -> bool:
+    return isinstance(value, list) and all(_key_field(item) for item in value)
+
+
+def _model_field_names(value: Any) -> Tuple[str, ...]:
+    if not _is_model(value):
+        return ()
+    return _field_names(type(value))
+
+
+def _key_field(entry: Any) -> str:
+    names = _model_field_names(entry)
+    return next((name for name in ENTRY_KEY_FIELDS if name in names), "")
+
+
+def _entries_by_key(entries: List[Any]) -> Dict[str, Any]:
+    """{key: entry}, repeated keys, ex: duplicate role permissions, are numbered."""
+    by_key: Dict[str, Any] = {}
+    for entry in entries:
+        key = _format_key(getattr(entry, _key_field(entry)))
+        n = 1
+        unique_key = key
+        while unique_key in by_key:
+            n += 1
+            unique_key = f"{key}#{n}"
+        by_key[unique_key] = entry
+    return by_key
+
+
+def _format_key(key: Any) -> str:
+    if isinstance(key, (QualifiedTable, QualifiedFunction)):
+        return f"{key.schema}.{key.name}"
+    return str(key)
@@ -0,0 +1,165 @@
+"""
+Keyed lookups over the tables of Hasura metadata.
+
+`MetadataIndex` walks the tables once and answers the lookups that would otherwise be linear
+scans over every table:
+
+    index = MetadataIndex.from_metadata(hasura_metadata_v2_from_dict(metadata))
+    index = MetadataIndex.from_table_dicts(yield_by_table_metadata())
+
+    index.table("test_table")
+    index.permission("test_table", "test_role")
+    index.tables_by_role("test_role", kind="insert")
+
+Tables are keyed by name, ignoring their schema, like the rest of hasura_tooling. The index
+is a snapshot: it isn't updated when the models it was built from are modified.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from hasura_tooling.hasura_metadata_sdk import (
+    ArrayRelationship,
+    EventTriggerColumnsEnum,
+    HasuraMetadataV2,
+    ObjectRelationship,
+    QualifiedTable,
+    TableEntry,
+)
+
+PERMISSION_KINDS = ("insert", "select", "update", "delete")
+
+Relationship = Union[ObjectRelationship, ArrayRelationship]
+
+
+class MetadataIndex:
+    """Dict-backed lookups by table, role and remote table over a set of TableEntry.
+
+    When a table name, or a role within a table's permissions of one kind, appears more than
+    once, the first occurrence is indexed, see check_hasura_metadata_tables_yaml for
+    duplicate detection.
+    """
+
+    def __init__(self, table_entries: Iterable[TableEntry]):
+        self._tables: Dict[str, TableEntry] = {}
+        self._permissions: Dict[str, Dict[Tuple[str, str], Any]] = {
+            kind: {} for kind in PERMISSION_KINDS
+        }
+        self._roles_by_table: Dict[str, Dict[str, List[str]]] = {
+            kind: {} for kind in PERMISSION_KINDS
+        }
+        self._tables_by_role: Dict[str, Dict[str, List[str]]] = {
+            kind: {} for kind in PERMISSION_KINDS
+        }
+        self._relationships_by_remote_table: Dict[
+            str, List[Tuple[str, Relationship]]
+        ] = {}
+        for table_entry in table_entries:
+            self._add(table_entry)
+
+    @classmethod
+    def from_metadata(cls, metadata: HasuraMetadataV2) -> "MetadataIndex":
+        return cls(metadata.tables)
+
+    @classmethod
+    def from_table_dicts(cls, table_dicts: Iterable[dict]) -> "MetadataIndex":
+        """Builds the index from raw table metadata, ex: the sharded tables yielded by
+        `yield_by_table_metadata`, or the entries of 'tables.yaml'.
+        """
+        return cls(TableEntry.from_dict(table_dict) for table_dict in table_dicts)
+
+    def _add(self, table_entry: TableEntry) -> None:
+        table_name = table_entry.table.name
+        if table_name in self._tables:
+            return
+        self._tables[table_name] = table_entry
+        for kind in PERMISSION_KINDS:
+            permissions = self._permissions[kind]
+            roles = self._roles_by_table[kind][table_name] = []
+            tables_by_role = self._tables_by_role[kind]
+            for permission_entry in getattr(table_entry, f"{kind}_permissions") or []:
+                role = permission_entry.role
+                if (table_name, role) in permissions:
+                    continue
+                permissions[table_name, role] = permission_entry
+                roles.append(role)
+                tables_by_role.setdefault(role, []).append(table_name)
+        relationships: List[Relationship] = [
+            *(table_entry.object_relationships or []),
+            *(table_entry.array_relationships or []),
+        ]
+        for relationship in relationships:
+            remote_table = _remote_table_name(relationship)
+            if remote_table is not None:
+                self._relationships_by_remote_table.setdefault(remote_table, []).append(
+                    (table_name, relationship)
+                )
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, table_name: object) -> bool:
+        return table_name in self._tables
+
+    def table_names(self) -> List[str]:
+        return list(self._tables)
+
+    def table(self, table_name: str) -> TableEntry:
+        """Raises KeyError if there is no table `table_name`."""
+        return self._tables[table_name]
+
+    def permission(self, table_name: str, role: str, kind: str = "select") -> Any:
+        """Returns the `kind` permission entry of `role` on `table_name`, ex:
+        SelectPermissionEntry, raises KeyError if there is none.
+        """
+        return self._permissions[_check_kind(kind)][table_name, role]
+
+    def roles_by_table(self, table_name: str, kind: str = "select") -> List[str]:
+        """Roles with a `kind` permission on `table_name`, raises KeyError if there is no
+        table `table_name`.
+        """
+        return list(self._roles_by_table[_check_kind(kind)][table_name])
+
+    def tables_by_role(self, role: str, kind: str = "select") -> List[str]:
+        """Names of the tables `role` has a `kind` permission on."""
+        return list(self._tables_by_role[_check_kind(kind)].get(role, ()))
+
+    def relationships_by_remote_table(
+        self, remote_table: str
+    ) -> List[Tuple[str, Relationship]]:
+        """(table name, relationship) for the object and array relationships pointing at
+        `remote_table`. Object relationships using a foreign key constraint name only a
+        column, and aren't indexed.
+        """
+        return list(self._relationships_by_remote_table.get(remote_table, ()))
+
+    def columns_by_role(
+        self, role: str
+    ) -> Dict[str, Union[List[str], EventTriggerColumnsEnum]]:
+        """{table name: select permission columns} for the tables `role` can select from."""
+        permissions = self._permissions["select"]
+        return {
+            table_name: permissions[table_name, role].permission.columns
+            for table_name in self._tables_by_role["select"].get(role, ())
+        }
+
+
+def _check_kind(kind: str) -> str:
+    if kind not in PERMISSION_KINDS:
+        raise ValueError(
+            f"Invalid permission kind {kind!r}, expected one of {PERMISSION_KINDS}"
+        )
+    return kind
+
+
+def _remote_table_name(relationship: Relationship) -> Optional[str]:
+    using = relationship.using
+    remote_table: Union[QualifiedTable, str, None] = None
+    if using.manual_configuration is not None:
+        remote_table = using.manual_configuration.remote_table
+    elif isinstance(relationship, ArrayRelationship) and (
+        using.foreign_key_constraint_on is not None
+    ):
+        remote_table = using.foreign_key_constraint_on.table
+    if isinstance(remote_table, QualifiedTable):
+        return remote_table.name
+    return remote_table
@@ -1,6 +1,6 @@
-import yaml
 import os
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.util_filepath_and_fileloader import load_yaml
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
 
 
 def scan_and_delete_duplicate_entry(metadata):
@@ -27,18 +27,17 @@ def main():
     metadata_path = features_directory + "hasura_perm_metadata.yaml"
     # open hasura_perm_metadata
     with open(metadata_path) as f:
-        metadata = yaml.safe_load(f)
+        metadata = load_yaml(f)
     # run scan-and-delete-duplicate-entry function on metadata
     scan_and_delete_duplicate_entry(metadata)
     # commit changes to the file
-    with open("../features/hasura_perm_metadata.yaml", "w") as f:
-        yaml.dump(
-            metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    dump_yaml_file(
+        "../features/hasura_perm_metadata.yaml",
+        metadata,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
 
 
 if __name__ == "__main__":
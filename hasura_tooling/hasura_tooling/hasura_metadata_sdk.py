@@ -76,8 +76,26 @@
 #     result = input_argument_from_dict(json.loads(json_string))
 #     result = hasura_metadata_v2_from_dict(json.loads(json_string))
 
-from dataclasses import dataclass
-from typing import Any, Optional, List, Dict, Union, TypeVar, Callable, Type, cast
+import hashlib
+import json
+import sys
+from dataclasses import dataclass, fields, is_dataclass
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    Optional,
+    List,
+    Dict,
+    Iterable,
+    Union,
+    TypeVar,
+    Callable,
+    Type,
+    Tuple,
+    FrozenSet,
+    cast,
+    get_type_hints,
+)
 from enum import Enum
 
 
@@ -144,6 +162,575 @@ def to_float(x: Any) -> float:
     return x
 
 
+_NONE_TYPE = type(None)
+_PRIMITIVE_TYPES = (str, _NONE_TYPE, bool, int, float)
+# decoded strings are interned instead, see `_intern_str`
+_DECODE_PASSTHROUGH_TYPES = (_NONE_TYPE, bool, int, float)
+_STR_ONLY = frozenset([str])
+
+
+class ValidationLevel(Enum):
+    """How much of its input `from_class` and `encode_class` validate.
+
+    FULL checks every field of every nested model, like the generated from_dict/to_dict.
+    SHALLOW only checks the fields of the top-level model, and trusts the nested models.
+    NONE trusts everything, ex: for round-trips of models that were validated when decoded.
+    Invalid input then produces invalid models or dicts, or arbitrary exceptions.
+    """
+
+    FULL = "full"
+    SHALLOW = "shallow"
+    NONE = "none"
+
+
+_DecodePlan = List[Tuple[str, FrozenSet[type], Callable[[Any], Any]]]
+_DECODE_PLANS: Dict[type, _DecodePlan] = {}
+_SHALLOW_DECODE_PLANS: Dict[type, _DecodePlan] = {}
+_UNCHECKED_DECODE_PLANS: Dict[type, _DecodePlan] = {}
+
+
+def from_class(
+    c: Type[T], x: Any, validation: ValidationLevel = ValidationLevel.FULL
+) -> T:
+    """Decodes `x` into the dataclass `c` with a cached, type-dispatched decode plan.
+
+    Produces the same objects and raises the same errors as the converters `from_union` is
+    built from, but picks each union member by `type(x)` instead of trying every member
+    and swallowing the AssertionError of the ones that don't match.
+    """
+    # dispatched by identity, Enum.__hash__ isn't free
+    if validation is ValidationLevel.FULL:
+        plans = _DECODE_PLANS
+    elif validation is ValidationLevel.NONE:
+        return _from_class_unchecked(c, x)
+    else:
+        plans = _SHALLOW_DECODE_PLANS
+    plan = plans.get(c)
+    if plan is None:
+        plan = plans[c] = _compile_decode_plan(c, validation)
+    assert isinstance(x, dict)
+    get = x.get
+    return c(
+        *[
+            value if type(value) in passthrough else convert(value)
+            for key, passthrough, convert in plan
+            for value in (get(key),)
+        ]
+    )
+
+
+def _from_class_unchecked(c: Type[T], x: Any) -> T:
+    plan = _UNCHECKED_DECODE_PLANS.get(c)
+    if plan is None:
+        plan = _UNCHECKED_DECODE_PLANS[c] = _compile_decode_plan(
+            c, ValidationLevel.NONE
+        )
+    get = x.get
+    return c(
+        *[
+            value if type(value) in passthrough else convert(value)
+            for key, passthrough, convert in plan
+            for value in (get(key),)
+        ]
+    )
+
+
+def _identity(x: Any) -> Any:
+    return x
+
+
+def _intern_str(x: Any) -> str:
+    """from_str that returns the interned copy of `x`.
+
+    Role, table and column names repeat thousands of times across decoded metadata, and
+    each yaml/json load creates its own copy of every occurrence. Interning makes the
+    identical strings share one object, and their equality checks identity checks.
+    """
+    assert isinstance(x, str)
+    return _intern_if_str(x)
+
+
+def _intern_if_str(x: Any) -> Any:
+    # sys.intern doesn't take str subclasses, ex: ruamel's ScalarString
+    return sys.intern(x) if type(x) is str else x
+
+
+def _from_str_list(x: Any) -> List[str]:
+    assert isinstance(x, list)
+    if _STR_ONLY.issuperset(map(type, x)):
+        return list(map(sys.intern, x))
+    return [_intern_str(y) for y in x]
+
+
+def _to_str_list(x: Any) -> List[str]:
+    assert isinstance(x, list)
+    if _STR_ONLY.issuperset(map(type, x)):
+        return list(x)
+    return [from_str(y) for y in x]
+
+
+def _from_dict_interned(f: Callable[[Any], T], x: Any) -> Dict[str, T]:
+    assert isinstance(x, dict)
+    return _map_dict_interned(f, x)
+
+
+def _map_dict_interned(f: Callable[[Any], T], x: dict) -> Dict[str, T]:
+    """Returns a copy of `x` with its keys interned, and `f` applied to its values."""
+    if _STR_ONLY.issuperset(map(type, x)):
+        return dict(zip(map(sys.intern, x), map(f, x.values())))
+    return dict(zip(map(_intern_if_str, x), map(f, x.values())))
+
+
+def _compile_decode_plan(
+    c: type, validation: ValidationLevel = ValidationLevel.FULL
+) -> _DecodePlan:
+    # fields are decoded in declaration order, same as the generated from_dict methods,
+    # so the first invalid field is the one that raises.
+    hints = get_type_hints(c)
+    if validation is ValidationLevel.NONE:
+        compile_converter = _compile_unchecked_converter
+    elif validation is ValidationLevel.SHALLOW:
+        compile_converter = partial(_compile_converter, nested=ValidationLevel.NONE)
+    else:
+        compile_converter = _compile_converter
+    return [
+        (f.name, _passthrough_types(hints[f.name]), compile_converter(hints[f.name]))
+        for f in fields(c)
+    ]
+
+
+def _compile_converter(
+    tp: Any, nested: ValidationLevel = ValidationLevel.FULL
+) -> Callable[[Any], Any]:
+    """Returns a converter for `tp` that validates `x` the same way the generated code does.
+
+    Nested models are decoded with the `nested` validation level.
+    """
+    origin = getattr(tp, "__origin__", None)
+    if origin is Union:
+        return _compile_union_converter(tp.__args__, nested)
+    if origin is list:
+        if tp.__args__[0] is str:
+            return _from_str_list
+        item_converter = _compile_converter(tp.__args__[0], nested)
+        return lambda x: from_list(item_converter, x)
+    if origin is dict:
+        value_converter = _compile_converter(tp.__args__[1], nested)
+        return lambda x: _from_dict_interned(value_converter, x)
+    if tp is Any:
+        return _identity
+    if tp is str:
+        return _intern_str
+    if tp is _NONE_TYPE:
+        return from_none
+    if tp is bool:
+        return from_bool
+    if tp is int:
+        return from_int
+    if tp is float:
+        return from_float
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp
+    if isinstance(tp, type) and issubclass(tp, _LazyModel):
+        return tp.from_dict
+    if is_dataclass(tp):
+        if nested is ValidationLevel.FULL:
+            return partial(from_class, tp)
+        return partial(from_class, tp, validation=nested)
+    raise TypeError(f"No decoder for type annotation {tp!r}")
+
+
+def _compile_matched_converter(
+    tp: Any, nested: ValidationLevel = ValidationLevel.FULL
+) -> Callable[[Any], Any]:
+    """Returns a converter for `tp` that skips the top-level type check of `x`.
+
+    Only used by union converters, once `type(x)` has been matched against `_accepted_types`.
+    """
+    origin = getattr(tp, "__origin__", None)
+    if origin is list:
+        if tp.__args__[0] is str:
+            return _from_str_list
+        item_converter = _compile_converter(tp.__args__[0], nested)
+        return lambda x: [item_converter(y) for y in x]
+    if origin is dict:
+        if tp.__args__[1] is Any:
+            # free-form values, ex: the boolean expressions of permission filters
+            return dict
+        return partial(_map_dict_interned, _compile_converter(tp.__args__[1], nested))
+    if tp is float:
+        return float
+    if tp is str:
+        return _intern_if_str
+    if tp in _PRIMITIVE_TYPES or tp is Any:
+        return _identity
+    return _compile_converter(tp, nested)
+
+
+def _compile_unchecked_converter(tp: Any) -> Callable[[Any], Any]:
+    """Returns a converter for `tp` that trusts `x` to be valid, see ValidationLevel.NONE.
+
+    Unions still dispatch on `type(x)`, and numbers and enums are still converted.
+    """
+    origin = getattr(tp, "__origin__", None)
+    if origin is Union:
+        options = [
+            (_accepted_types(m), _compile_unchecked_converter(m)) for m in tp.__args__
+        ]
+        return _compile_unchecked_dispatch(_passthrough_types(tp), options)
+    if origin is list:
+        if tp.__args__[0] is str:
+            return _from_str_list
+        item_converter = _compile_unchecked_converter(tp.__args__[0])
+        return lambda x: [item_converter(y) for y in x]
+    if origin is dict:
+        if tp.__args__[1] is Any:
+            return dict
+        return partial(_map_dict_interned, _compile_unchecked_converter(tp.__args__[1]))
+    if tp is float:
+        return float
+    if tp is str:
+        return _intern_if_str
+    if tp in _PRIMITIVE_TYPES or tp is Any:
+        return _identity
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp
+    if isinstance(tp, type) and issubclass(tp, _LazyModel):
+        return tp.from_dict
+    if is_dataclass(tp):
+        return partial(_from_class_unchecked, tp)
+    raise TypeError(f"No decoder for type annotation {tp!r}")
+
+
+def _compile_unchecked_dispatch(
+    passthrough: FrozenSet[type],
+    options: List[Tuple[Tuple[Tuple[type, ...], Tuple[type, ...]], Callable]],
+) -> Callable[[Any], Any]:
+    """Returns a union converter that converts `x` with the first of `options` that
+    accepts `type(x)`, or returns it as is.
+    """
+    dispatch: Dict[type, Callable[[Any], Any]] = {}
+
+    def convert(x: Any) -> Any:
+        t = type(x)
+        if t in passthrough:
+            return x
+        f = dispatch.get(t)
+        if f is None:
+            f = dispatch[t] = next(
+                (f for accepted_types, f in options if _accepts(accepted_types, t)),
+                _identity,
+            )
+        return f(x)
+
+    return convert
+
+
+def _accepted_types(tp: Any) -> Tuple[Tuple[type, ...], Tuple[type, ...]]:
+    """Returns the (accepted, excluded) python types of the converter compiled for `tp`."""
+    origin = getattr(tp, "__origin__", None)
+    if origin is list:
+        return (list,), ()
+    if origin is dict or is_dataclass(tp):
+        return (dict,), ()
+    if tp is Any:
+        return (object,), ()
+    if tp is int:
+        return (int,), (bool,)
+    if tp is float:
+        return (int, float), (bool,)
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tuple({type(member.value) for member in tp} | {tp}), ()
+    return (tp,), ()
+
+
+def _accepts(
+    accepted_types: Tuple[Tuple[type, ...], Tuple[type, ...]], t: type
+) -> bool:
+    # isinstance semantics, so subclasses (ex: ruamel's CommentedMap) are accepted too
+    accepted, excluded = accepted_types
+    mro = t.__mro__
+    return any(b in accepted for b in mro) and not any(b in excluded for b in mro)
+
+
+def _passthrough_types(
+    tp: Any,
+    accepted_types: Callable[[Any], Tuple[Tuple[type, ...], Tuple[type, ...]]] = (
+        _accepted_types
+    ),
+    primitive_types: Tuple[type, ...] = _DECODE_PASSTHROUGH_TYPES,
+) -> FrozenSet[type]:
+    """Returns the exact primitive types that the converter compiled for `tp` returns unchanged."""
+    members = tp.__args__ if getattr(tp, "__origin__", None) is Union else (tp,)
+    passthrough = set()
+    for t in primitive_types:
+        for m in members:
+            if _accepts(accepted_types(m), t):
+                if m is t or m is Any:
+                    passthrough.add(t)
+                break
+    return frozenset(passthrough)
+
+
+def _compile_union_converter(
+    members: Tuple[Any, ...], nested: ValidationLevel = ValidationLevel.FULL
+) -> Callable[[Any], Any]:
+    options = [
+        (_accepted_types(m), _compile_matched_converter(m, nested)) for m in members
+    ]
+    passthrough = _passthrough_types(Union[members])
+    dispatch: Dict[type, Tuple[Callable[[Any], Any], ...]] = {}
+
+    def convert(x: Any) -> Any:
+        t = type(x)
+        if t in passthrough:
+            return x
+        candidates = dispatch.get(t)
+        if candidates is None:
+            candidates = dispatch[t] = tuple(
+                f for accepted_types, f in options if _accepts(accepted_types, t)
+            )
+        for f in candidates:
+            try:
+                return f(x)
+            except Exception:
+                pass
+        raise AssertionError
+
+    return convert
+
+
+_ENCODE_PLANS: Dict[type, _DecodePlan] = {}
+_SHALLOW_ENCODE_PLANS: Dict[type, _DecodePlan] = {}
+_UNCHECKED_ENCODE_PLANS: Dict[type, _DecodePlan] = {}
+
+
+def encode_class(
+    c: Type[T], x: T, validation: ValidationLevel = ValidationLevel.FULL
+) -> dict:
+    """Encodes the dataclass instance `x` of `c` with a cached, type-dispatched encode plan.
+
+    The generic counterpart of the generated to_dict methods: produces the same dict and
+    raises the same errors, for any dataclass built from the SDK's field types.
+    """
+    if validation is ValidationLevel.FULL:
+        plans = _ENCODE_PLANS
+    elif validation is ValidationLevel.NONE:
+        return _encode_class_unchecked(c, x)
+    else:
+        plans = _SHALLOW_ENCODE_PLANS
+    plan = plans.get(c)
+    if plan is None:
+        plan = plans[c] = _compile_encode_plan(c, validation)
+    return {
+        key: value if type(value) in passthrough else convert(value)
+        for key, passthrough, convert in plan
+        for value in (getattr(x, key),)
+    }
+
+
+def _encode_class_unchecked(c: Type[T], x: T) -> dict:
+    plan = _UNCHECKED_ENCODE_PLANS.get(c)
+    if plan is None:
+        plan = _UNCHECKED_ENCODE_PLANS[c] = _compile_encode_plan(
+            c, ValidationLevel.NONE
+        )
+    return {
+        key: value if type(value) in passthrough else convert(value)
+        for key, passthrough, convert in plan
+        for value in (getattr(x, key),)
+    }
+
+
+def trusted_to_dict(x: Any) -> dict:
+    """to_dict for models that are known to be valid, ex: that were just decoded by a
+    validating from_dict. Skips the validation the generated to_dict methods do.
+    """
+    return _encode_class_unchecked(type(x), x)
+
+
+def _compile_encode_plan(
+    c: type, validation: ValidationLevel = ValidationLevel.FULL
+) -> _DecodePlan:
+    hints = get_type_hints(c)
+    if validation is ValidationLevel.NONE:
+        compile_encoder = _compile_unchecked_encoder
+    elif validation is ValidationLevel.SHALLOW:
+        compile_encoder = partial(_compile_encoder, nested=ValidationLevel.NONE)
+    else:
+        compile_encoder = _compile_encoder
+    return [
+        (
+            f.name,
+            _passthrough_types(hints[f.name], _encodable_types, _PRIMITIVE_TYPES),
+            compile_encoder(hints[f.name]),
+        )
+        for f in fields(c)
+    ]
+
+
+def _compile_encoder(
+    tp: Any, nested: ValidationLevel = ValidationLevel.FULL
+) -> Callable[[Any], Any]:
+    """Returns an encoder for `tp` that validates `x` the same way the generated code does.
+
+    Nested models are encoded with the `nested` validation level.
+    """
+    origin = getattr(tp, "__origin__", None)
+    if origin is Union:
+        return _compile_union_encoder(tp.__args__, nested)
+    if origin is list:
+        if tp.__args__[0] is str:
+            return _to_str_list
+        item_encoder = _compile_encoder(tp.__args__[0], nested)
+        return lambda x: from_list(item_encoder, x)
+    if origin is dict:
+        value_encoder = _compile_encoder(tp.__args__[1], nested)
+        return lambda x: from_dict(value_encoder, x)
+    if tp is float:
+        return to_float
+    if tp is str:
+        return from_str
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return partial(to_enum, tp)
+    if is_dataclass(tp):
+        if nested is ValidationLevel.FULL:
+            return partial(to_class, tp)
+        return partial(_to_class_unchecked, tp)
+    # None, bool, int and Any are validated by the same converters in both directions
+    return _compile_converter(tp)
+
+
+def _to_class_unchecked(c: Type[T], x: Any) -> dict:
+    assert isinstance(x, c)
+    return _encode_class_unchecked(c, x)
+
+
+def _compile_unchecked_encoder(tp: Any) -> Callable[[Any], Any]:
+    """Returns an encoder for `tp` that trusts `x` to be valid, see ValidationLevel.NONE."""
+    origin = getattr(tp, "__origin__", None)
+    if origin is Union:
+        options = [
+            (_encodable_types(m), _compile_unchecked_encoder(m)) for m in tp.__args__
+        ]
+        passthrough = _passthrough_types(tp, _encodable_types, _PRIMITIVE_TYPES)
+        return _compile_unchecked_dispatch(passthrough, options)
+    if origin is list:
+        if tp.__args__[0] is str:
+            return list
+        item_encoder = _compile_unchecked_encoder(tp.__args__[0])
+        return lambda x: [item_encoder(y) for y in x]
+    if origin is dict:
+        if tp.__args__[1] is Any:
+            return dict
+        value_encoder = _compile_unchecked_encoder(tp.__args__[1])
+        return lambda x: {k: value_encoder(v) for (k, v) in x.items()}
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return _enum_value
+    if is_dataclass(tp):
+        return partial(_encode_class_unchecked, tp)
+    return _identity
+
+
+def _enum_value(x: Enum) -> Any:
+    return x.value
+
+
+def _encodable_types(tp: Any) -> Tuple[Tuple[type, ...], Tuple[type, ...]]:
+    """Returns the (accepted, excluded) python types of the encoder compiled for `tp`."""
+    origin = getattr(tp, "__origin__", None)
+    if origin is list:
+        return (list,), ()
+    if origin is dict:
+        return (dict,), ()
+    if tp is Any:
+        return (object,), ()
+    if tp is int:
+        return (int,), (bool,)
+    return (tp,), ()
+
+
+def _compile_union_encoder(
+    members: Tuple[Any, ...], nested: ValidationLevel = ValidationLevel.FULL
+) -> Callable[[Any], Any]:
+    options = [(_encodable_types(m), _compile_encoder(m, nested)) for m in members]
+    passthrough = _passthrough_types(Union[members], _encodable_types, _PRIMITIVE_TYPES)
+    dispatch: Dict[type, Tuple[Callable[[Any], Any], ...]] = {}
+
+    def encode(x: Any) -> Any:
+        t = type(x)
+        if t in passthrough:
+            return x
+        candidates = dispatch.get(t)
+        if candidates is None:
+            candidates = dispatch[t] = tuple(
+                f for accepted_types, f in options if _accepts(accepted_types, t)
+            )
+        for f in candidates:
+            try:
+                return f(x)
+            except Exception:
+                pass
+        raise AssertionError
+
+    return encode
+
+
+def content_fingerprint(x: Any) -> str:
+    """Returns a hex digest of the content of the model `x`, stable across processes.
+
+    Models with the same canonical content get the same fingerprint:
+    - lists are compared as sets, ex: columns, permissions and `_and` operands
+    - dict keys are sorted, and fields that are None are left out
+    - integral floats hash as ints, ex: a filter value of 5 decoded to 5.0
+
+    Models are mutable, so store the fingerprint rather than the model to detect changes.
+    """
+    return hashlib.blake2b(
+        _canonical_json(x).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _canonical_json(x: Any) -> str:
+    if isinstance(x, str):
+        return _encode_json_str(x)
+    if isinstance(x, list):
+        try:
+            # fast path for lists of names, ex: columns
+            elements = set(map(_encode_json_str, x))
+        except TypeError:
+            elements = set(map(_canonical_json, x))
+        return "[" + ",".join(sorted(elements)) + "]"
+    if isinstance(x, dict):
+        items: Iterable[Tuple[Any, Any]] = x.items()
+    elif hasattr(type(x), "__dataclass_fields__"):
+        items = (
+            (name, value)
+            for name in _field_names(type(x))
+            for value in (getattr(x, name),)
+            if value is not None
+        )
+    elif isinstance(x, Enum):
+        return _canonical_json(x.value)
+    elif isinstance(x, float):
+        return json.dumps(int(x) if x.is_integer() else x)
+    elif x is None or isinstance(x, (bool, int)):
+        return json.dumps(x)
+    else:
+        raise TypeError(f"{type(x).__name__} has no canonical form")
+    members = sorted(_canonical_json(k) + ":" + _canonical_json(v) for k, v in items)
+    return "{" + ",".join(members) + "}"
+
+
+# the C string encoder json.dumps(x, ensure_ascii=False) uses, without the per-call setup
+_encode_json_str = json.encoder.encode_basestring  # type: ignore
+
+
+@lru_cache(maxsize=None)
+def _field_names(c: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(c))
+
+
 @dataclass
 class HeaderFromValue:
     """
@@ -157,10 +744,7 @@ class HeaderFromValue:
 
     @staticmethod
     def from_dict(obj: Any) -> "HeaderFromValue":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        value = from_str(obj.get("value"))
-        return HeaderFromValue(name, value)
+        return from_class(HeaderFromValue, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -182,10 +766,7 @@ class HeaderFromEnv:
 
     @staticmethod
     def from_dict(obj: Any) -> "HeaderFromEnv":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        value_from_env = from_str(obj.get("value_from_env"))
-        return HeaderFromEnv(name, value_from_env)
+        return from_class(HeaderFromEnv, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -209,11 +790,7 @@ class ObjectField:
 
     @staticmethod
     def from_dict(obj: Any) -> "ObjectField":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        type = from_str(obj.get("type"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        return ObjectField(name, type, description)
+        return from_class(ObjectField, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -234,10 +811,7 @@ class InputArgument:
 
     @staticmethod
     def from_dict(obj: Any) -> "InputArgument":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        type = from_str(obj.get("type"))
-        return InputArgument(name, type)
+        return from_class(InputArgument, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -264,11 +838,7 @@ class Header:
 
     @staticmethod
     def from_dict(obj: Any) -> "Header":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        value = from_union([from_str, from_none], obj.get("value"))
-        value_from_env = from_union([from_str, from_none], obj.get("value_from_env"))
-        return Header(name, value, value_from_env)
+        return from_class(Header, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -306,24 +876,7 @@ class ActionDefinition:
 
     @staticmethod
     def from_dict(obj: Any) -> "ActionDefinition":
-        assert isinstance(obj, dict)
-        handler = from_str(obj.get("handler"))
-        arguments = from_union(
-            [lambda x: from_list(InputArgument.from_dict, x), from_none],
-            obj.get("arguments"),
-        )
-        forward_client_headers = from_union(
-            [from_bool, from_none], obj.get("forward_client_headers")
-        )
-        headers = from_union(
-            [lambda x: from_list(Header.from_dict, x), from_none], obj.get("headers")
-        )
-        kind = from_union([from_str, from_none], obj.get("kind"))
-        output_type = from_union([from_str, from_none], obj.get("output_type"))
-        type = from_union([ActionDefinitionType, from_none], obj.get("type"))
-        return ActionDefinition(
-            handler, arguments, forward_client_headers, headers, kind, output_type, type
-        )
+        return from_class(ActionDefinition, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -355,9 +908,7 @@ class Permissions:
 
     @staticmethod
     def from_dict(obj: Any) -> "Permissions":
-        assert isinstance(obj, dict)
-        role = from_str(obj.get("role"))
-        return Permissions(role)
+        return from_class(Permissions, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -382,14 +933,7 @@ class Action:
 
     @staticmethod
     def from_dict(obj: Any) -> "Action":
-        assert isinstance(obj, dict)
-        definition = ActionDefinition.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        permissions = from_union(
-            [Permissions.from_dict, from_none], obj.get("permissions")
-        )
-        return Action(definition, name, comment, permissions)
+        return from_class(Action, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -413,9 +957,7 @@ class AllowList:
 
     @staticmethod
     def from_dict(obj: Any) -> "AllowList":
-        assert isinstance(obj, dict)
-        collection = from_str(obj.get("collection"))
-        return AllowList(collection)
+        return from_class(AllowList, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -451,18 +993,7 @@ class RetryConfST:
 
     @staticmethod
     def from_dict(obj: Any) -> "RetryConfST":
-        assert isinstance(obj, dict)
-        num_retries = from_union([from_int, from_none], obj.get("num_retries"))
-        retry_interval_seconds = from_union(
-            [from_int, from_none], obj.get("retry_interval_seconds")
-        )
-        timeout_seconds = from_union([from_int, from_none], obj.get("timeout_seconds"))
-        tolerance_seconds = from_union(
-            [from_int, from_none], obj.get("tolerance_seconds")
-        )
-        return RetryConfST(
-            num_retries, retry_interval_seconds, timeout_seconds, tolerance_seconds
-        )
+        return from_class(RetryConfST, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -507,29 +1038,7 @@ class CronTrigger:
 
     @staticmethod
     def from_dict(obj: Any) -> "CronTrigger":
-        assert isinstance(obj, dict)
-        headers = from_list(Header.from_dict, obj.get("headers"))
-        include_in_metadata = from_bool(obj.get("include_in_metadata"))
-        name = from_str(obj.get("name"))
-        schedule = from_str(obj.get("schedule"))
-        webhook = from_str(obj.get("webhook"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        payload = from_union(
-            [lambda x: from_dict(lambda x: x, x), from_none], obj.get("payload")
-        )
-        retry_conf = from_union(
-            [RetryConfST.from_dict, from_none], obj.get("retry_conf")
-        )
-        return CronTrigger(
-            headers,
-            include_in_metadata,
-            name,
-            schedule,
-            webhook,
-            comment,
-            payload,
-            retry_conf,
-        )
+        return from_class(CronTrigger, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -563,11 +1072,7 @@ class EnumValue:
 
     @staticmethod
     def from_dict(obj: Any) -> "EnumValue":
-        assert isinstance(obj, dict)
-        value = from_str(obj.get("value"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        is_deprecated = from_union([from_bool, from_none], obj.get("is_deprecated"))
-        return EnumValue(value, description, is_deprecated)
+        return from_class(EnumValue, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -592,11 +1097,7 @@ class EnumType:
 
     @staticmethod
     def from_dict(obj: Any) -> "EnumType":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        values = from_list(EnumValue.from_dict, obj.get("values"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        return EnumType(name, values, description)
+        return from_class(EnumType, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -621,11 +1122,7 @@ class InputObjectField:
 
     @staticmethod
     def from_dict(obj: Any) -> "InputObjectField":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        type = from_str(obj.get("type"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        return InputObjectField(name, type, description)
+        return from_class(InputObjectField, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -650,11 +1147,7 @@ class InputObjectType:
 
     @staticmethod
     def from_dict(obj: Any) -> "InputObjectType":
-        assert isinstance(obj, dict)
-        fields = from_list(InputObjectField.from_dict, obj.get("fields"))
-        name = from_str(obj.get("name"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        return InputObjectType(fields, name, description)
+        return from_class(InputObjectType, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -673,10 +1166,7 @@ class QualifiedTable:
 
     @staticmethod
     def from_dict(obj: Any) -> "QualifiedTable":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        schema = from_str(obj.get("schema"))
-        return QualifiedTable(name, schema)
+        return from_class(QualifiedTable, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -709,14 +1199,7 @@ class CustomTypeObjectRelationship:
 
     @staticmethod
     def from_dict(obj: Any) -> "CustomTypeObjectRelationship":
-        assert isinstance(obj, dict)
-        field_mapping = from_dict(from_str, obj.get("field_mapping"))
-        name = from_str(obj.get("name"))
-        remote_table = from_union(
-            [QualifiedTable.from_dict, from_str], obj.get("remote_table")
-        )
-        type = CustomTypeObjectRelationshipType(obj.get("type"))
-        return CustomTypeObjectRelationship(field_mapping, name, remote_table, type)
+        return from_class(CustomTypeObjectRelationship, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -746,15 +1229,7 @@ class ObjectType:
 
     @staticmethod
     def from_dict(obj: Any) -> "ObjectType":
-        assert isinstance(obj, dict)
-        fields = from_list(InputObjectField.from_dict, obj.get("fields"))
-        name = from_str(obj.get("name"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        relationships = from_union(
-            [lambda x: from_list(CustomTypeObjectRelationship.from_dict, x), from_none],
-            obj.get("relationships"),
-        )
-        return ObjectType(fields, name, description, relationships)
+        return from_class(ObjectType, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -788,10 +1263,7 @@ class ScalarType:
 
     @staticmethod
     def from_dict(obj: Any) -> "ScalarType":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        description = from_union([from_str, from_none], obj.get("description"))
-        return ScalarType(name, description)
+        return from_class(ScalarType, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -809,23 +1281,7 @@ class CustomTypes:
 
     @staticmethod
     def from_dict(obj: Any) -> "CustomTypes":
-        assert isinstance(obj, dict)
-        enums = from_union(
-            [lambda x: from_list(EnumType.from_dict, x), from_none], obj.get("enums")
-        )
-        input_objects = from_union(
-            [lambda x: from_list(InputObjectType.from_dict, x), from_none],
-            obj.get("input_objects"),
-        )
-        objects = from_union(
-            [lambda x: from_list(ObjectType.from_dict, x), from_none],
-            obj.get("objects"),
-        )
-        scalars = from_union(
-            [lambda x: from_list(ScalarType.from_dict, x), from_none],
-            obj.get("scalars"),
-        )
-        return CustomTypes(enums, input_objects, objects, scalars)
+        return from_class(CustomTypes, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -868,11 +1324,7 @@ class FunctionConfiguration:
 
     @staticmethod
     def from_dict(obj: Any) -> "FunctionConfiguration":
-        assert isinstance(obj, dict)
-        session_argument = from_union(
-            [from_str, from_none], obj.get("session_argument")
-        )
-        return FunctionConfiguration(session_argument)
+        return from_class(FunctionConfiguration, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -889,10 +1341,7 @@ class QualifiedFunction:
 
     @staticmethod
     def from_dict(obj: Any) -> "QualifiedFunction":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        schema = from_str(obj.get("schema"))
-        return QualifiedFunction(name, schema)
+        return from_class(QualifiedFunction, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -915,14 +1364,7 @@ class CustomFunction:
 
     @staticmethod
     def from_dict(obj: Any) -> "CustomFunction":
-        assert isinstance(obj, dict)
-        function = from_union(
-            [QualifiedFunction.from_dict, from_str], obj.get("function")
-        )
-        configuration = from_union(
-            [FunctionConfiguration.from_dict, from_none], obj.get("configuration")
-        )
-        return CustomFunction(function, configuration)
+        return from_class(CustomFunction, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -947,10 +1389,7 @@ class QueryCollection:
 
     @staticmethod
     def from_dict(obj: Any) -> "QueryCollection":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        query = from_str(obj.get("query"))
-        return QueryCollection(name, query)
+        return from_class(QueryCollection, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -967,9 +1406,7 @@ class Definition:
 
     @staticmethod
     def from_dict(obj: Any) -> "Definition":
-        assert isinstance(obj, dict)
-        queries = from_list(QueryCollection.from_dict, obj.get("queries"))
-        return Definition(queries)
+        return from_class(Definition, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -994,11 +1431,7 @@ class QueryCollectionEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "QueryCollectionEntry":
-        assert isinstance(obj, dict)
-        definition = Definition.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return QueryCollectionEntry(definition, name, comment)
+        return from_class(QueryCollectionEntry, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1024,21 +1457,7 @@ class RemoteSchemaDef:
 
     @staticmethod
     def from_dict(obj: Any) -> "RemoteSchemaDef":
-        assert isinstance(obj, dict)
-        forward_client_headers = from_union(
-            [from_bool, from_none], obj.get("forward_client_headers")
-        )
-        headers = from_union(
-            [lambda x: from_list(Header.from_dict, x), from_none], obj.get("headers")
-        )
-        timeout_seconds = from_union(
-            [from_float, from_none], obj.get("timeout_seconds")
-        )
-        url = from_union([from_str, from_none], obj.get("url"))
-        url_from_env = from_union([from_str, from_none], obj.get("url_from_env"))
-        return RemoteSchemaDef(
-            forward_client_headers, headers, timeout_seconds, url, url_from_env
-        )
+        return from_class(RemoteSchemaDef, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1072,11 +1491,7 @@ class RemoteSchema:
 
     @staticmethod
     def from_dict(obj: Any) -> "RemoteSchema":
-        assert isinstance(obj, dict)
-        definition = RemoteSchemaDef.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return RemoteSchema(definition, name, comment)
+        return from_class(RemoteSchema, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1100,10 +1515,7 @@ class ArrRelUsingFKeyOn:
 
     @staticmethod
     def from_dict(obj: Any) -> "ArrRelUsingFKeyOn":
-        assert isinstance(obj, dict)
-        column = from_str(obj.get("column"))
-        table = from_union([QualifiedTable.from_dict, from_str], obj.get("table"))
-        return ArrRelUsingFKeyOn(column, table)
+        return from_class(ArrRelUsingFKeyOn, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1130,12 +1542,7 @@ class ArrRelUsingManualMapping:
 
     @staticmethod
     def from_dict(obj: Any) -> "ArrRelUsingManualMapping":
-        assert isinstance(obj, dict)
-        column_mapping = from_dict(from_str, obj.get("column_mapping"))
-        remote_table = from_union(
-            [QualifiedTable.from_dict, from_str], obj.get("remote_table")
-        )
-        return ArrRelUsingManualMapping(column_mapping, remote_table)
+        return from_class(ArrRelUsingManualMapping, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1162,16 +1569,7 @@ class ArrRelUsing:
 
     @staticmethod
     def from_dict(obj: Any) -> "ArrRelUsing":
-        assert isinstance(obj, dict)
-        foreign_key_constraint_on = from_union(
-            [ArrRelUsingFKeyOn.from_dict, from_none],
-            obj.get("foreign_key_constraint_on"),
-        )
-        manual_configuration = from_union(
-            [ArrRelUsingManualMapping.from_dict, from_none],
-            obj.get("manual_configuration"),
-        )
-        return ArrRelUsing(foreign_key_constraint_on, manual_configuration)
+        return from_class(ArrRelUsing, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1201,11 +1599,10 @@ class ArrayRelationship:
 
     @staticmethod
     def from_dict(obj: Any) -> "ArrayRelationship":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        using = ArrRelUsing.from_dict(obj.get("using"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return ArrayRelationship(name, using, comment)
+        return from_class(ArrayRelationship, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1236,15 +1633,7 @@ class ComputedFieldDefinition:
 
     @staticmethod
     def from_dict(obj: Any) -> "ComputedFieldDefinition":
-        assert isinstance(obj, dict)
-        function = from_union(
-            [QualifiedFunction.from_dict, from_str], obj.get("function")
-        )
-        session_argument = from_union(
-            [from_str, from_none], obj.get("session_argument")
-        )
-        table_argument = from_union([from_str, from_none], obj.get("table_argument"))
-        return ComputedFieldDefinition(function, session_argument, table_argument)
+        return from_class(ComputedFieldDefinition, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1275,11 +1664,7 @@ class ComputedField:
 
     @staticmethod
     def from_dict(obj: Any) -> "ComputedField":
-        assert isinstance(obj, dict)
-        definition = ComputedFieldDefinition.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return ComputedField(definition, name, comment)
+        return from_class(ComputedField, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1319,29 +1704,7 @@ class CustomRootFields:
 
     @staticmethod
     def from_dict(obj: Any) -> "CustomRootFields":
-        assert isinstance(obj, dict)
-        delete = from_union([from_str, from_none], obj.get("delete"))
-        delete_by_pk = from_union([from_str, from_none], obj.get("delete_by_pk"))
-        insert = from_union([from_str, from_none], obj.get("insert"))
-        insert_one = from_union([from_str, from_none], obj.get("insert_one"))
-        select = from_union([from_str, from_none], obj.get("select"))
-        select_aggregate = from_union(
-            [from_str, from_none], obj.get("select_aggregate")
-        )
-        select_by_pk = from_union([from_str, from_none], obj.get("select_by_pk"))
-        update = from_union([from_str, from_none], obj.get("update"))
-        update_by_pk = from_union([from_str, from_none], obj.get("update_by_pk"))
-        return CustomRootFields(
-            delete,
-            delete_by_pk,
-            insert,
-            insert_one,
-            select,
-            select_aggregate,
-            select_by_pk,
-            update,
-            update_by_pk,
-        )
+        return from_class(CustomRootFields, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1373,15 +1736,7 @@ class TableConfig:
 
     @staticmethod
     def from_dict(obj: Any) -> "TableConfig":
-        assert isinstance(obj, dict)
-        custom_column_names = from_union(
-            [lambda x: from_dict(from_str, x), from_none],
-            obj.get("custom_column_names"),
-        )
-        custom_root_fields = from_union(
-            [CustomRootFields.from_dict, from_none], obj.get("custom_root_fields")
-        )
-        return TableConfig(custom_column_names, custom_root_fields)
+        return from_class(TableConfig, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1408,20 +1763,10 @@ class DeletePermission:
 
     @staticmethod
     def from_dict(obj: Any) -> "DeletePermission":
-        assert isinstance(obj, dict)
-        filter = from_union(
-            [
-                lambda x: from_dict(
-                    lambda x: from_union(
-                        [lambda x: from_dict(lambda x: x, x), from_float, from_str], x
-                    ),
-                    x,
-                ),
-                from_none,
-            ],
-            obj.get("filter"),
-        )
-        return DeletePermission(filter)
+        return from_class(DeletePermission, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1455,11 +1800,10 @@ class DeletePermissionEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "DeletePermissionEntry":
-        assert isinstance(obj, dict)
-        permission = DeletePermission.from_dict(obj.get("permission"))
-        role = from_str(obj.get("role"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return DeletePermissionEntry(permission, role, comment)
+        return from_class(DeletePermissionEntry, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1490,16 +1834,7 @@ class OperationSpec:
 
     @staticmethod
     def from_dict(obj: Any) -> "OperationSpec":
-        assert isinstance(obj, dict)
-        columns = from_union(
-            [lambda x: from_list(from_str, x), EventTriggerColumnsEnum],
-            obj.get("columns"),
-        )
-        payload = from_union(
-            [lambda x: from_list(from_str, x), EventTriggerColumnsEnum, from_none],
-            obj.get("payload"),
-        )
-        return OperationSpec(columns, payload)
+        return from_class(OperationSpec, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1541,12 +1876,7 @@ class EventTriggerDefinition:
 
     @staticmethod
     def from_dict(obj: Any) -> "EventTriggerDefinition":
-        assert isinstance(obj, dict)
-        enable_manual = from_bool(obj.get("enable_manual"))
-        delete = from_union([OperationSpec.from_dict, from_none], obj.get("delete"))
-        insert = from_union([OperationSpec.from_dict, from_none], obj.get("insert"))
-        update = from_union([OperationSpec.from_dict, from_none], obj.get("update"))
-        return EventTriggerDefinition(enable_manual, delete, insert, update)
+        return from_class(EventTriggerDefinition, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1586,11 +1916,7 @@ class RetryConf:
 
     @staticmethod
     def from_dict(obj: Any) -> "RetryConf":
-        assert isinstance(obj, dict)
-        interval_sec = from_union([from_int, from_none], obj.get("interval_sec"))
-        num_retries = from_union([from_int, from_none], obj.get("num_retries"))
-        timeout_sec = from_union([from_int, from_none], obj.get("timeout_sec"))
-        return RetryConf(interval_sec, num_retries, timeout_sec)
+        return from_class(RetryConf, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1621,20 +1947,7 @@ class EventTrigger:
 
     @staticmethod
     def from_dict(obj: Any) -> "EventTrigger":
-        assert isinstance(obj, dict)
-        definition = EventTriggerDefinition.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        retry_conf = RetryConf.from_dict(obj.get("retry_conf"))
-        headers = from_union(
-            [lambda x: from_list(Header.from_dict, x), from_none], obj.get("headers")
-        )
-        webhook = from_union([from_str, from_none], obj.get("webhook"))
-        webhook_from_env = from_union(
-            [from_str, from_none], obj.get("webhook_from_env")
-        )
-        return EventTrigger(
-            definition, name, retry_conf, headers, webhook, webhook_from_env
-        )
+        return from_class(EventTrigger, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1675,26 +1988,10 @@ class InsertPermission:
 
     @staticmethod
     def from_dict(obj: Any) -> "InsertPermission":
-        assert isinstance(obj, dict)
-        columns = from_union(
-            [lambda x: from_list(from_str, x), EventTriggerColumnsEnum],
-            obj.get("columns"),
-        )
-        backend_only = from_union([from_bool, from_none], obj.get("backend_only"))
-        check = from_union(
-            [
-                lambda x: from_dict(
-                    lambda x: from_union(
-                        [lambda x: from_dict(lambda x: x, x), from_float, from_str], x
-                    ),
-                    x,
-                ),
-                from_none,
-            ],
-            obj.get("check"),
-        )
-        set = from_union([lambda x: from_dict(from_str, x), from_none], obj.get("set"))
-        return InsertPermission(columns, backend_only, check, set)
+        return from_class(InsertPermission, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1739,11 +2036,10 @@ class InsertPermissionEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "InsertPermissionEntry":
-        assert isinstance(obj, dict)
-        permission = InsertPermission.from_dict(obj.get("permission"))
-        role = from_str(obj.get("role"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return InsertPermissionEntry(permission, role, comment)
+        return from_class(InsertPermissionEntry, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1769,12 +2065,7 @@ class ObjRelUsingManualMapping:
 
     @staticmethod
     def from_dict(obj: Any) -> "ObjRelUsingManualMapping":
-        assert isinstance(obj, dict)
-        column_mapping = from_dict(from_str, obj.get("column_mapping"))
-        remote_table = from_union(
-            [QualifiedTable.from_dict, from_str], obj.get("remote_table")
-        )
-        return ObjRelUsingManualMapping(column_mapping, remote_table)
+        return from_class(ObjRelUsingManualMapping, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1801,15 +2092,7 @@ class ObjRelUsing:
 
     @staticmethod
     def from_dict(obj: Any) -> "ObjRelUsing":
-        assert isinstance(obj, dict)
-        foreign_key_constraint_on = from_union(
-            [from_str, from_none], obj.get("foreign_key_constraint_on")
-        )
-        manual_configuration = from_union(
-            [ObjRelUsingManualMapping.from_dict, from_none],
-            obj.get("manual_configuration"),
-        )
-        return ObjRelUsing(foreign_key_constraint_on, manual_configuration)
+        return from_class(ObjRelUsing, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1838,11 +2121,10 @@ class ObjectRelationship:
 
     @staticmethod
     def from_dict(obj: Any) -> "ObjectRelationship":
-        assert isinstance(obj, dict)
-        name = from_str(obj.get("name"))
-        using = ObjRelUsing.from_dict(obj.get("using"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return ObjectRelationship(name, using, comment)
+        return from_class(ObjectRelationship, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1865,13 +2147,7 @@ class RemoteFieldValue:
 
     @staticmethod
     def from_dict(obj: Any) -> "RemoteFieldValue":
-        assert isinstance(obj, dict)
-        arguments = from_dict(from_str, obj.get("arguments"))
-        field = from_union(
-            [lambda x: from_dict(RemoteFieldValue.from_dict, x), from_none],
-            obj.get("field"),
-        )
-        return RemoteFieldValue(arguments, field)
+        return from_class(RemoteFieldValue, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1901,11 +2177,7 @@ class RemoteRelationshipDef:
 
     @staticmethod
     def from_dict(obj: Any) -> "RemoteRelationshipDef":
-        assert isinstance(obj, dict)
-        hasura_fields = from_list(from_str, obj.get("hasura_fields"))
-        remote_field = from_dict(RemoteFieldValue.from_dict, obj.get("remote_field"))
-        remote_schema = from_str(obj.get("remote_schema"))
-        return RemoteRelationshipDef(hasura_fields, remote_field, remote_schema)
+        return from_class(RemoteRelationshipDef, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1930,10 +2202,10 @@ class RemoteRelationship:
 
     @staticmethod
     def from_dict(obj: Any) -> "RemoteRelationship":
-        assert isinstance(obj, dict)
-        definition = RemoteRelationshipDef.from_dict(obj.get("definition"))
-        name = from_str(obj.get("name"))
-        return RemoteRelationship(definition, name)
+        return from_class(RemoteRelationship, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -1963,33 +2235,10 @@ class SelectPermission:
 
     @staticmethod
     def from_dict(obj: Any) -> "SelectPermission":
-        assert isinstance(obj, dict)
-        columns = from_union(
-            [lambda x: from_list(from_str, x), EventTriggerColumnsEnum],
-            obj.get("columns"),
-        )
-        allow_aggregations = from_union(
-            [from_bool, from_none], obj.get("allow_aggregations")
-        )
-        computed_fields = from_union(
-            [lambda x: from_list(from_str, x), from_none], obj.get("computed_fields")
-        )
-        filter = from_union(
-            [
-                lambda x: from_dict(
-                    lambda x: from_union(
-                        [lambda x: from_dict(lambda x: x, x), from_float, from_str], x
-                    ),
-                    x,
-                ),
-                from_none,
-            ],
-            obj.get("filter"),
-        )
-        limit = from_union([from_int, from_none], obj.get("limit"))
-        return SelectPermission(
-            columns, allow_aggregations, computed_fields, filter, limit
-        )
+        return from_class(SelectPermission, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2037,11 +2286,10 @@ class SelectPermissionEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "SelectPermissionEntry":
-        assert isinstance(obj, dict)
-        permission = SelectPermission.from_dict(obj.get("permission"))
-        role = from_str(obj.get("role"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return SelectPermissionEntry(permission, role, comment)
+        return from_class(SelectPermissionEntry, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2070,37 +2318,10 @@ class UpdatePermission:
 
     @staticmethod
     def from_dict(obj: Any) -> "UpdatePermission":
-        assert isinstance(obj, dict)
-        columns = from_union(
-            [lambda x: from_list(from_str, x), EventTriggerColumnsEnum],
-            obj.get("columns"),
-        )
-        check = from_union(
-            [
-                lambda x: from_dict(
-                    lambda x: from_union(
-                        [lambda x: from_dict(lambda x: x, x), from_float, from_str], x
-                    ),
-                    x,
-                ),
-                from_none,
-            ],
-            obj.get("check"),
-        )
-        filter = from_union(
-            [
-                lambda x: from_dict(
-                    lambda x: from_union(
-                        [lambda x: from_dict(lambda x: x, x), from_float, from_str], x
-                    ),
-                    x,
-                ),
-                from_none,
-            ],
-            obj.get("filter"),
-        )
-        set = from_union([lambda x: from_dict(from_str, x), from_none], obj.get("set"))
-        return UpdatePermission(columns, check, filter, set)
+        return from_class(UpdatePermission, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2156,11 +2377,10 @@ class UpdatePermissionEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "UpdatePermissionEntry":
-        assert isinstance(obj, dict)
-        permission = UpdatePermission.from_dict(obj.get("permission"))
-        role = from_str(obj.get("role"))
-        comment = from_union([from_str, from_none], obj.get("comment"))
-        return UpdatePermissionEntry(permission, role, comment)
+        return from_class(UpdatePermissionEntry, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2193,62 +2413,10 @@ class TableEntry:
 
     @staticmethod
     def from_dict(obj: Any) -> "TableEntry":
-        assert isinstance(obj, dict)
-        table = QualifiedTable.from_dict(obj.get("table"))
-        array_relationships = from_union(
-            [lambda x: from_list(ArrayRelationship.from_dict, x), from_none],
-            obj.get("array_relationships"),
-        )
-        computed_fields = from_union(
-            [lambda x: from_list(ComputedField.from_dict, x), from_none],
-            obj.get("computed_fields"),
-        )
-        configuration = from_union(
-            [TableConfig.from_dict, from_none], obj.get("configuration")
-        )
-        delete_permissions = from_union(
-            [lambda x: from_list(DeletePermissionEntry.from_dict, x), from_none],
-            obj.get("delete_permissions"),
-        )
-        event_triggers = from_union(
-            [lambda x: from_list(EventTrigger.from_dict, x), from_none],
-            obj.get("event_triggers"),
-        )
-        insert_permissions = from_union(
-            [lambda x: from_list(InsertPermissionEntry.from_dict, x), from_none],
-            obj.get("insert_permissions"),
-        )
-        is_enum = from_union([from_bool, from_none], obj.get("is_enum"))
-        object_relationships = from_union(
-            [lambda x: from_list(ObjectRelationship.from_dict, x), from_none],
-            obj.get("object_relationships"),
-        )
-        remote_relationships = from_union(
-            [lambda x: from_list(RemoteRelationship.from_dict, x), from_none],
-            obj.get("remote_relationships"),
-        )
-        select_permissions = from_union(
-            [lambda x: from_list(SelectPermissionEntry.from_dict, x), from_none],
-            obj.get("select_permissions"),
-        )
-        update_permissions = from_union(
-            [lambda x: from_list(UpdatePermissionEntry.from_dict, x), from_none],
-            obj.get("update_permissions"),
-        )
-        return TableEntry(
-            table,
-            array_relationships,
-            computed_fields,
-            configuration,
-            delete_permissions,
-            event_triggers,
-            insert_permissions,
-            is_enum,
-            object_relationships,
-            remote_relationships,
-            select_permissions,
-            update_permissions,
-        )
+        return from_class(TableEntry, obj)
+
+    def fingerprint(self) -> str:
+        return content_fingerprint(self)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2317,6 +2485,140 @@ class TableEntry:
         return result
 
 
+class _LazyField:
+    """Decodes a field from the instance's raw dict on first access, then caches it in the
+    instance `__dict__`, which takes precedence over this (non-data) descriptor afterwards.
+    """
+
+    def __init__(
+        self, name: str, passthrough: FrozenSet[type], convert: Callable[[Any], Any]
+    ):
+        self.name = name
+        self.passthrough = passthrough
+        self.convert = convert
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+        value = instance._raw.get(self.name)
+        if type(value) not in self.passthrough:
+            value = self.convert(value)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class _LazyModel:
+    """Base of the lazy subclasses of the generated models.
+
+    Keeps the raw dict and decodes each field the first time it is accessed, so scans that
+    only read a few fields skip decoding the rest, at the cost of invalid fields raising on
+    access instead of in `from_dict`. Instances built with the regular constructor are
+    eager. A lazy instance is equal to the eagerly decoded model of the same dict.
+    """
+
+    _model: type
+    _raw: dict
+
+    @classmethod
+    def _from_raw(cls, obj: Any) -> Any:
+        assert isinstance(obj, dict)
+        instance = cls.__new__(cls)
+        instance._raw = obj
+        return instance
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, self._model):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(self._model)
+        )
+
+    __hash__ = None  # type: ignore
+
+
+def _install_lazy_fields(cls: type, model: type, lazy_models: Dict[type, type]) -> None:
+    """Installs a `_LazyField` on `cls` for every field of `model`, with the models in
+    `lazy_models` decoded into their lazy subclasses.
+    """
+    cls._model = model
+    hints = get_type_hints(model)
+    for f in fields(model):
+        tp = _substitute_types(hints[f.name], lazy_models)
+        setattr(
+            cls,
+            f.name,
+            _LazyField(f.name, _passthrough_types(tp), _compile_converter(tp)),
+        )
+
+
+def _substitute_types(tp: Any, mapping: Dict[type, type]) -> Any:
+    """Returns the type annotation `tp` with the classes in `mapping` replaced."""
+    origin = getattr(tp, "__origin__", None)
+    if origin is Union:
+        return Union[tuple(_substitute_types(a, mapping) for a in tp.__args__)]
+    if origin is list:
+        return List[_substitute_types(tp.__args__[0], mapping)]
+    if origin is dict:
+        return Dict[tp.__args__[0], _substitute_types(tp.__args__[1], mapping)]
+    return mapping.get(tp, tp)
+
+
+class LazyInsertPermissionEntry(_LazyModel, InsertPermissionEntry):
+    """InsertPermissionEntry that decodes its fields on first access."""
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazyInsertPermissionEntry":
+        return LazyInsertPermissionEntry._from_raw(obj)
+
+
+class LazySelectPermissionEntry(_LazyModel, SelectPermissionEntry):
+    """SelectPermissionEntry that decodes its fields on first access."""
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazySelectPermissionEntry":
+        return LazySelectPermissionEntry._from_raw(obj)
+
+
+class LazyUpdatePermissionEntry(_LazyModel, UpdatePermissionEntry):
+    """UpdatePermissionEntry that decodes its fields on first access."""
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazyUpdatePermissionEntry":
+        return LazyUpdatePermissionEntry._from_raw(obj)
+
+
+class LazyDeletePermissionEntry(_LazyModel, DeletePermissionEntry):
+    """DeletePermissionEntry that decodes its fields on first access."""
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazyDeletePermissionEntry":
+        return LazyDeletePermissionEntry._from_raw(obj)
+
+
+class LazyTableEntry(_LazyModel, TableEntry):
+    """TableEntry that decodes its fields on first access, see `_LazyModel`.
+
+    Permission entries decode into their lazy subclasses too, so role-only scans don't
+    decode the permission definitions.
+    """
+
+    @staticmethod
+    def from_dict(obj: Any) -> "LazyTableEntry":
+        return LazyTableEntry._from_raw(obj)
+
+
+_LAZY_MODELS: Dict[type, type] = {
+    InsertPermissionEntry: LazyInsertPermissionEntry,
+    SelectPermissionEntry: LazySelectPermissionEntry,
+    UpdatePermissionEntry: LazyUpdatePermissionEntry,
+    DeletePermissionEntry: LazyDeletePermissionEntry,
+    TableEntry: LazyTableEntry,
+}
+for _model, _lazy_model in _LAZY_MODELS.items():
+    _install_lazy_fields(_lazy_model, _model, _LAZY_MODELS)
+del _model, _lazy_model
+
+
 @dataclass
 class HasuraMetadataV2:
     """Type used in exported 'metadata.json' and replace metadata endpoint
@@ -2336,46 +2638,7 @@ class HasuraMetadataV2:
 
     @staticmethod
     def from_dict(obj: Any) -> "HasuraMetadataV2":
-        assert isinstance(obj, dict)
-        tables = from_list(TableEntry.from_dict, obj.get("tables"))
-        version = from_float(obj.get("version"))
-        actions = from_union(
-            [lambda x: from_list(Action.from_dict, x), from_none], obj.get("actions")
-        )
-        allowlist = from_union(
-            [lambda x: from_list(AllowList.from_dict, x), from_none],
-            obj.get("allowlist"),
-        )
-        cron_triggers = from_union(
-            [lambda x: from_list(CronTrigger.from_dict, x), from_none],
-            obj.get("cron_triggers"),
-        )
-        custom_types = from_union(
-            [CustomTypes.from_dict, from_none], obj.get("custom_types")
-        )
-        functions = from_union(
-            [lambda x: from_list(CustomFunction.from_dict, x), from_none],
-            obj.get("functions"),
-        )
-        query_collections = from_union(
-            [lambda x: from_list(QueryCollectionEntry.from_dict, x), from_none],
-            obj.get("query_collections"),
-        )
-        remote_schemas = from_union(
-            [lambda x: from_list(RemoteSchema.from_dict, x), from_none],
-            obj.get("remote_schemas"),
-        )
-        return HasuraMetadataV2(
-            tables,
-            version,
-            actions,
-            allowlist,
-            cron_triggers,
-            custom_types,
-            functions,
-            query_collections,
-            remote_schemas,
-        )
+        return from_class(HasuraMetadataV2, obj)
 
     def to_dict(self) -> dict:
         result: dict = {}
@@ -2542,6 +2805,10 @@ def table_entry_to_dict(x: TableEntry) -> Any:
     return to_class(TableEntry, x)
 
 
+def lazy_table_entry_from_dict(s: Any) -> LazyTableEntry:
+    return LazyTableEntry.from_dict(s)
+
+
 def custom_root_fields_from_dict(s: Any) -> CustomRootFields:
     return CustomRootFields.from_dict(s)
 
@@ -0,0 +1,148 @@
+"""
+Memory-compact variants of the hasura_metadata_sdk models.
+
+Every dataclass of hasura_metadata_sdk has a counterpart of the same name here, with the same
+fields, `from_dict` and `to_dict`, but declared with `__slots__` instead of a per-instance
+`__dict__`. Nested models decode into their slotted counterparts, so a slotted
+`HasuraMetadataV2` is slotted all the way down. Enums are shared with hasura_metadata_sdk.
+
+Swap the import to switch a caller over:
+
+    from hasura_tooling import hasura_metadata_sdk_slots as sdk
+
+    metadata = sdk.HasuraMetadataV2.from_dict(json.load(f))
+
+Instances of the two variants never compare equal to each other; convert with
+`X.from_dict(obj.to_dict())`.
+"""
+
+from dataclasses import dataclass, fields, is_dataclass, MISSING
+from typing import Any, Dict, List, get_type_hints
+
+from hasura_tooling import hasura_metadata_sdk
+from hasura_tooling.hasura_metadata_sdk import (
+    ActionDefinitionType,
+    CustomTypeObjectRelationshipType,
+    EventTriggerColumnsEnum,
+    _substitute_types,
+    content_fingerprint,
+    encode_class,
+    from_class,
+)
+
+
+def slotted_dataclass(c: type) -> type:
+    """Returns a copy of the dataclass `c` that stores its fields in `__slots__`.
+
+    The copy's field annotations still refer to the original nested models, use
+    `slotted_dataclasses` to build a family of slotted models that refer to each other.
+    """
+    names = tuple(f.name for f in fields(c))
+    namespace: Dict[str, Any] = {
+        "__module__": __name__,
+        "__qualname__": c.__qualname__,
+        "__doc__": c.__doc__,
+        "__annotations__": dict(get_type_hints(c)),
+    }
+    for f in fields(c):
+        if f.default is not MISSING:
+            namespace[f.name] = f.default
+    cls = dataclass(type(c.__name__, (), namespace))
+    # recreate the class without the field defaults as class attributes, which would clash
+    # with the slot descriptors. the generated __init__ keeps its own copy of the defaults.
+    namespace = {k: v for k, v in vars(cls).items() if k not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    cls = type(c.__name__, (), namespace)
+    cls.from_dict = staticmethod(lambda obj: from_class(cls, obj))
+    cls.to_dict = lambda self: encode_class(cls, self)
+    if "fingerprint" in vars(c):
+        cls.fingerprint = content_fingerprint
+    return cls
+
+
+def slotted_dataclasses(classes: List[type]) -> Dict[type, type]:
+    """Returns {original: slotted} for `classes`, with nested annotations pointing at the
+    slotted counterparts.
+    """
+    slotted = {c: slotted_dataclass(c) for c in classes}
+    for cls in slotted.values():
+        annotations = {
+            name: _substitute_types(tp, slotted)
+            for name, tp in cls.__annotations__.items()
+        }
+        cls.__annotations__ = annotations
+        for f in fields(cls):
+            f.type = annotations[f.name]
+    return slotted
+
+
+_SLOTTED = {
+    c.__name__: s
+    for c, s in slotted_dataclasses(
+        [
+            c
+            for c in vars(hasura_metadata_sdk).values()
+            # subclasses of the generated models, ex: LazyTableEntry, aren't mirrored
+            if is_dataclass(c) and "__dataclass_fields__" in vars(c)
+        ]
+    ).items()
+}
+
+HeaderFromValue = _SLOTTED["HeaderFromValue"]
+HeaderFromEnv = _SLOTTED["HeaderFromEnv"]
+ObjectField = _SLOTTED["ObjectField"]
+InputArgument = _SLOTTED["InputArgument"]
+Header = _SLOTTED["Header"]
+ActionDefinition = _SLOTTED["ActionDefinition"]
+Permissions = _SLOTTED["Permissions"]
+Action = _SLOTTED["Action"]
+AllowList = _SLOTTED["AllowList"]
+RetryConfST = _SLOTTED["RetryConfST"]
+CronTrigger = _SLOTTED["CronTrigger"]
+EnumValue = _SLOTTED["EnumValue"]
+EnumType = _SLOTTED["EnumType"]
+InputObjectField = _SLOTTED["InputObjectField"]
+InputObjectType = _SLOTTED["InputObjectType"]
+QualifiedTable = _SLOTTED["QualifiedTable"]
+CustomTypeObjectRelationship = _SLOTTED["CustomTypeObjectRelationship"]
+ObjectType = _SLOTTED["ObjectType"]
+ScalarType = _SLOTTED["ScalarType"]
+CustomTypes = _SLOTTED["CustomTypes"]
+FunctionConfiguration = _SLOTTED["FunctionConfiguration"]
+QualifiedFunction = _SLOTTED["QualifiedFunction"]
+CustomFunction = _SLOTTED["CustomFunction"]
+QueryCollection = _SLOTTED["QueryCollection"]
+Definition = _SLOTTED["Definition"]
+QueryCollectionEntry = _SLOTTED["QueryCollectionEntry"]
+RemoteSchemaDef = _SLOTTED["RemoteSchemaDef"]
+RemoteSchema = _SLOTTED["RemoteSchema"]
+ArrRelUsingFKeyOn = _SLOTTED["ArrRelUsingFKeyOn"]
+ArrRelUsingManualMapping = _SLOTTED["ArrRelUsingManualMapping"]
+ArrRelUsing = _SLOTTED["ArrRelUsing"]
+ArrayRelationship = _SLOTTED["ArrayRelationship"]
+ComputedFieldDefinition = _SLOTTED["ComputedFieldDefinition"]
+ComputedField = _SLOTTED["ComputedField"]
+CustomRootFields = _SLOTTED["CustomRootFields"]
+TableConfig = _SLOTTED["TableConfig"]
+DeletePermission = _SLOTTED["DeletePermission"]
+DeletePermissionEntry = _SLOTTED["DeletePermissionEntry"]
+OperationSpec = _SLOTTED["OperationSpec"]
+EventTriggerDefinition = _SLOTTED["EventTriggerDefinition"]
+RetryConf = _SLOTTED["RetryConf"]
+EventTrigger = _SLOTTED["EventTrigger"]
+InsertPermission = _SLOTTED["InsertPermission"]
+InsertPermissionEntry = _SLOTTED["InsertPermissionEntry"]
+ObjRelUsingManualMapping = _SLOTTED["ObjRelUsingManualMapping"]
+ObjRelUsing = _SLOTTED["ObjRelUsing"]
+ObjectRelationship = _SLOTTED["ObjectRelationship"]
+RemoteFieldValue = _SLOTTED["RemoteFieldValue"]
+RemoteRelationshipDef = _SLOTTED["RemoteRelationshipDef"]
+RemoteRelationship = _SLOTTED["RemoteRelationship"]
+SelectPermission = _SLOTTED["SelectPermission"]
+SelectPermissionEntry = _SLOTTED["SelectPermissionEntry"]
+UpdatePermission = _SLOTTED["UpdatePermission"]
+UpdatePermissionEntry = _SLOTTED["UpdatePermissionEntry"]
+TableEntry = _SLOTTED["TableEntry"]
+HasuraMetadataV2 = _SLOTTED["HasuraMetadataV2"]
@@ -0,0 +1,310 @@
+"""
+Incremental reader and writer for large exported 'metadata.json' files.
+
+`hasura_metadata_v2_from_dict` needs the whole export parsed into a dict before building the
+whole object graph. The readers here walk the top-level object of the export instead, and
+parse one `tables` element at a time, so peak memory scales with the largest single table:
+
+    for table_entry in iter_table_entries("metadata.json"):
+        ...
+
+    sections = read_metadata_sections("metadata.json", ["remote_schemas", "actions"])
+
+Sources are file paths, or binary or text file objects (ex: an HTTP response body).
+
+`HasuraMetadataV2.to_dict` builds the whole export as a dict before it can be dumped.
+The writers here encode one table at a time instead, with the same output as dumping
+`to_dict()`:
+
+    with open("metadata.json", "w") as f:
+        # same bytes as json.dump(metadata.to_dict(), f, indent=2)
+        write_metadata_json(metadata, f, indent=2)
+"""
+
+import codecs
+import dataclasses
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, IO, Iterable, Iterator, Tuple, Type, Union
+
+import yaml
+
+from hasura_tooling.hasura_metadata_sdk import (
+    HasuraMetadataV2,
+    LazyTableEntry,
+    TableEntry,
+    _compile_decode_plan,
+)
+from hasura_tooling.util_yaml_dumper import pure_python_dumper
+
+Source = Union[str, os.PathLike, IO]
+
+DEFAULT_SECTIONS = ("version", "remote_schemas", "actions", "custom_types")
+
+
+def iter_table_entries(
+    source: Source, lazy: bool = False, chunk_size: int = 1 << 16
+) -> Iterator[TableEntry]:
+    """Yields the `tables` of a metadata export as TableEntry (or LazyTableEntry) objects,
+    one at a time.
+    """
+    from_dict = LazyTableEntry.from_dict if lazy else TableEntry.from_dict
+    with _open_text(source) as fp:
+        for key, value in _iter_top_level_items(fp, chunk_size):
+            if key == "tables":
+                yield from_dict(value)
+
+
+def read_metadata_sections(
+    source: Source,
+    sections: Iterable[str] = DEFAULT_SECTIONS,
+    chunk_size: int = 1 << 16,
+) -> Dict[str, Any]:
+    """Returns the decoded top-level `sections` of a metadata export, ex: {"actions":
+    List[Action]}, None for sections missing from the export.
+
+    The `tables` array is parsed one element at a time and discarded, never held whole.
+    """
+    converters = {
+        key: (passthrough, convert)
+        for key, passthrough, convert in _compile_decode_plan(HasuraMetadataV2)
+    }
+    raw_sections: Dict[str, Any] = {}
+    for section in sections:
+        if section == "tables" or section not in converters:
+            raise KeyError(f"{section} is not a top-level metadata section")
+        raw_sections[section] = None
+    with _open_text(source) as fp:
+        for key, value in _iter_top_level_items(fp, chunk_size):
+            if key in raw_sections:
+                raw_sections[key] = value
+    result = {}
+    for section, value in raw_sections.items():
+        passthrough, convert = converters[section]
+        result[section] = value if type(value) in passthrough else convert(value)
+    return result
+
+
+def write_metadata_json(metadata: HasuraMetadataV2, fp: IO[str], **kwargs: Any) -> None:
+    """Writes `metadata` to the text file `fp`, byte for byte like
+    `json.dump(metadata.to_dict(), fp, **kwargs)`, converting and encoding one table at
+    a time. `kwargs` are json.dump's, ex: indent, sort_keys.
+    """
+    encoder = (kwargs.pop("cls", None) or json.JSONEncoder)(**kwargs)
+    # the other sections are small, only the tables are converted one at a time
+    sections = dataclasses.replace(metadata, tables=[]).to_dict()
+    keys = sorted(sections) if encoder.sort_keys else list(sections)
+    indent = encoder.indent
+    if isinstance(indent, int):
+        indent = " " * indent
+
+    def newline(level: int) -> str:
+        return "" if indent is None else "\n" + indent * level
+
+    def encode(value: Any, level: int) -> str:
+        # strings escape their newlines, so the newlines of encoded JSON are indents
+        encoded = encoder.encode(value)
+        return encoded if indent is None else encoded.replace("\n", newline(level))
+
+    fp.write("{" + newline(1))
+    for i, key in enumerate(keys):
+        if i:
+            fp.write(encoder.item_separator + newline(1))
+        fp.write(encoder.encode(key) + encoder.key_separator)
+        if key != "tables" or not metadata.tables:
+            fp.write(encode(sections[key], 1))
+            continue
+        fp.write("[" + newline(2))
+        for j, table_entry in enumerate(metadata.tables):
+            if j:
+                fp.write(encoder.item_separator + newline(2))
+            fp.write(encode(table_entry.to_dict(), 2))
+        fp.write(newline(1) + "]")
+    fp.write(newline(0) + "}")
+
+
+def write_metadata_yaml(
+    metadata: HasuraMetadataV2,
+    fp: IO,
+    Dumper: Type[yaml.Dumper] = yaml.Dumper,
+    **kwargs: Any,
+) -> None:
+    """Writes `metadata` to `fp` like `yaml.dump(metadata.to_dict(), fp, Dumper,
+    **kwargs)`, representing and emitting one table at a time.
+
+    YAML anchors can't refer across tables, so the output is the same as yaml.dump's
+    with dumpers that don't write aliases, ex: UnaliasedIndentedListYamlDumper, or when
+    no tables share objects. libyaml dumpers, ex: CUnaliasedIndentedListYamlDumper, are
+    replaced with the pure-Python dumpers they match (see pure_python_dumper).
+    """
+    dumper = pure_python_dumper(Dumper)(fp, **kwargs)
+    try:
+        dumper.open()
+        dumper.emit(
+            yaml.DocumentStartEvent(
+                explicit=dumper.use_explicit_start,
+                version=dumper.use_version,
+                tags=dumper.use_tags,
+            )
+        )
+        sections = dumper.represent_data(
+            dataclasses.replace(metadata, tables=[]).to_dict()
+        )
+        _emit_collection_start(dumper, sections)
+        for key, value in sections.value:
+            _emit_node(dumper, key, sections, None)
+            if key.value != "tables" or not metadata.tables:
+                _emit_node(dumper, value, sections, key)
+                continue
+            # like represent_sequence, a list of mappings is never flow style
+            value.flow_style = bool(dumper.default_flow_style)
+            _emit_collection_start(dumper, value)
+            for table_entry in metadata.tables:
+                table_node = dumper.represent_data(table_entry.to_dict())
+                _emit_node(dumper, table_node, value, None)
+            dumper.emit(yaml.SequenceEndEvent())
+        dumper.emit(yaml.MappingEndEvent())
+        dumper.emit(yaml.DocumentEndEvent(explicit=dumper.use_explicit_end))
+        dumper.close()
+    finally:
+        dumper.dispose()
+
+
+def _emit_collection_start(dumper: yaml.Dumper, node: yaml.Node) -> None:
+    event = (
+        yaml.MappingStartEvent
+        if isinstance(node, yaml.MappingNode)
+        else yaml.SequenceStartEvent
+    )
+    implicit = node.tag == dumper.resolve(type(node), node.value, True)
+    dumper.emit(event(None, node.tag, implicit, flow_style=node.flow_style))
+
+
+def _emit_node(
+    dumper: yaml.Dumper, node: yaml.Node, parent: yaml.Node, index: Any
+) -> None:
+    """Serializes one node, then resets the dumper's state like `Dumper.represent`
+    does after each document, so the node's objects are released.
+    """
+    dumper.anchor_node(node)
+    dumper.serialize_node(node, parent, index)
+    dumper.represented_objects = {}
+    dumper.object_keeper = []
+    dumper.alias_key = None
+    dumper.serialized_nodes = {}
+    dumper.anchors = {}
+    dumper.last_anchor_id = 0
+
+
+@contextmanager
+def _open_text(source: Source) -> Iterator[IO[str]]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "r", encoding="utf-8") as fp:
+            yield fp
+    elif isinstance(source.read(0), bytes):
+        yield codecs.getreader("utf-8")(source)
+    else:
+        yield source
+
+
+# characters that continue a number token, '' for the end of the buffer
+_NUMBER_CONTINUATIONS = frozenset(["", ".", "e", "E", "+", "-", *"0123456789"])
+
+
+class _JsonStreamScanner:
+    """Buffered reader that decodes one JSON value at a time from a text stream."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        # characters of the stream dropped from the front of the buffer, for error offsets
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # read at least as much as is buffered, so a value spanning many chunks is
+        # re-scanned a logarithmic, not linear, number of times
+        chunk = self.fp.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, without consuming it, '' at EOF."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, *chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise self.error(f"Expecting {' or '.join(map(repr, chars))}", self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as err:
+                if self._fill():
+                    continue
+                raise self.error(err.msg, err.pos) from None
+            # a number ending the buffer, or its integer or fraction part, may continue
+            # in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and self.buffer[end : end + 1] in _NUMBER_CONTINUATIONS
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def error(self, msg: str, pos: int) -> ValueError:
+        return ValueError(f"{msg}: char {self.offset + pos}")
+
+
+def _iter_top_level_items(fp: IO[str], chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    """Yields (key, value) for the top-level object of `fp`, and ("tables", table) for
+    every element of its `tables` array.
+    """
+    scanner = _JsonStreamScanner(fp, chunk_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+    while True:
+        if scanner.peek() != '"':
+            raise scanner.error("Expecting property name", scanner.pos)
+        key = scanner.value()
+        scanner.expect(":")
+        if key == "tables" and scanner.peek() == "[":
+            scanner.expect("[")
+            if scanner.peek() == "]":
+                scanner.expect("]")
+            else:
+                while True:
+                    yield key, scanner.value()
+                    if scanner.expect(",", "]") == "]":
+                        break
+        else:
+            yield key, scanner.value()
+        if scanner.expect(",", "}") == "}":
+            return
@@ -0,0 +1,262 @@
+"""
+Config v3 metadata: databases (sources) whose tables are `!include`d files, read lazily.
+
+    metadata = HasuraMetadataV3.from_dir(hasura_metadata_dir())
+    table_metadata = metadata.source("default").table_metadata("test_table")
+
+    bq_metadata_dir = os.path.join(graphql2_dir(), bq_project, "metadata")
+    bq_metadata = HasuraMetadataV3.from_dir(bq_metadata_dir)
+
+Only 'databases.yaml' and a source's 'tables.yaml' are read up front. A table's file is
+read when the table is first asked for, and cached in its source. Table files are found
+by name, following Hasura's `<schema>_<table>.yaml` file naming, or the
+`<role>_<table>.yaml` naming of the BigQuery sources written by
+create_bq_metadata_by_role, so looking up one table doesn't read the others.
+
+IncludedTables is the same lazy reading for the v2-era tooling, which edits the list of
+tables of 'tables.yaml' in place:
+
+    tables = IncludedTables.from_file(tables_metadata_filepath())
+    for table in tables.tables_named("test_table"):
+        table["select_permissions"].append(permission)
+    tables.write()
+"""
+
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from hasura_tooling.hasura_metadata_sdk import HasuraMetadataV2, TableEntry
+from hasura_tooling.util_filepath_and_fileloader import (
+    load_yaml_file,
+    load_yaml_files_parallel,
+)
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
+
+INCLUDE_PREFIX = "!include "
+
+
+def resolve_include(include: str, base_dir: str) -> str:
+    """Path of the file that an `!include <path>` entry of a file in `base_dir` refers
+    to, raises ValueError if `include` isn't an include.
+    """
+    if not include.startswith(INCLUDE_PREFIX):
+        raise ValueError(f"Not an !include entry: {include!r}")
+    return os.path.normpath(
+        os.path.join(base_dir, include[len(INCLUDE_PREFIX) :].strip())
+    )
+
+
+class IncludedTables(Sequence):
+    """
+    The tables of a 'tables.yaml', a sequence of table metadata whose `!include`d
+    entries are read from their files on first access, and cached. Entries that aren't
+    includes, the table metadata of config v2, are the tables themselves.
+
+    Tables are edited in place, and `write()` writes the read tables back to their
+    files, so the tables that weren't accessed are neither read nor written.
+    """
+
+    def __init__(self, tables_filepath: str, entries: List[Union[str, dict]]):
+        self.tables_filepath = tables_filepath
+        self._entries = entries
+        tables_dir = os.path.dirname(tables_filepath)
+        self._filepaths = [
+            resolve_include(entry, tables_dir) if isinstance(entry, str) else None
+            for entry in entries
+        ]
+        self._tables: Dict[int, dict] = {}
+
+    @staticmethod
+    def from_file(tables_filepath: str) -> "IncludedTables":
+        return IncludedTables(tables_filepath, load_yaml_file(tables_filepath) or [])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        if self._filepaths[index] is None:
+            return self._entries[index]
+        if index not in self._tables:
+            self._tables[index] = load_yaml_file(self._filepaths[index])
+        return self._tables[index]
+
+    def filepath(self, index: int) -> Optional[str]:
+        """Path of the file of the `index`th table, None if it isn't an include."""
+        return self._filepaths[index]
+
+    def prefetch(self, processes: Optional[int] = None) -> None:
+        """Reads the tables that weren't read yet, by `processes` worker processes
+        (default: one per core), see load_yaml_files_parallel.
+        """
+        indexes = [
+            index
+            for index, filepath in enumerate(self._filepaths)
+            if filepath is not None and index not in self._tables
+        ]
+        filepaths = [self._filepaths[index] for index in indexes]
+        for index, table in zip(
+            indexes, load_yaml_files_parallel(filepaths, processes)
+        ):
+            self._tables[index] = table
+
+    def tables_named(self, table_name: str) -> List[dict]:
+        """
+        The tables named `table_name`, of any schema. Only reads the files whose
+        `<schema>_<table>.yaml` name could be the table's, ex: 'public_test_table.yaml'
+        for 'test_table', but also 'public_other_test_table.yaml' for it.
+        """
+        suffix = f"_{table_name}.yaml"
+        return [
+            self[index]
+            for index, filepath in enumerate(self._filepaths)
+            if filepath is None or os.path.basename(filepath).endswith(suffix)
+            if self[index]["table"]["name"] == table_name
+        ]
+
+    def read_tables(self) -> Iterator[Tuple[str, dict]]:
+        """(path of the file, table) of the included tables read so far."""
+        for index in sorted(self._tables):
+            yield self._filepaths[index], self._tables[index]
+
+    def write(self) -> None:
+        """Writes the included tables read so far to their files, and 'tables.yaml'
+        if it has tables that aren't includes. Unchanged files aren't rewritten.
+        """
+        for filepath, table in self.read_tables():
+            _dump_tables_yaml(table, filepath)
+        if None in self._filepaths:
+            _dump_tables_yaml(self._entries, self.tables_filepath)
+
+
+def _dump_tables_yaml(data: Any, filepath: str) -> None:
+    dump_yaml_file(
+        filepath,
+        data,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+
+
+@dataclass
+class MetadataSource:
+    """A database of config v3 metadata, ex: 'default', with its tables listed as
+    includes in `tables_filepath`.
+    """
+
+    name: str
+    tables_filepath: str
+    kind: Optional[str] = None
+    configuration: Optional[dict] = None
+    _table_filepaths: Optional[List[str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _table_filepaths_by_filename: Dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _tables: Dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def table_filepaths(self) -> List[str]:
+        """Paths of the included table files, in 'tables.yaml' order."""
+        if self._table_filepaths is None:
+            tables_dir = os.path.dirname(self.tables_filepath)
+            self._table_filepaths = [
+                resolve_include(include, tables_dir)
+                for include in load_yaml_file(self.tables_filepath) or []
+            ]
+            for filepath in reversed(self._table_filepaths):
+                self._table_filepaths_by_filename[os.path.basename(filepath)] = filepath
+        return self._table_filepaths
+
+    def __len__(self) -> int:
+        return len(self.table_filepaths())
+
+    def table_filepath(self, table_name: str, schema: str = "public") -> str:
+        """Path of the included `<schema>_<table_name>.yaml`, raises KeyError if
+        'tables.yaml' doesn't include it.
+        """
+        self.table_filepaths()
+        filename = f"{schema}_{table_name}.yaml"
+        if filename not in self._table_filepaths_by_filename:
+            raise KeyError(f"{self.name}: {filename}")
+        return self._table_filepaths_by_filename[filename]
+
+    def table_metadata(self, table_name: str, schema: str = "public") -> dict:
+        """The raw metadata of one table, read from its file on first access."""
+        return self._load_table(self.table_filepath(table_name, schema))
+
+    def table_entry(self, table_name: str, schema: str = "public") -> TableEntry:
+        return TableEntry.from_dict(self.table_metadata(table_name, schema))
+
+    def iter_table_metadata(self) -> Iterator[dict]:
+        """The raw metadata of every table, read one file at a time."""
+        for filepath in self.table_filepaths():
+            yield self._load_table(filepath)
+
+    def iter_table_entries(self) -> Iterator[TableEntry]:
+        for table_metadata in self.iter_table_metadata():
+            yield TableEntry.from_dict(table_metadata)
+
+    def _load_table(self, filepath: str) -> dict:
+        if filepath not in self._tables:
+            self._tables[filepath] = load_yaml_file(filepath)
+        return self._tables[filepath]
+
+
+@dataclass
+class HasuraMetadataV3:
+    """Config v3 metadata directory, ex: `hasura_metadata_dir()`."""
+
+    metadata_dir: str
+    sources: List[MetadataSource]
+
+    @staticmethod
+    def from_dir(metadata_dir: str) -> "HasuraMetadataV3":
+        """Reads the sources from 'databases/databases.yaml', or, without it, from the
+        'databases/<source>/tables/tables.yaml' files, like this repo's layout.
+        """
+        databases_dir = os.path.join(metadata_dir, "databases")
+        databases_filepath = os.path.join(databases_dir, "databases.yaml")
+        sources = []
+        if os.path.exists(databases_filepath):
+            for database in load_yaml_file(databases_filepath) or []:
+                sources.append(
+                    MetadataSource(
+                        name=database["name"],
+                        tables_filepath=resolve_include(
+                            database["tables"], databases_dir
+                        ),
+                        kind=database.get("kind"),
+                        configuration=database.get("configuration"),
+                    )
+                )
+        elif os.path.isdir(databases_dir):
+            for source_name in sorted(os.listdir(databases_dir)):
+                tables_filepath = os.path.join(
+                    databases_dir, source_name, "tables", "tables.yaml"
+                )
+                if os.path.exists(tables_filepath):
+                    sources.append(MetadataSource(source_name, tables_filepath))
+        return HasuraMetadataV3(metadata_dir, sources)
+
+    def source(self, name: str = "default") -> MetadataSource:
+        """Raises KeyError if there is no source `name`."""
+        for source in self.sources:
+            if source.name == name:
+                return source
+        raise KeyError(name)
+
+    def to_v2(self, source_name: str = "default") -> HasuraMetadataV2:
+        """The tables of one source as v2 metadata, for the v2 tooling, ex:
+        MetadataIndex or diff_metadata. Reads every table file of the source.
+        """
+        return HasuraMetadataV2(
+            tables=list(self.source(source_name).iter_table_entries()), version=2
+        )
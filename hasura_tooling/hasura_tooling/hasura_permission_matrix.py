@@ -0,0 +1,234 @@
+"""
+Role × table × column select permissions as NumPy bitsets.
+
+`PermissionMatrix` interns the roles, tables and columns of a set of select
+permissions, and stores each role's access as a packed boolean array with one bit per
+(table, column):
+
+    matrix = PermissionMatrix.from_table_dicts(yield_by_table_metadata())
+    matrix = PermissionMatrix.from_permission_definitions(api_data_supersets_metadata())
+
+    matrix.roles_with_column("test_table", "id")
+    matrix.columns(matrix.intersection("role1", "role2"))
+    # {table name: columns superset2 has and superset1 hasn't}
+    matrix.added_columns("superset2", ["superset1"])
+
+Set operations over roles are vectorized bitwise operations on the packed arrays,
+instead of loops over dicts of column sets. Tables are keyed by name, ignoring their
+schema, like the rest of hasura_tooling. A permission whose columns are "*" has every
+column that the other permissions name on its table.
+
+NumPy is an optional dependency, see the `numpy` extra in pyproject.toml.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+from hasura_tooling.hasura_metadata_sdk import HasuraMetadataV2, TableEntry
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SHARED_COUNTS_BLOCK_BYTES = 1 << 12
+
+# a role name, or a packed access array, ex: returned by `union`
+Access = Union[str, "np.ndarray"]
+
+
+class PermissionMatrix:
+    """Packed select permission bitsets, one row per role, one bit per column.
+
+    When a role has more than one select permission on a table, their columns are
+    merged.
+    """
+
+    def __init__(self, permissions: Iterable[Tuple[str, str, Any]]):
+        """`permissions` are (role, table name, columns) triples."""
+        if np is None:
+            raise ImportError("PermissionMatrix needs numpy, install the 'numpy' extra")
+        self._role_ids: Dict[str, int] = {}
+        table_columns: Dict[str, Dict[str, None]] = {}
+        grants: List[Tuple[int, str, Any]] = []
+        for role, table_name, columns in permissions:
+            role_id = self._role_ids.setdefault(role, len(self._role_ids))
+            known_columns = table_columns.setdefault(table_name, {})
+            if isinstance(columns, list):
+                known_columns.update(dict.fromkeys(columns))
+            grants.append((role_id, table_name, columns))
+
+        self._roles = list(self._role_ids)
+        self._tables: List[str] = sorted(table_columns)
+        self._table_ids = {table: i for i, table in enumerate(self._tables)}
+        self._columns: List[Tuple[str, str]] = []
+        self._column_ids: Dict[str, Dict[str, int]] = {}
+        offsets = [0]
+        for table_name in self._tables:
+            column_ids = self._column_ids[table_name] = {}
+            for column in sorted(table_columns[table_name]):
+                column_ids[column] = len(self._columns)
+                self._columns.append((table_name, column))
+            offsets.append(len(self._columns))
+        self._offsets = np.array(offsets, dtype=np.int64)
+
+        role_ids: List[int] = []
+        column_ids: List[int] = []
+        for role_id, table_name, columns in grants:
+            if isinstance(columns, list):
+                ids = [self._column_ids[table_name][column] for column in columns]
+            else:
+                table_id = self._table_ids[table_name]
+                ids = range(offsets[table_id], offsets[table_id + 1])
+            role_ids.extend([role_id] * len(ids))
+            column_ids.extend(ids)
+        self._bits = np.zeros(
+            (len(self._role_ids), (len(self._columns) + 7) // 8), dtype=np.uint8
+        )
+        rows = np.array(role_ids, dtype=np.int64)
+        bits = np.array(column_ids, dtype=np.int64)
+        np.bitwise_or.at(
+            self._bits, (rows, bits >> 3), (0x80 >> (bits & 7)).astype(np.uint8)
+        )
+
+    @classmethod
+    def from_metadata(cls, metadata: HasuraMetadataV2) -> "PermissionMatrix":
+        return cls.from_table_entries(metadata.tables)
+
+    @classmethod
+    def from_table_entries(
+        cls, table_entries: Iterable[TableEntry]
+    ) -> "PermissionMatrix":
+        return cls(
+            (entry.role, table_entry.table.name, _columns(entry.permission.columns))
+            for table_entry in table_entries
+            for entry in table_entry.select_permissions or []
+        )
+
+    @classmethod
+    def from_table_dicts(cls, table_dicts: Iterable[dict]) -> "PermissionMatrix":
+        """Builds the matrix from raw table metadata, ex: the sharded tables yielded by
+        `yield_by_table_metadata`, without decoding it to TableEntry.
+        """
+        return cls(
+            (entry["role"], table_dict["table"]["name"], entry["permission"]["columns"])
+            for table_dict in table_dicts
+            for entry in table_dict.get("select_permissions") or []
+        )
+
+    @classmethod
+    def from_permission_definitions(
+        cls, permission_definitions: Mapping[str, Mapping[str, dict]]
+    ) -> "PermissionMatrix":
+        """Builds the matrix from {name: {table name: permission}}, ex: the supersets of
+        `api_data_supersets_metadata()`, or roles' `get_role_permdef_shards`.
+        """
+        return cls(
+            (name, table_name, permission["columns"])
+            for name, permissions in permission_definitions.items()
+            for table_name, permission in permissions.items()
+        )
+
+    @property
+    def roles(self) -> List[str]:
+        return list(self._roles)
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._role_ids)
+
+    def __contains__(self, role: object) -> bool:
+        return role in self._role_ids
+
+    def access(self, role: str) -> "np.ndarray":
+        """The packed access array of `role`, raises KeyError for an unknown role."""
+        return self._bits[self._role_ids[role]].copy()
+
+    def union(self, *roles: Access) -> "np.ndarray":
+        """Packed access to the columns any of `roles` can select."""
+        return np.bitwise_or.reduce(self._rows(roles), axis=0)
+
+    def intersection(self, *roles: Access) -> "np.ndarray":
+        """Packed access to the columns all of `roles` can select."""
+        return np.bitwise_and.reduce(self._rows(roles), axis=0)
+
+    def difference(self, role: Access, *others: Access) -> "np.ndarray":
+        """Packed access to the columns `role` can select and none of `others` can."""
+        access = self._row(role)
+        return access & ~self.union(*others) if others else access.copy()
+
+    def added_columns(
+        self, role: Access, base: Sequence[Access]
+    ) -> Dict[str, List[str]]:
+        """{table name: columns} that `role` adds to the union of `base`, ex: what a
+        superset adds to a role's other supersets.
+        """
+        return self.columns(self.difference(role, *base))
+
+    def columns(self, access: Access) -> Dict[str, List[str]]:
+        """{table name: sorted columns} of a role or packed access array."""
+        column_ids = np.flatnonzero(self._unpack(self._row(access)))
+        result: Dict[str, List[str]] = {}
+        for column_id in column_ids.tolist():
+            table_name, column = self._columns[column_id]
+            result.setdefault(table_name, []).append(column)
+        return result
+
+    def column_counts(self) -> Dict[str, int]:
+        """{role: number of (table, column) the role can select}."""
+        counts = self._unpack(self._bits).sum(axis=1)
+        return dict(zip(self._roles, counts.tolist()))
+
+    def roles_with_column(self, table_name: str, column: str) -> List[str]:
+        """Roles that can select `column` of `table_name`, raises KeyError if no
+        permission names the column.
+        """
+        column_id = self._column_ids[table_name][column]
+        selected = self._bits[:, column_id >> 3] & (0x80 >> (column_id & 7))
+        return self._role_names(np.flatnonzero(selected))
+
+    def roles_with_table(self, table_name: str) -> List[str]:
+        """Roles that can select any column of `table_name`, raises KeyError if no
+        permission is on the table.
+        """
+        table_id = self._table_ids[table_name]
+        start, stop = int(self._offsets[table_id]), int(self._offsets[table_id + 1])
+        table_bits = np.unpackbits(self._bits[:, start >> 3 : (stop + 7) >> 3], axis=1)
+        first = start & 7
+        selected = table_bits[:, first : first + stop - start].any(axis=1)
+        return self._role_names(np.flatnonzero(selected))
+
+    def shared_column_counts(self) -> "np.ndarray":
+        """(roles × roles) array of the number of columns both roles can select, in
+        `roles` order. The diagonal is `column_counts`.
+        """
+        counts = np.zeros((len(self._roles), len(self._roles)), dtype=np.int64)
+        # float32 matrix products use BLAS, and are exact for blocks of < 2**24 columns
+        for start in range(0, self._bits.shape[1], SHARED_COUNTS_BLOCK_BYTES):
+            block = self._bits[:, start : start + SHARED_COUNTS_BLOCK_BYTES]
+            unpacked = np.unpackbits(block, axis=1).astype(np.float32)
+            counts += (unpacked @ unpacked.T).astype(np.int64)
+        return counts
+
+    def _row(self, access: Access) -> "np.ndarray":
+        if isinstance(access, str):
+            return self._bits[self._role_ids[access]]
+        return np.asarray(access, dtype=np.uint8)
+
+    def _rows(self, roles: Sequence[Access]) -> "np.ndarray":
+        if not roles:
+            raise ValueError("At least one role is needed")
+        return np.stack([self._row(role) for role in roles])
+
+    def _unpack(self, bits: "np.ndarray") -> "np.ndarray":
+        return np.unpackbits(bits, axis=-1, count=len(self._columns)).view(bool)
+
+    def _role_names(self, role_ids: "np.ndarray") -> List[str]:
+        return [self._roles[role_id] for role_id in role_ids.tolist()]
+
+
+def _columns(columns: Any) -> Any:
+    # EventTriggerColumnsEnum ("*") to its value, like the raw metadata
+    return columns if isinstance(columns, list) else getattr(columns, "value", columns)
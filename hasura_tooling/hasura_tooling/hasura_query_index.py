@@ -0,0 +1,722 @@
+"""
+Parsed-query cache, and an index of the tables, relationships and columns that the
+queries of query collections touch.
+
+    cache = ParsedQueryCache(parsed_queries_cache_filepath())
+    index = QueryIndex.from_metadata(metadata, cache)  # the allowlisted collections
+    cache.save()
+
+    index.queries_using_column("test_table", "id")  # [(collection, query name)]
+    index.usage("allowed-queries", "test_query").relationships
+
+Queries are parsed by a small parser for GraphQL executable documents, and keyed by
+`query_hash`, a hash of their tokens, so queries that differ only in whitespace, commas
+or comments are parsed and resolved once. `ParsedQueryCache` keeps the parsed queries in
+a snapshot file (see util_snapshot_cache), so later runs don't parse them again.
+
+Fields are resolved against the tables' metadata like Hasura generates its schema:
+- root fields `<table>`, `<table>_by_pk`, `<table>_aggregate`, `insert_<table>`,
+  `insert_<table>_one`, `update_<table>`, `update_<table>_by_pk`, `delete_<table>`
+  and `delete_<table>_by_pk`, or their `custom_root_fields`, prefixed by `<schema>_`
+  for tables outside of the public schema
+- object, array (and `<relationship>_aggregate`) and remote relationships
+- computed fields, which aren't columns
+- columns, by their `custom_column_names`
+Columns named in literal `where`, `order_by`, `distinct_on`, `_set`, `objects`, ...
+arguments are used too, values passed as variables can't be looked into. Root fields of
+actions or remote schemas aren't tables, and are listed in `unresolved_root_fields`.
+
+The remote table of a relationship is only known from the metadata when it is declared
+with a `manual_configuration`, or for array relationships, with the table of its
+`foreign_key_constraint_on`. Object relationships on a foreign key column, and
+relationships to tables missing from the metadata, are listed in
+`unresolved_relationships`, and the columns selected through them aren't indexed: a
+query that has unresolved relationships may use more columns than `columns` lists.
+"""
+
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from hasura_tooling.hasura_metadata_index import _remote_table_name
+from hasura_tooling.hasura_metadata_sdk import (
+    AllowList,
+    HasuraMetadataV2,
+    QueryCollectionEntry,
+    TableEntry,
+)
+from hasura_tooling.util_snapshot_cache import read_snapshot, write_snapshot
+
+PARSED_QUERY_FORMAT = 1
+
+_TOKEN = re.compile(
+    r"""
+    (?P<ignored>[\s,\ufeff]+|\#[^\n\r]*)
+    |(?P<block_string>\"\"\"(?:\\\"\"\"|[^"]|"(?!""))*\"\"\")
+    |(?P<string>"(?:\\.|[^"\\\n\r])*")
+    |(?P<punctuator>\.\.\.|[!$&()\:=@\[\]{|}])
+    |(?P<number>-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+    |(?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    """,
+    re.VERBOSE,
+)
+
+
+class Variable(NamedTuple):
+    """A `$name` argument value."""
+
+    name: str
+
+
+class Field(NamedTuple):
+    name: str
+    alias: Optional[str]
+    arguments: Dict[str, Any]
+    selections: Tuple["Selection", ...]
+
+
+class FragmentSpread(NamedTuple):
+    name: str
+
+
+class InlineFragment(NamedTuple):
+    type_condition: Optional[str]
+    selections: Tuple["Selection", ...]
+
+
+Selection = Union[Field, FragmentSpread, InlineFragment]
+
+
+class Operation(NamedTuple):
+    """A query, mutation or subscription of a document."""
+
+    operation: str
+    name: Optional[str]
+    selections: Tuple[Selection, ...]
+
+
+class ParsedQuery(NamedTuple):
+    hash: str
+    operations: Tuple[Operation, ...]
+    fragments: Dict[str, Tuple[Selection, ...]]
+
+
+class QueryUsage(NamedTuple):
+    """What a query touches: table names, (table, relationship) and (table, column).
+    `unresolved_relationships` are the (table, relationship) whose remote table isn't
+    known, the columns used through them are missing from `columns`.
+    """
+
+    tables: FrozenSet[str]
+    relationships: FrozenSet[Tuple[str, str]]
+    columns: FrozenSet[Tuple[str, str]]
+    unresolved_root_fields: FrozenSet[str]
+    unresolved_relationships: FrozenSet[Tuple[str, str]]
+
+
+def tokenize(query: str) -> List[Tuple[str, str]]:
+    """(kind, text) of the tokens of `query`, without whitespace, commas and comments.
+    Raises ValueError for characters that don't start a token.
+    """
+    tokens = []
+    pos = 0
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None:
+            raise ValueError(f"Unexpected character {query[pos]!r}: char {pos}")
+        if match.lastgroup != "ignored":
+            tokens.append((match.lastgroup, match.group()))
+        pos = match.end()
+    return tokens
+
+
+def query_hash(query: str) -> str:
+    """Hex digest of the tokens of `query`, equal for queries that differ only in
+    whitespace, commas or comments.
+    """
+    return _token_hash(tokenize(query))
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """Parses a GraphQL executable document, raises ValueError if it is malformed."""
+    tokens = tokenize(query)
+    return _Parser(tokens).document(_token_hash(tokens))
+
+
+class ParsedQueryCache:
+    """Parsed queries by `query_hash`, loaded from and saved to a snapshot file at
+    `cache_path`, `cache_path=None` keeps them in memory only.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path
+        payload = None
+        if cache_path is not None:
+            payload = read_snapshot(cache_path, self._manifest())
+        # digest of a query's text -> its query_hash, to skip tokenizing known queries
+        self._hashes: Dict[str, str] = payload["hashes"] if payload else {}
+        self._queries: Dict[str, ParsedQuery] = payload["queries"] if payload else {}
+        self._changed = False
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def parse(self, query: str) -> ParsedQuery:
+        """`parse_query(query)`, from the cache if an equivalent query was parsed."""
+        text_digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        if text_digest in self._hashes:
+            return self._queries[self._hashes[text_digest]]
+        tokens = tokenize(query)
+        digest = _token_hash(tokens)
+        if digest not in self._queries:
+            self._queries[digest] = _Parser(tokens).document(digest)
+        self._hashes[text_digest] = digest
+        self._changed = True
+        return self._queries[digest]
+
+    def save(self) -> None:
+        """Writes the cache to `cache_path` if queries were parsed since it was read."""
+        if self.cache_path is not None and self._changed:
+            payload = {"hashes": self._hashes, "queries": self._queries}
+            write_snapshot(self.cache_path, self._manifest(), payload)
+            self._changed = False
+
+    @staticmethod
+    def _manifest() -> List[Tuple[str, str]]:
+        return [("parsed_queries", str(PARSED_QUERY_FORMAT))]
+
+
+class QueryIndex:
+    """The tables, relationships and columns touched by named queries, resolved against
+    the metadata of `table_entries`.
+    """
+
+    def __init__(
+        self,
+        table_entries: Iterable[TableEntry],
+        cache: Optional[ParsedQueryCache] = None,
+    ):
+        self.cache = cache if cache is not None else ParsedQueryCache()
+        self._schema = _Schema(table_entries)
+        self._usages: Dict[Tuple[str, str], QueryUsage] = {}
+        self._usages_by_hash: Dict[str, QueryUsage] = {}
+        # {(collection, query name): error message} of the queries that aren't valid
+        self.errors: Dict[Tuple[str, str], str] = {}
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: HasuraMetadataV2,
+        cache: Optional[ParsedQueryCache] = None,
+        allowlisted_only: bool = True,
+    ) -> "QueryIndex":
+        """Indexes the queries of the collections in the allowlist, or of every
+        collection if `allowlisted_only` is False.
+        """
+        index = cls(metadata.tables, cache)
+        index.add_collections(
+            metadata.query_collections or [],
+            (metadata.allowlist or []) if allowlisted_only else None,
+        )
+        return index
+
+    def add_collections(
+        self,
+        query_collections: Iterable[QueryCollectionEntry],
+        allowlist: Optional[Iterable[AllowList]] = None,
+    ) -> None:
+        """Adds the queries of `query_collections`, only of the collections in
+        `allowlist` if it isn't None.
+        """
+        allowed = None
+        if allowlist is not None:
+            allowed = {entry.collection for entry in allowlist}
+        for collection in query_collections:
+            if allowed is None or collection.name in allowed:
+                for query in collection.definition.queries:
+                    self.add(collection.name, query.name, query.query)
+
+    def add(self, collection: str, name: str, query: str) -> Optional[QueryUsage]:
+        """Indexes one query, returns what it touches, or None if it can't be parsed,
+        see `errors`.
+        """
+        try:
+            parsed_query = self.cache.parse(query)
+            if parsed_query.hash not in self._usages_by_hash:
+                self._usages_by_hash[parsed_query.hash] = self._schema.usage(
+                    parsed_query
+                )
+        except ValueError as e:
+            self.errors[collection, name] = str(e)
+            return None
+        self._usages[collection, name] = self._usages_by_hash[parsed_query.hash]
+        return self._usages[collection, name]
+
+    def __len__(self) -> int:
+        return len(self._usages)
+
+    def queries(self) -> List[Tuple[str, str]]:
+        """(collection, query name) of the indexed queries."""
+        return list(self._usages)
+
+    def usage(self, collection: str, name: str) -> QueryUsage:
+        """Raises KeyError if the query isn't indexed."""
+        return self._usages[collection, name]
+
+    def queries_using_table(self, table_name: str) -> List[Tuple[str, str]]:
+        return [
+            key for key, usage in self._usages.items() if table_name in usage.tables
+        ]
+
+    def queries_using_relationship(
+        self, table_name: str, relationship: str
+    ) -> List[Tuple[str, str]]:
+        return [
+            key
+            for key, usage in self._usages.items()
+            if (table_name, relationship) in usage.relationships
+        ]
+
+    def queries_using_column(
+        self, table_name: str, column: str
+    ) -> List[Tuple[str, str]]:
+        """The queries that break if `column` of `table_name` is dropped, or isn't
+        selectable anymore. Queries with `unresolved_relationships` can use it without
+        being listed, see `queries_with_unresolved_relationships`.
+        """
+        return [
+            key
+            for key, usage in self._usages.items()
+            if (table_name, column) in usage.columns
+        ]
+
+    def queries_with_unresolved_relationships(self) -> List[Tuple[str, str]]:
+        """The queries whose usage is partial, see QueryUsage."""
+        return [
+            key for key, usage in self._usages.items() if usage.unresolved_relationships
+        ]
+
+
+def _token_hash(tokens: List[Tuple[str, str]]) -> str:
+    normalized = " ".join(text for _, text in tokens)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _Parser:
+    """Recursive descent parser over the tokens of a GraphQL executable document.
+    Directives and variable definitions are skipped.
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def document(self, digest: str) -> ParsedQuery:
+        operations = []
+        fragments = {}
+        while self.peek():
+            if self.peek() == "{":
+                operations.append(Operation("query", None, self.selection_set()))
+            elif self.peek() == "fragment":
+                self.next()
+                name = self.name()
+                self.expect("on")
+                self.name()
+                self.directives()
+                fragments[name] = self.selection_set()
+            elif self.peek() in ("query", "mutation", "subscription"):
+                operation = self.next()
+                name = self.name() if self.kind() == "name" else None
+                if self.peek() == "(":
+                    self.skip_balanced("(", ")")
+                self.directives()
+                operations.append(Operation(operation, name, self.selection_set()))
+            else:
+                raise self.error("Expecting an operation or fragment")
+        return ParsedQuery(digest, tuple(operations), fragments)
+
+    def selection_set(self) -> Tuple[Selection, ...]:
+        self.expect("{")
+        selections: List[Selection] = []
+        while self.peek() != "}":
+            if self.peek() == "...":
+                self.next()
+                if self.peek() == "on":
+                    self.next()
+                    type_condition = self.name()
+                    self.directives()
+                    selections.append(
+                        InlineFragment(type_condition, self.selection_set())
+                    )
+                elif self.peek() in ("{", "@"):
+                    self.directives()
+                    selections.append(InlineFragment(None, self.selection_set()))
+                else:
+                    selections.append(FragmentSpread(self.name()))
+                    self.directives()
+            else:
+                selections.append(self.field())
+        self.expect("}")
+        return tuple(selections)
+
+    def field(self) -> Field:
+        alias, name = None, self.name()
+        if self.peek() == ":":
+            self.next()
+            alias, name = name, self.name()
+        arguments = self.arguments()
+        self.directives()
+        selections = self.selection_set() if self.peek() == "{" else ()
+        return Field(name, alias, arguments, selections)
+
+    def arguments(self) -> Dict[str, Any]:
+        arguments = {}
+        if self.peek() == "(":
+            self.next()
+            while self.peek() != ")":
+                name = self.name()
+                self.expect(":")
+                arguments[name] = self.value()
+            self.next()
+        return arguments
+
+    def directives(self) -> None:
+        while self.peek() == "@":
+            self.next()
+            self.name()
+            self.arguments()
+
+    def value(self) -> Any:
+        kind, text = self.kind(), self.next()
+        if text == "$":
+            return Variable(self.name())
+        if text == "[":
+            values = []
+            while self.peek() != "]":
+                values.append(self.value())
+            self.next()
+            return values
+        if text == "{":
+            fields = {}
+            while self.peek() != "}":
+                name = self.name()
+                self.expect(":")
+                fields[name] = self.value()
+            self.next()
+            return fields
+        if kind == "number":
+            return json.loads(text)
+        if kind == "string":
+            return json.loads(text)
+        if kind == "block_string":
+            return text[3:-3].replace('\\"""', '"""')
+        if kind == "name":
+            return {"true": True, "false": False, "null": None}.get(text, text)
+        raise self.error(f"Unexpected {text!r}", self.pos - 1)
+
+    def skip_balanced(self, open: str, close: str) -> None:
+        depth = 0
+        while True:
+            text = self.next()
+            depth += {open: 1, close: -1}.get(text, 0)
+            if depth == 0:
+                return
+
+    def peek(self) -> str:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else ""
+
+    def kind(self) -> str:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else ""
+
+    def next(self) -> str:
+        if self.pos >= len(self.tokens):
+            raise self.error("Unexpected end of query")
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def name(self) -> str:
+        if self.kind() != "name":
+            raise self.error("Expecting a name")
+        return self.next()
+
+    def expect(self, text: str) -> None:
+        if self.peek() != text:
+            raise self.error(f"Expecting {text!r}")
+        self.next()
+
+    def error(self, msg: str, pos: Optional[int] = None) -> ValueError:
+        return ValueError(f"{msg}: token {self.pos if pos is None else pos}")
+
+
+_ROOT_FIELD_FORMATS = {
+    "select": "{}",
+    "select_by_pk": "{}_by_pk",
+    "select_aggregate": "{}_aggregate",
+    "insert": "insert_{}",
+    "insert_one": "insert_{}_one",
+    "update": "update_{}",
+    "update_by_pk": "update_{}_by_pk",
+    "delete": "delete_{}",
+    "delete_by_pk": "delete_{}_by_pk",
+}
+
+# arguments whose keys are columns
+_COLUMN_KEY_ARGUMENTS = (
+    "_set",
+    "_inc",
+    "_append",
+    "_prepend",
+    "_delete_key",
+    "_delete_elem",
+    "_delete_at_path",
+    "pk_columns",
+)
+
+
+class _TableSchema(NamedTuple):
+    name: str
+    # relationship name -> remote table name, None if it isn't known
+    relationships: Dict[str, Optional[str]]
+    # relationships to remote schemas, which have no remote table
+    remote_relationships: FrozenSet[str]
+    computed_fields: FrozenSet[str]
+    # GraphQL field name -> column name, for customized column names
+    columns: Dict[str, str]
+
+
+class _Schema:
+    def __init__(self, table_entries: Iterable[TableEntry]):
+        self.tables: Dict[str, _TableSchema] = {}
+        self.root_fields: Dict[str, Tuple[str, str]] = {}
+        for table_entry in table_entries:
+            self._add(table_entry)
+
+    def _add(self, table_entry: TableEntry) -> None:
+        table = table_entry.table
+        if table.name in self.tables:
+            return
+        relationships: Dict[str, Optional[str]] = {}
+        for relationship in [
+            *(table_entry.object_relationships or []),
+            *(table_entry.array_relationships or []),
+        ]:
+            relationships[relationship.name] = _remote_table_name(relationship)
+        remote_relationships = frozenset(
+            remote_relationship.name
+            for remote_relationship in table_entry.remote_relationships or []
+        )
+        relationships.update(dict.fromkeys(remote_relationships))
+        configuration = table_entry.configuration
+        custom_column_names = (
+            configuration and configuration.custom_column_names
+        ) or {}
+        self.tables[table.name] = _TableSchema(
+            table.name,
+            relationships,
+            remote_relationships,
+            frozenset(field.name for field in table_entry.computed_fields or []),
+            {field: column for column, field in custom_column_names.items()},
+        )
+        custom_root_fields = configuration and configuration.custom_root_fields
+        graphql_name = (
+            table.name if table.schema == "public" else f"{table.schema}_{table.name}"
+        )
+        for kind, root_field_format in _ROOT_FIELD_FORMATS.items():
+            root_field = getattr(custom_root_fields, kind, None)
+            self.root_fields[root_field or root_field_format.format(graphql_name)] = (
+                table.name,
+                kind,
+            )
+
+    def usage(self, parsed_query: ParsedQuery) -> QueryUsage:
+        walk = _UsageWalk(self, parsed_query.fragments)
+        for operation in parsed_query.operations:
+            for field in walk.fields(operation.selections):
+                if field.name.startswith("__"):
+                    continue
+                if field.name not in self.root_fields:
+                    walk.unresolved_root_fields.add(field.name)
+                    continue
+                table_name, kind = self.root_fields[field.name]
+                walk.root_field(self.tables[table_name], kind, field)
+        return QueryUsage(
+            frozenset(walk.tables),
+            frozenset(walk.relationships),
+            frozenset(walk.columns),
+            frozenset(walk.unresolved_root_fields),
+            frozenset(walk.unresolved_relationships),
+        )
+
+
+class _UsageWalk:
+    def __init__(self, schema: _Schema, fragments: Dict[str, Tuple[Selection, ...]]):
+        self.schema = schema
+        self.fragments = fragments
+        self.tables: Set[str] = set()
+        self.relationships: Set[Tuple[str, str]] = set()
+        self.columns: Set[Tuple[str, str]] = set()
+        self.unresolved_root_fields: Set[str] = set()
+        self.unresolved_relationships: Set[Tuple[str, str]] = set()
+
+    def fields(
+        self, selections: Tuple[Selection, ...], spread: FrozenSet[str] = frozenset()
+    ) -> Iterator[Field]:
+        """The fields of `selections`, with the fields of their fragments."""
+        for selection in selections:
+            if isinstance(selection, Field):
+                yield selection
+            elif isinstance(selection, InlineFragment):
+                yield from self.fields(selection.selections, spread)
+            elif selection.name not in spread:
+                if selection.name not in self.fragments:
+                    raise ValueError(f"Unknown fragment {selection.name!r}")
+                yield from self.fields(
+                    self.fragments[selection.name], spread | {selection.name}
+                )
+
+    def root_field(self, table: _TableSchema, kind: str, field: Field) -> None:
+        self.tables.add(table.name)
+        self.arguments(table, field.arguments)
+        if kind in ("select_by_pk", "delete_by_pk"):
+            # the primary key columns are the arguments
+            for name in field.arguments:
+                self.column(table, name)
+        if kind == "select_aggregate":
+            self.aggregate(table, field)
+        elif kind in ("insert", "update", "delete"):
+            for mutation_field in self.fields(field.selections):
+                if mutation_field.name == "returning":
+                    self.selections(table, mutation_field.selections)
+        else:
+            self.selections(table, field.selections)
+
+    def selections(
+        self, table: Optional[_TableSchema], selections: Tuple[Selection, ...]
+    ) -> None:
+        if table is None:
+            return
+        for field in self.fields(selections):
+            name = field.name
+            if name.startswith("__") or name in table.computed_fields:
+                continue
+            if name in table.relationships:
+                remote_table = self.relationship(table, name)
+                self.arguments(remote_table, field.arguments)
+                self.selections(remote_table, field.selections)
+            elif name.endswith("_aggregate") and name[:-10] in table.relationships:
+                remote_table = self.relationship(table, name[:-10])
+                self.arguments(remote_table, field.arguments)
+                if remote_table is not None:
+                    self.aggregate(remote_table, field)
+            else:
+                self.column(table, name)
+
+    def aggregate(self, table: _TableSchema, field: Field) -> None:
+        for aggregate_field in self.fields(field.selections):
+            if aggregate_field.name == "nodes":
+                self.selections(table, aggregate_field.selections)
+            elif aggregate_field.name == "aggregate":
+                for function in self.fields(aggregate_field.selections):
+                    for column in _names(function.arguments.get("columns")):
+                        self.column(table, column)
+                    for column_field in self.fields(function.selections):
+                        if not column_field.name.startswith("__"):
+                            self.column(table, column_field.name)
+
+    def arguments(
+        self, table: Optional[_TableSchema], arguments: Dict[str, Any]
+    ) -> None:
+        if table is None:
+            return
+        for name, value in arguments.items():
+            if name == "where":
+                self.bool_expression(table, value)
+            elif name == "order_by":
+                for order_by in value if isinstance(value, list) else [value]:
+                    self.order_by(table, order_by)
+            elif name == "distinct_on":
+                for column in _names(value):
+                    self.column(table, column)
+            elif name in _COLUMN_KEY_ARGUMENTS and isinstance(value, dict):
+                for column in value:
+                    self.column(table, column)
+            elif name in ("objects", "object"):
+                for row in value if isinstance(value, list) else [value]:
+                    self.insert_row(table, row)
+            elif name == "on_conflict" and isinstance(value, dict):
+                for column in _names(value.get("update_columns")):
+                    self.column(table, column)
+                self.bool_expression(table, value.get("where"))
+
+    def bool_expression(self, table: Optional[_TableSchema], expression: Any) -> None:
+        if table is None or not isinstance(expression, dict):
+            return
+        for key, value in expression.items():
+            if key in ("_and", "_or"):
+                for operand in value if isinstance(value, list) else [value]:
+                    self.bool_expression(table, operand)
+            elif key == "_not":
+                self.bool_expression(table, value)
+            elif key.startswith("_"):
+                continue
+            elif key in table.relationships:
+                self.bool_expression(self.relationship(table, key), value)
+            else:
+                self.column(table, key)
+
+    def order_by(self, table: Optional[_TableSchema], order_by: Any) -> None:
+        if table is None or not isinstance(order_by, dict):
+            return
+        for key, value in order_by.items():
+            if key in table.relationships:
+                self.order_by(self.relationship(table, key), value)
+            elif key.endswith("_aggregate") and key[:-10] in table.relationships:
+                self.relationship(table, key[:-10])
+            else:
+                self.column(table, key)
+
+    def insert_row(self, table: _TableSchema, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        for key, value in row.items():
+            if key in table.relationships:
+                # a nested insert, {"data": row or rows}
+                remote_table = self.relationship(table, key)
+                data = value.get("data") if isinstance(value, dict) else None
+                if remote_table is not None:
+                    for nested_row in data if isinstance(data, list) else [data]:
+                        self.insert_row(remote_table, nested_row)
+            else:
+                self.column(table, key)
+
+    def relationship(self, table: _TableSchema, name: str) -> Optional[_TableSchema]:
+        """Records the relationship, returns its remote table if it is known."""
+        self.relationships.add((table.name, name))
+        remote_table = self.schema.tables.get(table.relationships[name])
+        if remote_table is not None:
+            self.tables.add(remote_table.name)
+        elif name not in table.remote_relationships:
+            self.unresolved_relationships.add((table.name, name))
+        return remote_table
+
+    def column(self, table: _TableSchema, name: str) -> None:
+        self.columns.add((table.name, table.columns.get(name, name)))
+
+
+def _names(value: Any) -> List[str]:
+    """The column names of an enum argument, or list of them."""
+    values = value if isinstance(value, list) else [value]
+    return [v for v in values if isinstance(v, str)]
@@ -1,7 +1,8 @@
+import functools
 import logging
 from abc import ABC
 from operator import itemgetter
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 
 from hasura_tooling.util_filepath_and_fileloader import (
     remote_schemas_metadata,
@@ -10,13 +11,24 @@ from hasura_tooling.util_filepath_and_fileloader import (
 from hasura_tooling.util_yaml_dumper import create_literal_scalar_string
 
 
-ROLES_WITH_OLD_DEFAULT_PERMISSIONS = set(
-    [
-        role
-        for role, metadata in roles_metadata().items()
-        if metadata["remote_schema_permissions"] == "full"
-    ]
-)
+@functools.lru_cache(maxsize=None)
+def roles_with_old_default_permissions() -> Set[str]:
+    # read on first use, not on import, so importing hasura_tooling doesn't need the
+    # roles metadata
+    return set(
+        [
+            role
+            for role, metadata in roles_metadata().items()
+            if metadata["remote_schema_permissions"] == "full"
+        ]
+    )
+
+
+def __getattr__(name: str) -> Any:
+    # ROLES_WITH_OLD_DEFAULT_PERMISSIONS is roles_with_old_default_permissions()
+    if name == "ROLES_WITH_OLD_DEFAULT_PERMISSIONS":
+        return roles_with_old_default_permissions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 FULL_PERMISSIONS = create_literal_scalar_string(
@@ -134,7 +146,7 @@ class AddressRemoteSchema(RemoteSchema):
         super().__init__(remote_schema_metadata=remote_schema_metadata)
 
     def schema(self, role: str) -> str:
-        if role in ROLES_WITH_OLD_DEFAULT_PERMISSIONS:
+        if role in roles_with_old_default_permissions():
             return FULL_PERMISSIONS
         return LIMITED_PERMISSIONS
 
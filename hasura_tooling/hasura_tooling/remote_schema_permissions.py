@@ -1,13 +1,14 @@
+import io
 from operator import itemgetter
 from typing import Dict, List
 import logging
 
-import yaml
 
 from hasura_tooling.remote_schema import (
-    ROLES_WITH_OLD_DEFAULT_PERMISSIONS,
     AddressRemoteSchema,
+    roles_with_old_default_permissions,
 )
+from hasura_tooling.util_file_writer import write_file
 from hasura_tooling.util_filepath_and_fileloader import (
     remote_schemas_metadata,
     remote_schemas_filepath,
@@ -17,13 +18,15 @@ from hasura_tooling.util_filepath_and_fileloader import (
 from hasura_tooling.util_yaml_dumper import (
     IndentedListYamlDumper,
     dump_remote_schema_metadata_to_yaml_file,
+    dump_yaml_file,
 )
 
 
 def remove_remote_schema_permissions(role: str) -> None:
     metadata_dict = remove_remote_schema_permissions_by_role(role)
-    with open(remote_schemas_filepath(), "w") as f:
-        dump_remote_schema_metadata_to_yaml_file(metadata_dict, f)
+    f = io.StringIO()
+    dump_remote_schema_metadata_to_yaml_file(metadata_dict, f)
+    write_file(remote_schemas_filepath(), f.getvalue())
     update_e2e_remote_schema_tests(role, remove=True)
 
 
@@ -39,8 +42,9 @@ def remove_remote_schema_permissions_by_role(
 
 def add_remote_schema_permissions(role: str) -> None:
     metadata_dict = add_remote_schema_permissions_by_role(role)
-    with open(remote_schemas_filepath(), "w") as f:
-        dump_remote_schema_metadata_to_yaml_file(metadata_dict, f)
+    f = io.StringIO()
+    dump_remote_schema_metadata_to_yaml_file(metadata_dict, f)
+    write_file(remote_schemas_filepath(), f.getvalue())
     update_e2e_remote_schema_tests(role, remove=False)
 
 
@@ -56,14 +60,13 @@ def add_remote_schema_permissions_by_role(
 
 def update_e2e_remote_schema_tests(role: str, remove: bool = False) -> None:
     hasura_perm_metadata = update_e2e_remote_schema_tests_by_role(role, remove)
-    with open(permissions_e2e_tests_mapping_metadata_filepath(), "w") as f:
-        yaml.dump(
-            hasura_perm_metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    dump_yaml_file(
+        permissions_e2e_tests_mapping_metadata_filepath(),
+        hasura_perm_metadata,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
 
 
 def update_e2e_remote_schema_tests_by_role(
@@ -103,7 +106,7 @@ def update_e2e_remote_schema_tests_by_role(
                 if {metadata_neg_key: role} in neg:
                     neg.remove({metadata_neg_key: role})
             else:
-                if role in ROLES_WITH_OLD_DEFAULT_PERMISSIONS:
+                if role in roles_with_old_default_permissions():
                     if {metadata_pos_key: role} not in pos:
                         pos.append({metadata_pos_key: role})
                     if {metadata_neg_key: role} in neg:
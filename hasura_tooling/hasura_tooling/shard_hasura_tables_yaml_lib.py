@@ -1,18 +1,24 @@
 import os
-import yaml
-import copy
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
 import shutil
 import logging
 
 from hasura_tooling.util_filepath_and_fileloader import (
+    load_yaml_file,
     sharded_tables_dir,
     tables_metadata_dir,
-    yield_by_table_metadata,
+    yield_by_table_metadata_parallel,
 )
 from hasura_tooling.check_hasura_metadata_tables_yaml import (
     test_header_shard_for_duplicate_keys,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.util_persistent_metadata import freeze, unwrap, update_in
+from hasura_tooling.util_yaml_dumper import (
+    IndentedListYamlDumper,
+    UnaliasedIndentedListYamlDumper,
+    dump_yaml_file,
+)
 
 
 def truncate_sharded_tables_dir():
@@ -29,53 +35,61 @@ def truncate_sharded_tables_dir():
     )
 
 
-def shard_hasura_tables_yaml():
+def shard_hasura_tables_yaml(processes: Optional[int] = None) -> Dict[str, dict]:
+    """
+    Shards the tables metadata, and returns it as {table name: table metadata}, for edits
+    of the fresh shards with `apply_changeset` that don't read them back. The tables
+    metadata is parsed by `processes` worker processes (default: one per core).
+    """
     logging.info("Sharding /metadata/databases/default/tables metadata to shards...")
-    for table_metadata_contents in yield_by_table_metadata():
+    tables = {}
+    for table_metadata_contents in yield_by_table_metadata_parallel(processes):
         table_name = table_metadata_contents["table"]["name"]
+        tables[table_name] = table_metadata_contents
         sharded_tables_subdir = os.path.join(sharded_tables_dir(), table_name)
         if not os.path.exists(sharded_tables_subdir):
             os.makedirs(sharded_tables_subdir)
         table_yaml_header_filename = os.path.join(sharded_tables_subdir, "_table.yaml")
-        table_yaml_header_contents = copy.deepcopy(table_metadata_contents)
+        # edits below return new versions sharing the unchanged parts of the table
+        table_yaml_header_contents = freeze(table_metadata_contents)
         try:
-            table_yaml_role_perm_def_contents = copy.deepcopy(
-                table_metadata_contents["select_permissions"]
-            )
-            for role_perm_def in table_yaml_role_perm_def_contents:
+            for role_perm_def in table_yaml_header_contents["select_permissions"]:
                 role_name = role_perm_def["role"]
-                role_perm_def["permission"]["columns"].sort()
+                role_perm_def = update_in(
+                    role_perm_def,
+                    ("permission", "columns"),
+                    lambda columns: columns.sorted(),
+                )
                 table_yaml_role_perm_def_filename = (
                     os.path.join(sharded_tables_subdir, role_name) + ".yaml"
                 )
-                with open(
-                    table_yaml_role_perm_def_filename, "w"
-                ) as table_yaml_role_perm_def_file:
-                    yaml.dump(
-                        role_perm_def,
-                        table_yaml_role_perm_def_file,
-                        Dumper=IndentedListYamlDumper,
-                        default_flow_style=False,
-                        sort_keys=False,
-                    )
+                dump_yaml_file(
+                    table_yaml_role_perm_def_filename,
+                    role_perm_def,
+                    Dumper=IndentedListYamlDumper,
+                    default_flow_style=False,
+                    sort_keys=False,
+                )
             # remove select permissions content from header file since each role's select permission will live in own file
             # set as empty to be repopulated later during reconstruction
-            table_yaml_header_contents["select_permissions"] = []
+            table_yaml_header_contents = table_yaml_header_contents.set(
+                "select_permissions", []
+            )
         except Exception as e:
             logging.info(
                 "{e}: No select permissions for {t}.".format(e=e, t=table_name)
             )
-        with open(table_yaml_header_filename, "w") as table_yaml_header_file:
-            yaml.dump(
-                table_yaml_header_contents,
-                table_yaml_header_file,
-                Dumper=IndentedListYamlDumper,
-                default_flow_style=False,
-                sort_keys=False,
-            )
+        dump_yaml_file(
+            table_yaml_header_filename,
+            table_yaml_header_contents,
+            Dumper=IndentedListYamlDumper,
+            default_flow_style=False,
+            sort_keys=False,
+        )
     logging.info(
         f"{table_name}.yaml shards dumped to `servers/graphql2/metadata/tables/"
     )
+    return tables
 
 
 def reconstruct_sharded_hasura_tables_yaml(overwrite: bool):
@@ -94,38 +108,150 @@ def reconstruct_sharded_hasura_tables_yaml(overwrite: bool):
         for subdir, dirs, files in os.walk(table_subdir):
             # if directory is table subdir (ex: metadata/tables/acris_legal)
             if dirs == []:
-                table_yaml_header = os.path.join(subdir, "_table.yaml")
                 # run table_yaml_header shard assertion tests prior to metadata reconstruction
-                test_header_shard_for_duplicate_keys(table_yaml_header)
-                with open(table_yaml_header, "r") as p:
-                    table_yaml_table_contents = yaml.safe_load(p)
-                files.sort(key=lambda f: f.replace(".yaml", ""))
-                for file_name in files:
-                    if file_name != "_table.yaml" and file_name.endswith(".yaml"):
-                        with open(os.path.join(subdir, file_name), "r") as p:
-                            role_perm_def = yaml.safe_load(p)
-                            role_perm_def["permission"]["columns"].sort()
-                        table_yaml_table_contents["select_permissions"].append(
-                            role_perm_def
-                        )
-                table_yaml_contents = table_yaml_table_contents
+                test_header_shard_for_duplicate_keys(
+                    os.path.join(subdir, "_table.yaml")
+                )
+                table_yaml_contents = read_table_shard(subdir, files)
             table_name = subdir.split("/")[subdir.split("/").index("tables") + 1]
             tables_yaml_filepath = os.path.join(
                 tables_metadata_dir(), f"public_{table_name}.yaml"
             )
-            with open(tables_yaml_filepath, "w") as table_yaml_file:
-                yaml.dump(
-                    table_yaml_contents,
-                    table_yaml_file,
-                    Dumper=IndentedListYamlDumper,
-                    default_flow_style=False,
-                    sort_keys=False,
-                )
-            table_yaml_file.close()
+            dump_yaml_file(
+                tables_yaml_filepath,
+                table_yaml_contents,
+                Dumper=IndentedListYamlDumper,
+                default_flow_style=False,
+                sort_keys=False,
+            )
     logging.info("\n Tables metadata reconstruction complete.")
 
 
-def refresh_tables_yaml_shards(refresh: bool = True):
+def read_table_shard(table_subdir: str, files: List[str] = None) -> dict:
+    """
+    Table metadata reassembled from a table's shards: its _table.yaml header with the select
+    permissions of its role shards, in role order.
+    """
+    if files is None:
+        files = os.listdir(table_subdir)
+    table_yaml_table_contents = load_yaml_file(
+        os.path.join(table_subdir, "_table.yaml")
+    )
+    files.sort(key=lambda f: f.replace(".yaml", ""))
+    for file_name in files:
+        if file_name != "_table.yaml" and file_name.endswith(".yaml"):
+            role_perm_def = load_yaml_file(os.path.join(table_subdir, file_name))
+            # all columns ('*') are a string
+            if isinstance(role_perm_def["permission"]["columns"], list):
+                role_perm_def["permission"]["columns"].sort()
+            table_yaml_table_contents["select_permissions"].append(role_perm_def)
+    return table_yaml_table_contents
+
+
+def read_table_shards(table_names: Iterable[str] = None) -> Dict[str, dict]:
+    """
+    {table name: table metadata} reassembled from the shards of `table_names`, or of every
+    sharded table. Tables without shards are skipped.
+    """
+    if table_names is None:
+        table_names = sorted(os.listdir(sharded_tables_dir()))
+    tables = {}
+    for table_name in table_names:
+        table_subdir = os.path.join(sharded_tables_dir(), table_name)
+        if os.path.isfile(os.path.join(table_subdir, "_table.yaml")):
+            tables[table_name] = read_table_shard(table_subdir)
+    return tables
+
+
+def write_table_shards(tables: Mapping[str, Any], previous_tables: Mapping[str, Any]):
+    """
+    Writes the shards of `tables` that were edited from `previous_tables`, ex: the tables
+    returned by `apply_changeset` and the tables it was applied to. Edits are detected by
+    identity, since edited versions share what they didn't change with the previous ones.
+    Role shards of select permissions that were removed are deleted.
+    """
+    for table_name, table in tables.items():
+        table = unwrap(table)
+        previous_table = unwrap(previous_tables.get(table_name)) or {}
+        sharded_tables_subdir = os.path.join(sharded_tables_dir(), table_name)
+        if not os.path.exists(sharded_tables_subdir):
+            os.makedirs(sharded_tables_subdir)
+        if _is_header_edited(table, previous_table):
+            _dump_shard(
+                freeze(table).set("select_permissions", []),
+                os.path.join(sharded_tables_subdir, "_table.yaml"),
+            )
+        previous_role_perm_defs = {
+            role_perm_def["role"]: role_perm_def
+            for role_perm_def in previous_table.get("select_permissions") or []
+        }
+        for role_perm_def in table.get("select_permissions") or []:
+            role_name = role_perm_def["role"]
+            if previous_role_perm_defs.pop(role_name, None) is not role_perm_def:
+                if isinstance(role_perm_def["permission"].get("columns"), list):
+                    role_perm_def = update_in(
+                        role_perm_def,
+                        ("permission", "columns"),
+                        lambda columns: columns.sorted(),
+                    )
+                _dump_shard(
+                    role_perm_def,
+                    os.path.join(sharded_tables_subdir, role_name) + ".yaml",
+                )
+        for role_name in previous_role_perm_defs:
+            os.remove(os.path.join(sharded_tables_subdir, role_name) + ".yaml")
+
+
+def _is_header_edited(table: dict, previous_table: dict) -> bool:
+    return list(table) != list(previous_table) or any(
+        value is not previous_table[key]
+        for key, value in table.items()
+        if key != "select_permissions"
+    )
+
+
+def _dump_shard(contents: Any, shard_filepath: str):
+    dump_yaml_file(
+        shard_filepath,
+        contents,
+        Dumper=UnaliasedIndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+
+
+def remove_stale_shards(tables: Mapping[str, Any]):
+    """
+    Removes what isn't a shard of `tables` from the sharded tables directory, ex: with
+    the tables returned by `shard_hasura_tables_yaml`. Like truncate_sharded_tables_dir,
+    keeps outdated shards from being reconstructed into tables.yaml, but the shards that
+    were up to date aren't rewritten.
+    """
+    for table_name in os.listdir(sharded_tables_dir()):
+        table_subdir = os.path.join(sharded_tables_dir(), table_name)
+        if table_name not in tables:
+            _remove(table_subdir)
+            continue
+        shard_filenames = {"_table.yaml"} | {
+            f"{role_perm_def['role']}.yaml"
+            for role_perm_def in tables[table_name].get("select_permissions") or []
+        }
+        for file_name in os.listdir(table_subdir):
+            if file_name not in shard_filenames:
+                _remove(os.path.join(table_subdir, file_name))
+
+
+def _remove(path: str):
+    logging.info(f"Removing outdated shard {path}")
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def refresh_tables_yaml_shards(refresh: bool = True) -> Dict[str, dict]:
+    tables = shard_hasura_tables_yaml()
     if refresh:
-        truncate_sharded_tables_dir()
-    shard_hasura_tables_yaml()
+        # after sharding, so that unchanged shards are neither removed nor rewritten
+        remove_stale_shards(tables)
+    return tables
@@ -1,13 +1,10 @@
 from typing import List, Dict, Set, Any
 
-import yaml
-import copy
 import os
 import logging
 
 from hasura_tooling.util_filepath_and_fileloader import (
     api_data_supersets_metadata,
-    sharded_tables_dir,
     hasura_metadata_tables,
     tables_metadata_filepath,
 )
@@ -18,8 +15,17 @@ from hasura_tooling.util_introspection import check_api_data_superset_keys_exist
 from hasura_tooling.shard_hasura_tables_yaml_lib import (
     refresh_tables_yaml_shards,
     reconstruct_sharded_hasura_tables_yaml,
+    write_table_shards,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.hasura_filter_canonical import filters_equivalent
+from hasura_tooling.hasura_metadata_changeset import (
+    AddPermission,
+    AddTable,
+    Changeset,
+    RemovePermission,
+    apply_changeset,
+)
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
 
 
 def get_api_tables_list_from_api_data_supersets(api_data_supersets: list) -> list:
@@ -106,8 +112,8 @@ def merge_table_permission_definitions(table1: dict, table2: dict) -> dict:
                 merged_dict["filter"] = (
                     table1.get("filter", None) or table2.get("filter", None) or {}
                 )
-            elif table1["filter"] == table2["filter"]:
-                # if both not-empty but same, take either
+            elif filters_equivalent(table1["filter"], table2["filter"]):
+                # if both not-empty but equivalent, take either
                 merged_dict["filter"] = table1["filter"]
             else:
                 raise AssertionError(
@@ -122,13 +128,15 @@ def merge_table_permission_definitions(table1: dict, table2: dict) -> dict:
 
 def get_api_tables_combined_dictionary(api_data_supersets: list) -> dict:
     """Reads in the established api_data_supersets from the metadata yaml.
+
+    The returned permission definitions share lists and dicts with the freshly loaded
+    supersets metadata (and, for yaml aliases, with each other), don't mutate them.
     """
     api_data_supersets_dict = api_data_supersets_metadata()
     consolidated_tables_update_dict: Dict[str, dict] = {}
     for superset_name, superset_perm_def in api_data_supersets_dict.items():
         if superset_name in api_data_supersets:
             for table_name, table_perm_def in superset_perm_def.items():
-                table_perm_def_copy = copy.deepcopy(table_perm_def)
                 if table_name not in list(consolidated_tables_update_dict.keys()):
                     # roles with only a single superset will go thru this logic path, which skips the merge function
                     # that handles deduping columns amongst other processing steps.
@@ -146,46 +154,16 @@ def get_api_tables_combined_dictionary(api_data_supersets: list) -> dict:
                             f"Duplicate column(s) {list(dupes)} detected in {superset_name}.{table_name}.\n\
                                 Resulting column permissions deduped, but please dedupe the perm_def in metadata_api_data_supersets.yaml"
                         )
-                    consolidated_tables_update_dict[table_name] = table_perm_def_copy
+                    consolidated_tables_update_dict[table_name] = table_perm_def
                 else:
                     consolidated_tables_update_dict[
                         table_name
                     ] = merge_table_permission_definitions(
-                        consolidated_tables_update_dict[table_name], table_perm_def_copy
+                        consolidated_tables_update_dict[table_name], table_perm_def
                     )
     return consolidated_tables_update_dict
 
 
-def remove_extraneous_table_shards_not_in_superset_prescription(
-    role: str, consolidated_tables_update_dict: dict
-):
-    """
-    Removes any extraneous permissions definition shards for tables that are not in the role's
-     prescribed supersets' list of tables.
-    """
-    prescribed_superset_tables_list = consolidated_tables_update_dict.keys()
-    sharded_tables_yaml_rootdir = sharded_tables_dir()
-    role_file_name = role + ".yaml"
-    for subdir, dirs, files in os.walk(sharded_tables_yaml_rootdir):
-        # skip `metadata/tables/` subdir bc it's not a table shards subdir
-        if subdir == sharded_tables_dir():
-            continue
-        table_name = subdir.split("/")[subdir.split("/").index("tables") + 1]
-        if (table_name not in prescribed_superset_tables_list) and (
-            role_file_name in files
-        ):
-            # parsing logic: table_name always follow `metadata/tables`.
-            # # This is safer than taking last element blindly.
-            shard_filepath = os.path.join(subdir, role_file_name)
-            try:
-                os.remove(shard_filepath)
-            except FileNotFoundError:
-                # should never end up here
-                raise FileNotFoundError(
-                    f"SHARD DELETION FAILED, file not found: {shard_filepath}"
-                )
-
-
 def table_permissions_metadata_header(table_name: str):
     t = {"table": {"schema": "public", "name": table_name}, "select_permissions": []}
     return t
@@ -194,14 +172,13 @@ def table_permissions_metadata_header(table_name: str):
 def include_new_table_in_table_yaml(table_name):
     include_tables_yaml = hasura_metadata_tables()
     include_tables_yaml.append(f"!include public_{table_name}.yaml")
-    with open(tables_metadata_filepath(), "w") as f:
-        yaml.dump(
-            include_tables_yaml,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    dump_yaml_file(
+        tables_metadata_filepath(),
+        include_tables_yaml,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
 
 
 def sync_permission_shards_by_roles(roles_input: str, api_data_supersets_input: str):
@@ -213,33 +190,22 @@ def sync_permission_shards_by_roles(roles_input: str, api_data_supersets_input:
         consolidated_tables_update_dict = get_api_tables_combined_dictionary(
             api_data_supersets
         )
-        refresh_tables_yaml_shards()
+        # edits are batched and written out once, each changed shard is written once
+        shard_tables = refresh_tables_yaml_shards()
+        changeset = Changeset()
+        new_table_names = []
         for table_name in consolidated_tables_update_dict:
-            sharded_table_subdir = os.path.join(sharded_tables_dir(), table_name)
             # case: new table added in metadata_api_data_supersets.yaml
-            if not os.path.isdir(sharded_table_subdir):
-                # create shard subdir for new table
-                os.mkdir(sharded_table_subdir)
+            if table_name not in shard_tables:
                 # create stub _table.yaml
-                with open(os.path.join(sharded_table_subdir, "_table.yaml"), "w") as f:
-                    yaml.dump(
-                        table_permissions_metadata_header(table_name),
-                        f,
-                        Dumper=IndentedListYamlDumper,
-                        default_flow_style=False,
-                        sort_keys=False,
-                    )
-                include_new_table_in_table_yaml(table_name)
-            for role in roles:
-                # remove any extraneous perm_def shards of tables not in role's supersets prescription table list
-                remove_extraneous_table_shards_not_in_superset_prescription(
-                    role, consolidated_tables_update_dict
+                changeset.add(
+                    AddTable(table_name, table_permissions_metadata_header(table_name))
                 )
-                sharded_role_perm_file = (
-                    os.path.join(sharded_table_subdir, role) + ".yaml"
+                new_table_names.append(table_name)
+            for role in roles:
+                columns = sorted(
+                    consolidated_tables_update_dict[table_name].get("columns", [])
                 )
-                columns = consolidated_tables_update_dict[table_name].get("columns", [])
-                columns.sort()
                 # if allow_agg=False or computed_fields=[] aren't already
                 allow_aggregations = consolidated_tables_update_dict[table_name].get(
                     "allow_aggregations", False
@@ -252,14 +218,26 @@ def sync_permission_shards_by_roles(roles_input: str, api_data_supersets_input:
                 role_permission_block = permissions_block_template(
                     role, columns, limit, allow_aggregations, computed_fields, filter
                 )
-                with open(sharded_role_perm_file, "w") as f:
-                    yaml.dump(
-                        role_permission_block,
-                        f,
-                        Dumper=IndentedListYamlDumper,
-                        default_flow_style=False,
-                        sort_keys=False,
+                changeset.add(
+                    AddPermission(
+                        table_name, role, role_permission_block["permission"]
                     )
+                )
+        # remove any extraneous perm_def shards of tables not in role's supersets prescription table list
+        for table_name, table_metadata in shard_tables.items():
+            if table_name not in consolidated_tables_update_dict:
+                # ex: tables with only relationships, or enum tables
+                table_roles = {
+                    role_perm_def["role"]
+                    for role_perm_def in table_metadata.get("select_permissions") or []
+                }
+                for role in table_roles.intersection(roles):
+                    changeset.add(RemovePermission(table_name, role))
+        # nothing is written until every edit is collected and applied
+        edited_tables = apply_changeset(shard_tables, changeset)
+        for table_name in new_table_names:
+            include_new_table_in_table_yaml(table_name)
+        write_table_shards(edited_tables, shard_tables)
         reconstruct_sharded_hasura_tables_yaml(True)
         update_permissions_e2e_test_mapping_metadata_by_table(
             roles, list(consolidated_tables_update_dict.keys()), True
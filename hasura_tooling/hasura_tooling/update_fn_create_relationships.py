@@ -1,14 +1,12 @@
-import yaml
 import ast
 
 from hasura_tooling.util_filepath_and_fileloader import (
-    hasura_metadata_tables,
     _get_repo_rootdir,
     relationships_tooling_input_filepath,
     tables_metadata_filepath,
 )
 from hasura_tooling.create_or_append_relationship_e2e_tests import main
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.hasura_metadata_v3 import IncludedTables
 
 
 # TODO: Add validation to ensure origin table.column & remote table.column both exist.
@@ -66,7 +64,8 @@ def check_if_relationship_metadata_already_exists(
 
 
 def orchestrator():
-    hasura_tables_metadata = hasura_metadata_tables()
+    # only the origin tables' files are read, and written back
+    hasura_tables_metadata = IncludedTables.from_file(tables_metadata_filepath())
     # TODO: replace input metadata text file with something more robust
     metadata = ast.literal_eval(open(relationships_tooling_input_filepath()).read())
     for row in metadata:
@@ -75,36 +74,28 @@ def orchestrator():
         else:
             relationship_metadata_block = fill_relationship_template_from_metadata(row)
             print(relationship_metadata_block)
-            for table in hasura_tables_metadata:
-                # find origin_table to insert relationship metadata block
-                if table["table"]["name"] == row["origin_table"]:
-                    exists = False
-                    rel_type_key = "{rel_type}_relationships".format(
-                        rel_type=row["rel_type"]
-                    )
-                    for relationship in table[rel_type_key]:
-                        if check_if_relationship_metadata_already_exists(
-                            relationship, row
-                        ):
-                            print(
-                                "Relationship metadata already exists for: \n Input values:"
-                            )
-                            print(row)
-                            print("-------------\n In metadata:")
-                            print(relationship)
-                            exists = True
-                    if not exists:
-                        # appends relationship metadata to tables.yaml
-                        table[rel_type_key].append(relationship_metadata_block)
+            # find origin_table to insert relationship metadata block
+            for table in hasura_tables_metadata.tables_named(row["origin_table"]):
+                exists = False
+                rel_type_key = "{rel_type}_relationships".format(
+                    rel_type=row["rel_type"]
+                )
+                for relationship in table[rel_type_key]:
+                    if check_if_relationship_metadata_already_exists(
+                        relationship, row
+                    ):
+                        print(
+                            "Relationship metadata already exists for: \n Input values:"
+                        )
+                        print(row)
+                        print("-------------\n In metadata:")
+                        print(relationship)
+                        exists = True
+                if not exists:
+                    # appends relationship metadata to tables.yaml
+                    table[rel_type_key].append(relationship_metadata_block)
             main(row)
-    with open(tables_metadata_filepath(), "w") as f:
-        yaml.dump(
-            hasura_tables_metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    hasura_tables_metadata.write()
 
 
 if __name__ == "__main__":
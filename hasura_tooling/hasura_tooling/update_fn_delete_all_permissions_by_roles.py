@@ -1,9 +1,8 @@
-import yaml
 import logging
 import os
 
+from hasura_tooling.hasura_metadata_v3 import IncludedTables
 from hasura_tooling.util_filepath_and_fileloader import (
-    hasura_metadata_tables,
     tables_metadata_filepath,
     sharded_tables_dir,
 )
@@ -17,12 +16,13 @@ from hasura_tooling.shard_hasura_tables_yaml_lib import (
     refresh_tables_yaml_shards,
     reconstruct_sharded_hasura_tables_yaml,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
 
 
 def orchestrator(roles_input: str):
     roles = roles_input.lower().split("/")
-    hasura_tables_metadata = hasura_metadata_tables()
+    hasura_tables_metadata = IncludedTables.from_file(tables_metadata_filepath())
+    # every table is edited, read them in parallel up front
+    hasura_tables_metadata.prefetch()
     for table in hasura_tables_metadata:
         table_name = table["table"]["name"]
         try:
@@ -43,14 +43,7 @@ def orchestrator(roles_input: str):
                 )
             )
             continue
-    with open(tables_metadata_filepath(), "w") as f:
-        yaml.dump(
-            hasura_tables_metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    hasura_tables_metadata.write()
     remove_permissions_e2e_test_mapping_metadata_by_table(roles, [])
 
 
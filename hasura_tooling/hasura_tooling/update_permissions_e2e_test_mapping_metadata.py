@@ -1,4 +1,3 @@
-import yaml
 from hasura_tooling.util_filepath_and_fileloader import (
     permissions_e2e_tests_mapping_metadata,
     permissions_e2e_tests_mapping_metadata_filepath,
@@ -6,7 +5,7 @@ from hasura_tooling.util_filepath_and_fileloader import (
 from hasura_tooling.lookup_alias_by_actual_table_name import (
     translate_actual_table_name_to_alias,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper, dump_yaml_file
 
 
 def update_permissions_e2e_test_mapping_metadata_by_table(
@@ -129,14 +128,13 @@ def update_permissions_e2e_test_mapping_metadata_by_table(
                                 metadata_pos_key=metadata_pos_key
                             )
                         )
-    with open(permissions_e2e_tests_mapping_metadata_filepath(), "w") as f:
-        yaml.dump(
-            perm_e2e_test_mapping_metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    dump_yaml_file(
+        permissions_e2e_tests_mapping_metadata_filepath(),
+        perm_e2e_test_mapping_metadata,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
 
 
 def remove_permissions_e2e_test_mapping_metadata_by_table(
@@ -157,11 +155,10 @@ def remove_permissions_e2e_test_mapping_metadata_by_table(
                     for k, v in i.items():
                         if v in roles:
                             v_2nd_level.remove(i)
-    with open(permissions_e2e_tests_mapping_metadata_filepath(), "w") as f:
-        yaml.dump(
-            perm_e2e_test_mapping_metadata,
-            f,
-            Dumper=IndentedListYamlDumper,
-            default_flow_style=False,
-            sort_keys=False,
-        )
+    dump_yaml_file(
+        permissions_e2e_tests_mapping_metadata_filepath(),
+        perm_e2e_test_mapping_metadata,
+        Dumper=IndentedListYamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
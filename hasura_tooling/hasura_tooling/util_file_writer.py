@@ -0,0 +1,89 @@
+"""
+Writes of generated metadata files that leave unchanged files untouched.
+
+    write_file(remote_schemas_filepath(), contents)
+    metadata_file_writer().stats()  # {"written": ..., "skipped": ...}
+
+util_yaml_dumper's dump_yaml_file writes yaml dumps through write_file.
+
+Contents are serialized in memory and compared to the bytes of the existing file, whose
+size is compared first, so a file of another size isn't read. Unchanged files are
+skipped: their modification times stay the same, and so do the entries of caches keyed
+by modification time, like util_parse_cache's. Changed files are replaced atomically,
+through a temporary file in the same directory, so a reader never sees a partial file,
+and keep their permissions.
+"""
+
+import os
+import tempfile
+from typing import Dict
+
+
+class FileWriter:
+    """Writes files whose contents changed. `written` and `skipped` count the files
+    that were and weren't written.
+    """
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "skipped": self.skipped}
+
+    def write(self, file_path: str, contents: str) -> bool:
+        """Replaces the file at `file_path` with `contents`, encoded as UTF-8, unless it
+        already has them. Returns whether the file was written.
+        """
+        data = contents.encode("utf-8")
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            # created like open(file_path, "w") would
+            mode = 0o666 & ~_umask()
+        else:
+            if stat.st_size == len(data) and _read(file_path) == data:
+                self.skipped += 1
+                return False
+            mode = stat.st_mode & 0o7777
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path) or ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self.written += 1
+        return True
+
+
+_metadata_file_writer = FileWriter()
+
+
+def metadata_file_writer() -> FileWriter:
+    """The FileWriter of write_file, its `written` and `skipped` count the files of
+    the process.
+    """
+    return _metadata_file_writer
+
+
+def write_file(file_path: str, contents: str) -> bool:
+    """Writes `contents` to the file at `file_path` if it changed, see FileWriter."""
+    return metadata_file_writer().write(file_path, contents)
+
+
+def _read(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def _umask() -> int:
+    # the umask can only be read by setting it
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
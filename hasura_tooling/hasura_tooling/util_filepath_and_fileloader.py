@@ -1,10 +1,65 @@
+import hashlib
 import os
+import sys
 import time
 import yaml
-from typing import Dict, List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from ruamel.yaml import YAML
 
+from hasura_tooling.util_parse_cache import ParseCache
+
+
+class InterningSafeLoader(yaml.SafeLoader):
+    """
+    yaml.SafeLoader that interns every string scalar, keys included.
+
+    Role, table and column names repeat thousands of times across the metadata files, and
+    yaml.safe_load creates a new string object for every occurrence. Interned, identical
+    names share one object, and comparing them is an identity check.
+    """
+
+    def construct_yaml_str(self, node) -> str:
+        return sys.intern(super().construct_yaml_str(node))
+
+
+InterningSafeLoader.add_constructor(
+    "tag:yaml.org,2002:str", InterningSafeLoader.construct_yaml_str
+)
+
+if getattr(yaml, "__with_libyaml__", False):
+
+    class InterningCSafeLoader(yaml.CSafeLoader):
+        """InterningSafeLoader with libyaml's parser, several times faster."""
+
+        def construct_yaml_str(self, node) -> str:
+            return sys.intern(super().construct_yaml_str(node))
+
+    InterningCSafeLoader.add_constructor(
+        "tag:yaml.org,2002:str", InterningCSafeLoader.construct_yaml_str
+    )
+    FastInterningSafeLoader = InterningCSafeLoader
+else:
+    # PyYAML built without libyaml
+    FastInterningSafeLoader = InterningSafeLoader
+
+
+def load_yaml(stream: Union[str, IO]) -> Any:
+    """yaml.safe_load, with string scalars interned (see InterningSafeLoader), parsed by
+    libyaml when PyYAML was built with it.
+    """
+    return yaml.load(stream, Loader=FastInterningSafeLoader)
+
+
+def load_yaml_file(file_path: str) -> Any:
+    """load_yaml of the file at `file_path`, from the parse cache while it is unchanged
+    (see metadata_parse_cache).
+    """
+    return metadata_parse_cache().load(file_path)
+
 
 def _get_repo_rootdir() -> str:
     # directory path is to be established by REPO_ROOTDIR environment variable in /hasura_tooling_cli/envs
@@ -73,8 +128,7 @@ def remote_schemas_filepath() -> str:
 # - tables.yaml is now list of references to each table's metadata files ("!include <schema>_<table_name>.yaml")
 # - and no longer the metadata itself
 def hasura_metadata_tables() -> List:
-    with open(tables_metadata_filepath(), "r") as p:
-        return yaml.safe_load(p)
+    return load_yaml_file(tables_metadata_filepath())
 
 
 def end_to_end_tests_root_dir() -> str:
@@ -95,8 +149,7 @@ def permissions_e2e_tests_mapping_metadata_filepath() -> str:
 
 
 def permissions_e2e_tests_mapping_metadata() -> Dict[str, dict]:
-    with open(permissions_e2e_tests_mapping_metadata_filepath(), "r") as p:
-        return yaml.safe_load(p)
+    return load_yaml_file(permissions_e2e_tests_mapping_metadata_filepath())
 
 
 def hasura_source_of_truth_metadata_dir() -> str:
@@ -126,13 +179,11 @@ def bigquery_api_metadata_folder(bq_project: str) -> str:
 
 
 def api_data_supersets_metadata() -> Dict[str, dict]:
-    with open(supersets_metadata_filepath(), "r") as y:
-        return yaml.safe_load(y)
+    return load_yaml_file(supersets_metadata_filepath())
 
 
 def roles_metadata() -> Dict[str, dict]:
-    with open(roles_metadata_filepath(), "r") as y:
-        return yaml.safe_load(y)
+    return load_yaml_file(roles_metadata_filepath())
 
 
 def remote_schemas_metadata() -> List[dict]:
@@ -141,8 +192,7 @@ def remote_schemas_metadata() -> List[dict]:
 
 
 def domain_rules_metadata() -> Dict[str, dict]:
-    with open(domain_rules_metadata_filepath(), "r") as y:
-        return yaml.safe_load(y)
+    return load_yaml_file(domain_rules_metadata_filepath())
 
 
 def unix_timestamp_prefix() -> int:
@@ -156,10 +206,128 @@ def migrations_dir() -> str:
     return migrations_dir
 
 
-def yield_by_table_metadata():
+def snapshot_cache_dir() -> str:
+    # snapshots of parsed metadata, see util_snapshot_cache, are disabled by setting
+    # HASURA_TOOLING_CACHE_DIR to an empty string
+    default_dir = os.path.join(os.path.expanduser("~"), ".cache", "hasura_tooling")
+    return os.environ.get("HASURA_TOOLING_CACHE_DIR", default_dir)
+
+
+def parsed_queries_cache_filepath() -> Optional[str]:
+    # parsed query collections, see hasura_query_index, keyed by query hash
+    if not snapshot_cache_dir():
+        return None
+    return os.path.join(snapshot_cache_dir(), "parsed_queries.pickle")
+
+
+def pg_stat_counters_cache_filepath() -> Optional[str]:
+    # pg_stat_user_tables counters, see hasura_event_trigger_traffic, one cache per
+    # database of the PG* environment variables
+    if not snapshot_cache_dir():
+        return None
+    database_key = hashlib.blake2b(
+        ":".join(
+            os.environ.get(name) or "" for name in ("PGHOST", "PGPORT", "PGDATABASE")
+        ).encode(),
+        digest_size=8,
+    ).hexdigest()
+    return os.path.join(snapshot_cache_dir(), f"pg_stat_counters_{database_key}.pickle")
+
+
+def parse_cache_dir() -> Optional[str]:
+    # parsed metadata files, see util_parse_cache
+    if not snapshot_cache_dir():
+        return None
+    return os.path.join(snapshot_cache_dir(), "parsed_files")
+
+
+_metadata_parse_caches: Dict[Tuple[Optional[str], bool], ParseCache] = {}
+
+
+def metadata_parse_cache() -> ParseCache:
+    """
+    The ParseCache of load_yaml_file, in parse_cache_dir(). Its entries are keyed by
+    modification time and size, or by content hash when HASURA_TOOLING_CACHE_VERIFY is
+    set, ex: for checkouts that don't preserve modification times. Its `hits` and
+    `misses` count the loads of the process.
+    """
+    key = parse_cache_dir(), bool(os.environ.get("HASURA_TOOLING_CACHE_VERIFY"))
+    if key not in _metadata_parse_caches:
+        _metadata_parse_caches[key] = ParseCache(
+            key[0], load_yaml, verify_content=key[1], intern_strings=True
+        )
+    return _metadata_parse_caches[key]
+
+
+def table_metadata_filepaths() -> List[str]:
+    """Sorted paths of the table metadata files, without 'tables.yaml'."""
+    file_paths = []
     for subdir, _, files in os.walk(tables_metadata_dir()):
         for hasura_metadata_table_file in files:
             if hasura_metadata_table_file != "tables.yaml":
-                with open(os.path.join(subdir, hasura_metadata_table_file), "r") as p:
-                    table_metadata_contents = yaml.safe_load(p)
-                yield table_metadata_contents
+                file_paths.append(os.path.join(subdir, hasura_metadata_table_file))
+    return sorted(file_paths)
+
+
+def yield_by_table_metadata():
+    # unchanged table files are loaded from the parse cache, see metadata_parse_cache
+    for file_path in table_metadata_filepaths():
+        yield load_yaml_file(file_path)
+
+
+def yield_by_table_metadata_parallel(
+    processes: Optional[int] = None, chunk_size: int = 32
+) -> Iterator[dict]:
+    """
+    The table metadata of yield_by_table_metadata, parsed by `processes` worker
+    processes (default: one per core), in table_metadata_filepaths() order, see
+    load_yaml_files_parallel.
+    """
+    yield from load_yaml_files_parallel(
+        table_metadata_filepaths(), processes, chunk_size
+    )
+
+
+def load_yaml_files_parallel(
+    file_paths: List[str], processes: Optional[int] = None, chunk_size: int = 32
+) -> Iterator[Any]:
+    """
+    load_yaml_file of each of `file_paths`, parsed by `processes` worker processes
+    (default: one per core), in `file_paths` order.
+
+    Workers parse chunks of `chunk_size` files through the parse cache (see
+    metadata_parse_cache), so unchanged files aren't parsed again. At most 2 chunks per
+    worker are parsed ahead of the consumer, which bounds memory when the files are
+    consumed one at a time. Workers count their own parse cache hits and misses.
+    """
+    chunks = [
+        file_paths[start : start + chunk_size]
+        for start in range(0, len(file_paths), chunk_size)
+    ]
+    processes = min(processes or os.cpu_count() or 1, len(chunks))
+    if processes <= 1:
+        for chunk in chunks:
+            yield from _load_yaml_files(chunk)
+        return
+
+    remaining_chunks = iter(chunks)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque(
+            executor.submit(_load_yaml_files, chunk)
+            for chunk in islice(remaining_chunks, 2 * processes)
+        )
+        try:
+            while pending:
+                parsed_files = pending.popleft().result()
+                # keep the workers busy while the consumer handles the chunk
+                for chunk in islice(remaining_chunks, 1):
+                    pending.append(executor.submit(_load_yaml_files, chunk))
+                yield from parsed_files
+        finally:
+            # the consumer stopped early, or a chunk failed
+            for future in pending:
+                future.cancel()
+
+
+def _load_yaml_files(file_paths: List[str]) -> List[Any]:
+    return [load_yaml_file(file_path) for file_path in file_paths]
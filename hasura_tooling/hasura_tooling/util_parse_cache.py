@@ -0,0 +1,117 @@
+"""
+Persistent cache of parsed files, one entry per file, reused while a file is unchanged.
+
+    cache = ParseCache(cache_dir, load_yaml, intern_strings=True)
+    roles = cache.load(roles_metadata_filepath())
+    cache.stats()  # {"hits": ..., "misses": ...}
+
+An entry is a snapshot (see util_snapshot_cache) of the parsed file, keyed by the file's
+absolute path, modification time and size, so checking a file costs a `stat` and reading
+the entry's header. With `verify_content=True`, the key is the hash of the file's
+contents instead, which survives `touch` and fresh checkouts, at the cost of reading
+every file.
+
+Entries are per file, so after an edit only the edited files are parsed again. Files
+modified in the last RACY_SECONDS aren't cached, since another write within the file
+system's timestamp resolution could keep their modification time and size.
+
+Cached documents are unpickled on every load, so callers can edit them. Unpickled
+strings aren't interned, `intern_strings=True` interns them again like load_yaml does.
+"""
+
+import hashlib
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+from hasura_tooling.util_snapshot_cache import read_snapshot, write_snapshot
+
+PARSE_CACHE_FORMAT = "1"
+RACY_SECONDS = 2.0
+
+
+class ParseCache:
+    """`load(file contents)` of files, cached in `cache_dir`, `cache_dir=None` parses
+    every file. `hits` and `misses` count the loads served from and not from the cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str],
+        load: Callable[[str], Any],
+        verify_content: bool = False,
+        intern_strings: bool = False,
+    ):
+        self.cache_dir = cache_dir
+        self._load = load
+        self.verify_content = verify_content
+        self.intern_strings = intern_strings
+        # entries of different loaders don't mix
+        name = getattr(load, "__qualname__", type(load).__qualname__)
+        self._loader_key = f"{load.__module__}.{name}"
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def load(self, file_path: str) -> Any:
+        """The parsed contents of the file at `file_path`."""
+        file_path = os.path.abspath(file_path)
+        if self.cache_dir is None:
+            self.misses += 1
+            with open(file_path, "rb") as f:
+                return self._load(f.read().decode("utf-8"))
+
+        stat = os.stat(file_path)
+        data = None
+        if self.verify_content:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            key = "blake2b:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+        else:
+            key = f"{stat.st_mtime_ns}:{stat.st_size}"
+        manifest = [(PARSE_CACHE_FORMAT, self._loader_key), (file_path, key)]
+        entry_path = self._entry_path(file_path)
+        entry = read_snapshot(entry_path, manifest)
+        if entry is not None:
+            self.hits += 1
+            (parsed,) = entry
+            return _intern_strings(parsed) if self.intern_strings else parsed
+
+        self.misses += 1
+        if data is None:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        parsed = self._load(data.decode("utf-8"))
+        if self.verify_content or (
+            # unchanged while it was read, and not modified too recently
+            _stat_key(os.stat(file_path)) == _stat_key(stat)
+            and time.time() - stat.st_mtime >= RACY_SECONDS
+        ):
+            # a 1-tuple, since an empty file parses to None
+            write_snapshot(entry_path, manifest, (parsed,))
+        return parsed
+
+    def _entry_path(self, file_path: str) -> str:
+        name = hashlib.blake2b(
+            f"{self._loader_key}\0{file_path}".encode(), digest_size=16
+        ).hexdigest()
+        return os.path.join(self.cache_dir, name[:2], f"{name}.pickle")
+
+
+def _stat_key(stat: os.stat_result) -> tuple:
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _intern_strings(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {
+            _intern_strings(key): _intern_strings(item) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_intern_strings(item) for item in value]
+    return value
@@ -0,0 +1,184 @@
+"""
+Immutable, structurally shared views of loaded yaml/json metadata.
+
+`freeze` wraps a loaded dict or list without copying it. Edits return a new version that
+copies only the containers on the path to the edit, and shares every other subtree with the
+previous version, instead of `copy.deepcopy`-ing the whole table first:
+
+    table = freeze(table_metadata_contents)
+    header = table.set("select_permissions", [])
+    table = update_in(table, ("select_permissions", 0, "permission", "columns"), sorted)
+
+Frozen values dump like the dicts and lists they wrap with `UnaliasedIndentedListYamlDumper`.
+
+The wrapped data, and plain dicts and lists passed to `set`, `append`, etc., are owned by the
+frozen versions from then on, and must not be mutated in place.
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+
+class FrozenMap(Mapping):
+    """Read-only dict whose edits return a new FrozenMap, see `freeze`."""
+
+    __slots__ = ("_data",)
+
+    _data: Dict[Any, Any]
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._data = {k: unwrap(v) for k, v in dict(*args, **kwargs).items()}
+
+    @classmethod
+    def _wrap(cls, data: dict) -> "FrozenMap":
+        instance = cls.__new__(cls)
+        instance._data = data
+        return instance
+
+    def __getitem__(self, key: Any) -> Any:
+        return freeze(self._data[key])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (FrozenMap, dict)):
+            return self._data == unwrap(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({self._data!r})"
+
+    def set(self, key: Any, value: Any) -> "FrozenMap":
+        data = self._data.copy()
+        data[key] = unwrap(value)
+        return FrozenMap._wrap(data)
+
+    def delete(self, key: Any) -> "FrozenMap":
+        """Raises KeyError if `key` is missing."""
+        data = self._data.copy()
+        del data[key]
+        return FrozenMap._wrap(data)
+
+    def thaw(self) -> dict:
+        """Returns a mutable deep copy."""
+        return thaw(self._data)
+
+
+class FrozenList(Sequence):
+    """Read-only list whose edits return a new FrozenList, see `freeze`."""
+
+    __slots__ = ("_data",)
+
+    _data: List[Any]
+
+    def __init__(self, items: Any = ()):
+        self._data = [unwrap(item) for item in items]
+
+    @classmethod
+    def _wrap(cls, data: list) -> "FrozenList":
+        instance = cls.__new__(cls)
+        instance._data = data
+        return instance
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return FrozenList._wrap(self._data[index])
+        return freeze(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, value: object) -> bool:
+        return unwrap(value) in self._data
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (FrozenList, list)):
+            return self._data == unwrap(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"FrozenList({self._data!r})"
+
+    def set(self, index: int, value: Any) -> "FrozenList":
+        data = self._data.copy()
+        data[index] = unwrap(value)
+        return FrozenList._wrap(data)
+
+    def append(self, value: Any) -> "FrozenList":
+        return FrozenList._wrap(self._data + [unwrap(value)])
+
+    def remove(self, value: Any) -> "FrozenList":
+        """Removes the first item equal to `value`, raises ValueError if there is none."""
+        data = self._data.copy()
+        data.remove(unwrap(value))
+        return FrozenList._wrap(data)
+
+    def sorted(self, key: Callable[[Any], Any] = None) -> "FrozenList":
+        return FrozenList._wrap(sorted(self._data, key=key))
+
+    def thaw(self) -> list:
+        """Returns a mutable deep copy."""
+        return thaw(self._data)
+
+
+def freeze(value: Any) -> Any:
+    """Returns a FrozenMap or FrozenList view of the dict or list `value`, without copying
+    it, other values are returned as is.
+    """
+    if isinstance(value, dict):
+        return FrozenMap._wrap(value)
+    if isinstance(value, list):
+        return FrozenList._wrap(value)
+    return value
+
+
+def unwrap(value: Any) -> Any:
+    """Returns the dict or list a frozen value wraps, other values as is. The result is
+    shared with the frozen versions and must not be mutated.
+    """
+    if isinstance(value, (FrozenMap, FrozenList)):
+        return value._data
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Returns a mutable deep copy of `value`, with frozen values turned into dicts and
+    lists.
+    """
+    value = unwrap(value)
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+def assoc_in(root: Any, path: Path, value: Any) -> Any:
+    """Returns a new version of the frozen `root` with `value` at `path`, a sequence of
+    keys and list indexes. Copies only the containers along `path`.
+    """
+    return update_in(root, path, lambda _: value)
+
+
+def update_in(root: Any, path: Path, f: Callable[[Any], Any]) -> Any:
+    """Returns a new version of the frozen `root` with the value at `path` replaced by
+    `f(value)`. Raises KeyError or IndexError if `path` doesn't exist.
+    """
+    root = freeze(root)
+    if not path:
+        return f(root)
+    key, *rest = path
+    return root.set(key, update_in(root[key], tuple(rest), f))
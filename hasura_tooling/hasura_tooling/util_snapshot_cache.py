@@ -0,0 +1,80 @@
+"""
+Binary snapshots of parsed metadata, reused while the files they were parsed from are
+unchanged.
+
+    payload = read_snapshot(snapshot_path, manifest)
+    if payload is None:
+        payload = parse(...)
+        write_snapshot(snapshot_path, manifest, payload)
+
+The manifest identifies what the payload was parsed from, ex: a file's path, modification
+time and size in util_parse_cache, and a snapshot is only read back for the manifest it
+was written with.
+Reading a snapshot unpickles it through a memory map, which is much faster than parsing
+yaml.
+
+A snapshot file is SNAPSHOT_MAGIC, the header length (8 bytes, little endian), a header
+pickle of SNAPSHOT_FORMAT and the manifest, then the payload pickle, so a stale snapshot
+is detected without unpickling its payload. Snapshots are local caches, they must not be
+loaded from untrusted locations.
+"""
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+SNAPSHOT_MAGIC = b"HTSNAP\x00\x00"
+SNAPSHOT_FORMAT = 1
+
+_HEADER_LENGTH = struct.Struct("<Q")
+
+Manifest = List[Tuple[str, str]]
+
+
+def read_snapshot(snapshot_path: str, manifest: Manifest) -> Optional[Any]:
+    """The payload of the snapshot at `snapshot_path`, None if it is missing, unreadable
+    or was written for another manifest.
+    """
+    try:
+        with open(snapshot_path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as snapshot, memoryview(snapshot) as view:
+            payload_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+            if view[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                return None
+            (header_length,) = _HEADER_LENGTH.unpack_from(view, len(SNAPSHOT_MAGIC))
+            header = pickle.loads(view[payload_start : payload_start + header_length])
+            if header != (SNAPSHOT_FORMAT, manifest):
+                return None
+            return pickle.loads(view[payload_start + header_length :])
+    except Exception as e:
+        # a missing snapshot, or one truncated or written by another version
+        logging.debug(f"Snapshot {snapshot_path} not loaded: {e}")
+        return None
+
+
+def write_snapshot(snapshot_path: str, manifest: Manifest, payload: Any) -> None:
+    """Atomically replaces the snapshot at `snapshot_path`. Failures are logged, not
+    raised, since the snapshot is only a cache.
+    """
+    header = pickle.dumps((SNAPSHOT_FORMAT, manifest), protocol=pickle.HIGHEST_PROTOCOL)
+    snapshot_dir = os.path.dirname(snapshot_path) or "."
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=snapshot_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(_HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError as e:
+        logging.warning(f"Snapshot {snapshot_path} not written: {e}")
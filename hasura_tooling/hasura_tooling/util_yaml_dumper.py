@@ -1,9 +1,14 @@
+import re
 import textwrap
+from typing import IO, Any, Optional, Type
 
 import yaml
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import LiteralScalarString
 
+from hasura_tooling.util_file_writer import write_file
+from hasura_tooling.util_persistent_metadata import FrozenList, FrozenMap, unwrap
+
 
 class IndentedListYamlDumper(yaml.Dumper):
     def increase_indent(self, flow=False, indentless=False):
@@ -18,6 +23,172 @@ def string_representer(dumper, value):
 
 TAG_STR = "tag:yaml.org,2002:str"
 IndentedListYamlDumper.add_representer(str, string_representer)
+IndentedListYamlDumper.add_representer(
+    FrozenMap, lambda dumper, value: dumper.represent_dict(unwrap(value))
+)
+IndentedListYamlDumper.add_representer(
+    FrozenList, lambda dumper, value: dumper.represent_list(unwrap(value))
+)
+
+
+class UnaliasedIndentedListYamlDumper(IndentedListYamlDumper):
+    """
+    IndentedListYamlDumper that writes out repeated objects in full instead of as yaml
+    anchors and aliases, for frozen metadata versions that share subtrees.
+    """
+
+    def ignore_aliases(self, data):
+        return True
+
+
+# C-accelerated (libyaml) equivalents of the dumpers above, see `dump_yaml`
+_C_DUMPERS = {}
+if getattr(yaml, "__with_libyaml__", False):
+
+    class _UnsupportedScalar(Exception):
+        pass
+
+    def _c_string_representer(dumper, value):
+        # libyaml and PyYAML escape and break some characters differently, and scalars
+        # written over several lines aren't re-indented, see `dump_yaml`
+        if not value.isascii() or not value.isprintable():
+            raise _UnsupportedScalar()
+        return string_representer(dumper, value)
+
+    class CIndentedListYamlDumper(yaml.CDumper):
+        pass
+
+    CIndentedListYamlDumper.add_representer(str, _c_string_representer)
+    CIndentedListYamlDumper.add_representer(
+        FrozenMap, lambda dumper, value: dumper.represent_dict(unwrap(value))
+    )
+    CIndentedListYamlDumper.add_representer(
+        FrozenList, lambda dumper, value: dumper.represent_list(unwrap(value))
+    )
+
+    class CUnaliasedIndentedListYamlDumper(CIndentedListYamlDumper):
+        def ignore_aliases(self, data):
+            return True
+
+    _C_DUMPERS[IndentedListYamlDumper] = CIndentedListYamlDumper
+    _C_DUMPERS[UnaliasedIndentedListYamlDumper] = CUnaliasedIndentedListYamlDumper
+
+
+def pure_python_dumper(Dumper: Type[yaml.Dumper]) -> Type[yaml.Dumper]:
+    """
+    `Dumper`, or for a libyaml dumper, the pure-Python dumper whose output it writes, ex:
+    IndentedListYamlDumper for CIndentedListYamlDumper. libyaml dumpers only dump whole
+    documents, code emitting events one at a time needs a pure-Python dumper. Raises
+    TypeError for other libyaml dumpers.
+    """
+    if not getattr(yaml, "__with_libyaml__", False) or not issubclass(
+        Dumper, yaml.cyaml.CEmitter
+    ):
+        return Dumper
+    pure_dumpers = {
+        yaml.CBaseDumper: yaml.BaseDumper,
+        yaml.CSafeDumper: yaml.SafeDumper,
+        yaml.CDumper: yaml.Dumper,
+        **{c_dumper: dumper for dumper, c_dumper in _C_DUMPERS.items()},
+    }
+    if Dumper not in pure_dumpers:
+        raise TypeError(
+            f"{Dumper.__qualname__} is a libyaml dumper without a pure-Python "
+            "equivalent, pass a pure-Python dumper"
+        )
+    return pure_dumpers[Dumper]
+
+
+_C_DUMP_OPTIONS = {
+    "default_flow_style",
+    "sort_keys",
+    "allow_unicode",
+    "width",
+    "explicit_start",
+    "explicit_end",
+}
+# a block mapping key whose value is on the next lines, ex: `key:` or `- key: &id001`
+_BLOCK_KEY = re.compile(r":(?: &\w+)?$")
+_SEQUENCE_ITEMS = re.compile(r"(?:- )*")
+
+
+def dump_yaml(
+    data: Any,
+    stream: Optional[IO] = None,
+    Dumper: Type[yaml.Dumper] = IndentedListYamlDumper,
+    **kwargs,
+) -> Optional[str]:
+    """
+    yaml.dump(data, stream, Dumper, **kwargs), emitted by libyaml when PyYAML was built
+    with it and `Dumper` is IndentedListYamlDumper or UnaliasedIndentedListYamlDumper.
+
+    The output is byte-identical to the pure-Python dumpers': libyaml doesn't indent
+    sequences in mappings, so its lines are re-indented, and documents it can't write
+    the same way (lines over `width` that the pure emitter would wrap, non-ASCII or
+    non-printable strings, complex keys, scalar documents, other options) are dumped by
+    `Dumper` itself.
+    """
+    c_dumper = _C_DUMPERS.get(Dumper)
+    if (
+        c_dumper is not None
+        and isinstance(data, (dict, list, FrozenMap, FrozenList))
+        and set(kwargs) <= _C_DUMP_OPTIONS
+    ):
+        width = kwargs.get("width") or 80
+        try:
+            emitted = yaml.dump(data, Dumper=c_dumper, **{**kwargs, "width": -1})
+        except _UnsupportedScalar:
+            emitted = None
+        if emitted is not None:
+            indented = _indent_sequences_in_mappings(emitted, width)
+            if indented is not None:
+                if stream is None:
+                    return indented
+                stream.write(indented)
+                return None
+    return yaml.dump(data, stream, Dumper=Dumper, **kwargs)
+
+
+def dump_yaml_file(
+    file_path: str,
+    data: Any,
+    Dumper: Type[yaml.Dumper] = IndentedListYamlDumper,
+    **kwargs,
+) -> bool:
+    """dump_yaml of `data` to the file at `file_path`, written only if its contents
+    changed (see util_file_writer). Returns whether the file was written.
+    """
+    return write_file(file_path, dump_yaml(data, Dumper=Dumper, **kwargs))
+
+
+def _indent_sequences_in_mappings(emitted: str, width: int) -> Optional[str]:
+    """Indents libyaml's block sequences in mappings by 2 more spaces per level, like
+    IndentedListYamlDumper. None when a line is over `width` or is a complex key.
+    """
+    lines = []
+    # columns of the `- ` of the enclosing sequences that are mapping values
+    sequence_columns = []
+    previous = ""
+    for line in emitted.splitlines(True):
+        content = line.lstrip(" ")
+        column = len(line) - len(content)
+        while sequence_columns and (
+            column < sequence_columns[-1]
+            or column == sequence_columns[-1]
+            and not content.startswith("- ")
+        ):
+            sequence_columns.pop()
+        if content.startswith("- ") and _BLOCK_KEY.search(previous):
+            if not sequence_columns or sequence_columns[-1] != column:
+                sequence_columns.append(column)
+        line = " " * (2 * len(sequence_columns)) + line
+        node = content[_SEQUENCE_ITEMS.match(content).end() :]
+        # the pure emitter writes empty keys as complex keys too
+        if len(line.rstrip("\n")) > width or node.startswith(("? ", '"":')):
+            return None
+        lines.append(line)
+        previous = line.rstrip("\n")
+    return "".join(lines)
 
 
 def remove_leading_spaces(data):
@@ -0,0 +1,45 @@
+"""Sample metadata shared by the test modules."""
+
+import yaml
+
+
+def sample_table_entry(name: str = "test_table") -> dict:
+    return {
+        "table": {"schema": "public", "name": name},
+        "object_relationships": [
+            {
+                "name": "test_table__remote_table",
+                "using": {
+                    "manual_configuration": {
+                        "column_mapping": {"id": "test_table_id"},
+                        "remote_table": {"schema": "public", "name": "remote_table"},
+                    }
+                },
+            }
+        ],
+        "select_permissions": [
+            {
+                "role": "test_role",
+                "permission": {
+                    "columns": ["address", "id"],
+                    "filter": {"id": {"_eq": "X-Hasura-User-Id"}},
+                    "limit": 100,
+                    "allow_aggregations": True,
+                    "computed_fields": [],
+                },
+            },
+            {"role": "test_role_2", "permission": {"columns": "*", "filter": {}}},
+        ],
+    }
+
+
+def write_table_files(directory, count: int = 2) -> list:
+    """Writes the metadata files of tables `test_table_0`, `test_table_1`, ... to
+    `directory`, returns their paths.
+    """
+    file_paths = []
+    for i in range(count):
+        file_path = directory / f"public_test_table_{i}.yaml"
+        file_path.write_text(yaml.dump(sample_table_entry(f"test_table_{i}")))
+        file_paths.append(str(file_path))
+    return file_paths
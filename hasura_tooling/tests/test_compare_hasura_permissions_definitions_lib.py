@@ -0,0 +1,37 @@
+from hasura_tooling.compare_hasura_permissions_definitions_lib import (
+    diff_2_perm_def_dicts,
+)
+
+
+def sample_perm_def(columns: list, limit: int = 100) -> dict:
+    return {"columns": columns, "filter": {}, "limit": limit}
+
+
+class TestCompareHasuraPermissionsDefinitionsLib:
+    def test_diff_2_perm_def_dicts(self):
+        perm1 = {
+            "same_table": sample_perm_def(["id", "address"]),
+            "reordered_table": sample_perm_def(["id", "address"]),
+            "diff_table": sample_perm_def(["id", "address"]),
+            "table_1": sample_perm_def(["id"]),
+        }
+        perm2 = {
+            "same_table": sample_perm_def(["id", "address"]),
+            "reordered_table": sample_perm_def(["address", "id"]),
+            "diff_table": sample_perm_def(["id", "name"], limit=10),
+            "table_2": sample_perm_def(["id"]),
+        }
+
+        res = diff_2_perm_def_dicts(perm1, perm2, "role1_perm_vs_role2_perm")
+
+        assert res == {
+            "only_in_role_1": {"table_1": perm1["table_1"]},
+            "only_in_role_2": {"table_2": perm2["table_2"]},
+            "in_both_diff": {
+                "diff_table": {
+                    "columns_only_in_role_1": {"address"},
+                    "columns_only_in_role_2": {"name"},
+                    "row_limit_diff": {"role_1": 100, "role_2": 10},
+                }
+            },
+        }
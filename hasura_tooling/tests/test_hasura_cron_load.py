@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hasura_tooling.hasura_cron_load import parse_cron_schedule, simulate_cron_load
+from hasura_tooling.hasura_metadata_sdk import CronTrigger
+
+np = pytest.importorskip("numpy")
+
+
+def sample_cron_trigger(name: str, schedule: str, retry_conf: dict = None):
+    return CronTrigger.from_dict(
+        {
+            "name": name,
+            "webhook": "http://webhook",
+            "schedule": schedule,
+            "include_in_metadata": True,
+            "headers": [],
+            "retry_conf": retry_conf,
+        }
+    )
+
+
+class TestHasuraCronLoad:
+    def test_parse_cron_schedule(self):
+        schedule = parse_cron_schedule("*/20 9-17/4 1,15 JAN-MAR mon-fri")
+
+        assert schedule.minutes == {0, 20, 40}
+        assert schedule.hours == {9, 13, 17}
+        assert schedule.months == {1, 2, 3}
+        assert schedule.days_of_week == {1, 2, 3, 4, 5}
+        assert parse_cron_schedule("@weekly").days_of_week == {0}
+        assert parse_cron_schedule("0 0 * * 7").days_of_week == {0}
+        for schedule in ("* * * *", "60 * * * *", "* * * * MONDAY", "*/0 * * * *"):
+            with pytest.raises(ValueError):
+                parse_cron_schedule(schedule)
+
+    def test_day_of_month_or_day_of_week(self):
+        schedule = parse_cron_schedule("0 0 13 * FRI")
+
+        # a Friday, and a 13th that isn't a Friday
+        assert schedule.matches(datetime(2024, 1, 5))
+        assert schedule.matches(datetime(2024, 2, 13))
+        assert not schedule.matches(datetime(2024, 2, 14))
+        assert not parse_cron_schedule("0 0 * * FRI").matches(datetime(2024, 2, 13))
+
+    def test_simulated_load_matches_schedules(self):
+        cron_triggers = [
+            sample_cron_trigger("every_15_minutes", "*/15 * * * *"),
+            sample_cron_trigger("hourly", "@hourly"),
+            sample_cron_trigger("weekdays", "30 9 * * 1-5"),
+            sample_cron_trigger("first_of_month", "0 0 1 * *"),
+        ]
+        start = datetime(2024, 2, 28, 22, 10)
+        schedules = [parse_cron_schedule(t.schedule) for t in cron_triggers]
+
+        load = simulate_cron_load(cron_triggers, start, days=3)
+
+        assert len(load.deliveries) == 3 * 24 * 60
+        for index, deliveries in enumerate(load.deliveries.tolist()):
+            minute = start + timedelta(minutes=index)
+            assert deliveries == sum(s.matches(minute) for s in schedules)
+        assert load.peak() == (datetime(2024, 3, 1, 0, 0), 3.0)
+        assert load.hot_minutes(3) == [(datetime(2024, 3, 1, 0, 0), 3.0)]
+        assert load.triggers_firing_at(datetime(2024, 3, 1)) == [
+            "every_15_minutes",
+            "hourly",
+            "first_of_month",
+        ]
+        # the quarter hours that aren't hours, but two at 9:30 on weekdays
+        assert load.histogram()[1.0] == 3 * 24 * 3 - 2
+        assert load.deliveries_by_trigger["weekdays"] == 2
+
+    def test_retries(self):
+        cron_triggers = [
+            sample_cron_trigger(
+                "daily",
+                "0 0 * * *",
+                {"num_retries": 2, "retry_interval_seconds": 60, "timeout_seconds": 60},
+            )
+        ]
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        load = simulate_cron_load(cron_triggers, start, days=1, failure_rate=0.5)
+
+        assert load.hot_minutes(0.1) == [
+            (datetime(2024, 1, 1, 0, 0), 1.0),
+            (datetime(2024, 1, 1, 0, 2), 0.5),
+            (datetime(2024, 1, 1, 0, 4), 0.25),
+        ]
+        assert load.deliveries_by_trigger == {"daily": 1.75}
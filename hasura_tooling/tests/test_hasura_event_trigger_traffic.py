@@ -0,0 +1,152 @@
+import pytest
+
+from hasura_tooling.hasura_event_trigger_traffic import (
+    COUNTERS_QUERY,
+    CounterSnapshot,
+    OperationCounts,
+    cached_counter_snapshots,
+    estimate_event_trigger_traffic,
+    fetch_counter_snapshot,
+    table_rates,
+    webhook_traffic,
+)
+from tests.samples import sample_table_entry
+
+
+def sample_table_dicts() -> list:
+    table_entry = sample_table_entry()
+    table_entry["event_triggers"] = [
+        {
+            "name": "test_table_insert",
+            "definition": {"enable_manual": False, "insert": {"columns": "*"}},
+            "retry_conf": {"num_retries": 0, "interval_sec": 10},
+            "webhook": "https://events.example.com/insert",
+        },
+        {
+            "name": "test_table_address",
+            "definition": {
+                "enable_manual": False,
+                "update": {"columns": ["address"]},
+                "delete": {"columns": "*"},
+            },
+            "retry_conf": {"num_retries": 0, "interval_sec": 10},
+            "webhook_from_env": "ADDRESS_WEBHOOK",
+        },
+    ]
+    other_table_entry = {
+        "table": {"schema": "other", "name": "other_table"},
+        "event_triggers": [
+            {
+                "name": "other_table_insert",
+                "definition": {"enable_manual": False, "insert": {"columns": "*"}},
+                "retry_conf": {"num_retries": 0, "interval_sec": 10},
+                "webhook": "https://events.example.com/insert",
+            }
+        ],
+    }
+    return [table_entry, other_table_entry]
+
+
+class FakePostgres:
+    """A stand-in for `run_postgres_query` serving pg_stat_user_tables rows."""
+
+    def __init__(self, seconds_since_reset=100.0):
+        self.taken_at = 1_700_000_000.0
+        self.seconds_since_reset = seconds_since_reset
+        self.counters = {("public", "test_table"): [1000, 200, 10]}
+        self.queries = []
+
+    def advance(self, seconds, inserts=0, updates=0, deletes=0):
+        self.taken_at += seconds
+        self.seconds_since_reset += seconds
+        counters = self.counters[("public", "test_table")]
+        for i, delta in enumerate([inserts, updates, deletes]):
+            counters[i] += delta
+
+    def __call__(self, query):
+        self.queries.append(query)
+        return [
+            {
+                "schema_name": schema,
+                "table_name": table_name,
+                "inserts": inserts,
+                "updates": updates,
+                "deletes": deletes,
+                "taken_at": self.taken_at,
+                "seconds_since_reset": self.seconds_since_reset,
+            }
+            for (schema, table_name), (inserts, updates, deletes) in (
+                self.counters.items()
+            )
+        ]
+
+
+class TestHasuraEventTriggerTraffic:
+    def test_rates_since_stats_reset(self):
+        postgres = FakePostgres(seconds_since_reset=100.0)
+
+        snapshot = fetch_counter_snapshot(postgres)
+
+        assert postgres.queries == [COUNTERS_QUERY]
+        assert table_rates(snapshot) == {
+            ("public", "test_table"): OperationCounts(10.0, 2.0, 0.1)
+        }
+
+    def test_rates_between_snapshots(self):
+        postgres = FakePostgres()
+        previous = fetch_counter_snapshot(postgres)
+        postgres.advance(10, inserts=50, updates=5)
+        snapshot = fetch_counter_snapshot(postgres)
+
+        assert table_rates(snapshot, previous) == {
+            ("public", "test_table"): OperationCounts(5.0, 0.5, 0.0)
+        }
+        # counters reset since the previous snapshot, rates since the reset
+        reset = CounterSnapshot(
+            snapshot.taken_at, 5.0, {("public", "test_table"): OperationCounts(5, 0, 0)}
+        )
+        assert table_rates(reset, previous) == {
+            ("public", "test_table"): OperationCounts(1.0, 0.0, 0.0)
+        }
+
+    def test_trigger_and_webhook_ranking(self):
+        rates = {("public", "test_table"): OperationCounts(10.0, 2.0, 0.5)}
+
+        traffic = estimate_event_trigger_traffic(sample_table_dicts(), rates)
+
+        assert [
+            (t.trigger, t.webhook, t.events_per_second, t.upper_bound) for t in traffic
+        ] == [
+            ("test_table_insert", "https://events.example.com/insert", 10.0, False),
+            ("test_table_address", "{{ADDRESS_WEBHOOK}}", 2.5, True),
+            ("other_table_insert", "https://events.example.com/insert", 0.0, False),
+        ]
+        assert traffic[1].by_operation == {"update": 2.0, "delete": 0.5}
+        assert webhook_traffic(traffic) == [
+            ("https://events.example.com/insert", 10.0),
+            ("{{ADDRESS_WEBHOOK}}", 2.5),
+        ]
+
+    def test_counters_are_cached(self, tmp_path, monkeypatch):
+        cache_path = str(tmp_path / "pg_stat_counters.pickle")
+        postgres = FakePostgres()
+        clock = [postgres.taken_at]
+        monkeypatch.setattr(
+            "hasura_tooling.hasura_event_trigger_traffic.time.time", lambda: clock[0]
+        )
+
+        first, previous = cached_counter_snapshots(cache_path, 60, postgres)
+        assert previous is None
+        clock[0] += 30
+        assert cached_counter_snapshots(cache_path, 60, postgres) == (first, None)
+        assert len(postgres.queries) == 1
+
+        postgres.advance(60, inserts=60)
+        clock[0] += 30
+        snapshot, previous = cached_counter_snapshots(cache_path, 60, postgres)
+
+        assert len(postgres.queries) == 2
+        assert previous == first
+        assert table_rates(snapshot, previous)[("public", "test_table")].insert == (
+            pytest.approx(1.0)
+        )
@@ -0,0 +1,100 @@
+from hasura_tooling.compare_hasura_permissions_definitions_lib import (
+    diff_2_perm_def_dicts,
+)
+from hasura_tooling.hasura_filter_canonical import (
+    FilterRegistry,
+    canonical_filter,
+    filter_fingerprint,
+    filters_equivalent,
+)
+from hasura_tooling.hasura_metadata_sdk import table_entry_from_dict
+from tests.samples import sample_table_entry
+
+
+class TestHasuraFilterCanonical:
+    def test_canonical_filter(self):
+        assert canonical_filter(None) == {}
+        assert canonical_filter({"_and": [{}, {"_and": []}]}) == {}
+        assert canonical_filter({"id": {"_in": [2.0]}}) == {"id": {"_eq": 2}}
+        assert canonical_filter({"id": {"_nin": [3, 1, 3]}}) == {"id": {"_nin": [1, 3]}}
+        assert canonical_filter({"_not": {"_not": {"id": {"_eq": 1}}}}) == {
+            "id": {"_eq": 1}
+        }
+        assert canonical_filter({"id": {"_gt": 1, "_lt": 5}, "a": {"_eq": 0}}) == {
+            "_and": [{"a": {"_eq": 0}}, {"id": {"_gt": 1}}, {"id": {"_lt": 5}}]
+        }
+        assert canonical_filter({"_or": [{"id": {"_eq": 1}}, {}]}) == {}
+
+    def test_equivalent_filters(self):
+        assert filters_equivalent(
+            {
+                "_and": [
+                    {"b": {"_eq": 1}},
+                    {"_and": [{"a": {"_in": ["X-Hasura-User-Id"]}}]},
+                ]
+            },
+            {"a": {"_eq": "x-hasura-user-id"}, "b": {"_eq": 1.0}},
+        )
+        assert filters_equivalent(
+            {"_or": [{"a": {"_eq": 1}}, {"_or": [{"b": {"_eq": 2}}]}]},
+            {"_or": [{"b": {"_eq": 2}}, {"a": {"_eq": 1}}, {"a": {"_eq": 1}}]},
+        )
+        assert filters_equivalent(
+            {"remote_table": {"_and": [{"x": {"_eq": 1}}, {"y": {"_eq": 2}}]}},
+            {"remote_table": {"y": {"_eq": 2}, "x": {"_eq": 1}}},
+        )
+        assert filters_equivalent(
+            {"author": {"_or": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}]}},
+            {"author": {"_or": [{"b": {"_eq": 2}}, {"a": {"_eq": 1}}]}},
+        )
+        assert not filters_equivalent({"a": {"_eq": 1}}, {"a": {"_neq": 1}})
+        assert not filters_equivalent(
+            {"_or": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}]},
+            {"_and": [{"a": {"_eq": 1}}, {"b": {"_eq": 2}}]},
+        )
+        assert filter_fingerprint({"a": {"_in": [1]}}) == filter_fingerprint(
+            {"_and": [{"a": {"_eq": 1}}]}
+        )
+
+    def test_relationship_filter_of_boolean_operators_is_one_expression(self):
+        p, q, r = {"p": {"_eq": 1}}, {"q": {"_eq": 2}}, {"r": {"_eq": 3}}
+        # one article matching both, vs. any articles for each
+        one_article = {"articles": {"_and": [p], "_or": [q, r]}}
+        any_articles = {
+            "_and": [{"articles": {"_and": [p]}}, {"articles": {"_or": [q, r]}}]
+        }
+
+        assert canonical_filter(one_article) == {
+            "articles": {"_and": [{"_or": [q, r]}, p]}
+        }
+        assert not filters_equivalent(one_article, any_articles)
+        assert canonical_filter({"articles": {"_not": {"_not": p}}}) == {"articles": p}
+
+    def test_registry_stores_each_distinct_filter_once(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+        sdk_filter = table_entry.select_permissions[0].permission.filter
+        registry = FilterRegistry()
+
+        fingerprints = [
+            registry.add(sdk_filter),
+            registry.add({"_and": [{"id": {"_in": ["x-hasura-user-id"]}}]}),
+            registry.add({"id": {"_eq": 1}}),
+        ]
+
+        assert len(registry) == 2
+        assert fingerprints[0] == fingerprints[1] != fingerprints[2]
+        assert fingerprints[0] in registry
+        assert registry[fingerprints[0]] is sdk_filter
+        assert registry.intern({"id": {"_in": ["X-Hasura-User-Id"]}}) is sdk_filter
+
+    def test_equivalent_filters_are_not_a_diff(self):
+        def perm(filter):
+            return {"test_table": {"columns": ["id"], "limit": None, "filter": filter}}
+
+        diff = diff_2_perm_def_dicts(
+            perm({"_and": [{"a": {"_eq": 1}}, {"b": {"_in": [2]}}]}),
+            perm({"b": {"_eq": 2}, "a": {"_eq": 1}}),
+            "role1_perm_vs_role2_perm",
+        )
+
+        assert not any(diff.values())
@@ -0,0 +1,102 @@
+import pytest
+
+from hasura_tooling.hasura_filter_evaluator import compile_filter
+from hasura_tooling.hasura_metadata_sdk import table_entry_from_dict
+from tests.samples import sample_table_entry
+
+np = pytest.importorskip("numpy")
+
+
+def sample_rows() -> dict:
+    return {
+        "id": np.array([1, 2, 3, 4]),
+        "owner_id": np.array(["a", "b", None, "a"], dtype=object),
+        "score": np.array([0.5, np.nan, 2.0, 3.0]),
+    }
+
+
+class TestHasuraFilterEvaluator:
+    def test_column_operators(self):
+        rows = sample_rows()
+
+        def select(filter):
+            return compile_filter(filter)(rows).tolist()
+
+        assert select({"id": {"_eq": 2}}) == [False, True, False, False]
+        assert select({"id": {"_in": [1, 4], "_neq": 4}}) == [True, False, False, False]
+        assert select({"id": {"_nin": [1, 4]}}) == [False, True, True, False]
+        assert select({"score": {"_gte": 2}}) == [False, False, True, True]
+        assert select({"owner_id": {"_is_null": True}}) == [False, False, True, False]
+        assert select({"score": {"_is_null": False}}) == [True, False, True, True]
+        assert select({}) == [True, True, True, True]
+
+    def test_boolean_operators_treat_nulls_as_unknown(self):
+        rows = sample_rows()
+        not_owned_by_a = compile_filter({"_not": {"owner_id": {"_eq": "a"}}})
+        either = compile_filter(
+            {"_or": [{"owner_id": {"_eq": "b"}}, {"score": {"_gt": 2.5}}]}
+        )
+
+        assert not_owned_by_a(rows).tolist() == [False, True, False, False]
+        assert either(rows).tolist() == [False, True, False, True]
+
+    def test_session_variables_are_substituted_and_cast(self):
+        rows = sample_rows()
+        predicate = compile_filter(
+            {
+                "_and": [
+                    {"owner_id": {"_eq": "X-Hasura-User-Id"}},
+                    {"id": {"_lt": "x-hasura-max-id"}},
+                ]
+            }
+        )
+
+        mask = predicate(rows, {"X-Hasura-User-Id": "a", "X-Hasura-Max-Id": "4"})
+
+        assert mask.tolist() == [True, False, False, False]
+        assert predicate.session_variables == {"x-hasura-user-id", "x-hasura-max-id"}
+        assert predicate.columns == {"owner_id", "id"}
+        with pytest.raises(KeyError):
+            predicate(rows, {"X-Hasura-User-Id": "a"})
+
+    def test_in_session_variable_arrays(self):
+        rows = sample_rows()
+        allowed_ids = compile_filter({"id": {"_in": "X-Hasura-Allowed-Ids"}})
+        not_owners = compile_filter({"owner_id": {"_nin": "x-hasura-owner-ids"}})
+
+        def select(predicate, value):
+            name = next(iter(predicate.session_variables))
+            return predicate(rows, {name: value}).tolist()
+
+        assert allowed_ids.session_variables == {"x-hasura-allowed-ids"}
+        assert select(allowed_ids, "{1,3}") == [True, False, True, False]
+        assert select(allowed_ids, " [4, 2] ") == [False, True, False, True]
+        assert select(allowed_ids, "{}") == [False, False, False, False]
+        assert select(not_owners, '{"a", "c\\"d"}') == [False, True, False, False]
+        assert select(not_owners, '["b"]') == [True, False, False, True]
+        # like SQL, not in a list with a null is unknown
+        assert select(not_owners, "{b,NULL}") == [False, False, False, False]
+        for invalid_value in ["1,3", "{1,{2}}", "{1,}", '{"a}', '{"a": 1}', "[[1]]"]:
+            with pytest.raises(ValueError):
+                select(allowed_ids, invalid_value)
+        with pytest.raises(ValueError):
+            compile_filter({"id": {"_in": "1,3"}})
+
+    def test_compiled_filters_are_cached_by_fingerprint(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+        filter = table_entry.select_permissions[0].permission.filter
+
+        assert compile_filter(filter) is compile_filter(
+            {"id": {"_eq": "X-Hasura-User-Id"}}
+        )
+        assert compile_filter({"id": {"_in": [1, 2]}}) is (
+            compile_filter({"id": {"_in": [2, 1]}})
+        )
+
+    def test_unsupported_filters(self):
+        with pytest.raises(ValueError):
+            compile_filter({"remote_table": {"id": {"_eq": 1}}})
+        with pytest.raises(ValueError):
+            compile_filter({"id": {"_like": "a%"}})
+        with pytest.raises(ValueError):
+            compile_filter({"_exists": {"_table": {}, "_where": {}}})
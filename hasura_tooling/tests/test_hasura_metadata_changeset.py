@@ -0,0 +1,190 @@
+import copy
+import os
+
+import pytest
+import yaml
+
+from hasura_tooling.hasura_metadata_changeset import (
+    AddPermission,
+    AddRelationship,
+    AddTable,
+    Changeset,
+    RemoveColumns,
+    RemovePermission,
+    SetColumns,
+    apply_changeset,
+)
+from hasura_tooling.shard_hasura_tables_yaml_lib import (
+    read_table_shards,
+    write_table_shards,
+)
+from hasura_tooling.update_fn_create_generic_permissions_by_data_supersets import (
+    sync_permission_shards_by_roles,
+)
+from hasura_tooling.util_persistent_metadata import unwrap
+from tests.samples import sample_table_entry
+
+
+def sample_tables() -> dict:
+    return {"test_table": sample_table_entry()}
+
+
+class TestHasuraMetadataChangeset:
+    def test_apply_changeset_in_one_pass(self):
+        tables = sample_tables()
+        original = copy.deepcopy(tables)
+        changeset = Changeset(
+            [
+                AddPermission(
+                    "test_table", "new_role", {"columns": ["id"], "filter": {}}
+                ),
+                SetColumns("test_table", "test_role", ["id", "name"]),
+                RemoveColumns("test_table", ("name",)),
+                RemovePermission("test_table", "test_role_2"),
+            ]
+        )
+
+        edited = apply_changeset(tables, changeset)
+
+        assert tables == original
+        assert list(edited) == ["test_table"]
+        assert edited["test_table"]["select_permissions"] == [
+            {"role": "test_role", "permission": {**_permission(0), "columns": ["id"]}},
+            {"role": "new_role", "permission": {"columns": ["id"], "filter": {}}},
+        ]
+        assert unwrap(edited["test_table"]["object_relationships"]) is (
+            tables["test_table"]["object_relationships"]
+        )
+
+    def test_add_permission_replaces_role_in_place(self):
+        permission = {"columns": ["id"], "filter": {}}
+
+        edited = apply_changeset(
+            sample_tables(), [AddPermission("test_table", "test_role", permission)]
+        )
+
+        assert [p["role"] for p in edited["test_table"]["select_permissions"]] == [
+            "test_role",
+            "test_role_2",
+        ]
+        assert edited["test_table"]["select_permissions"][0]["permission"] == permission
+
+    def test_add_table_and_relationship(self):
+        relationship = {"name": "new_table__test_table", "using": {}}
+        changeset = Changeset().add(
+            AddTable(
+                "new_table",
+                {"table": {"schema": "public", "name": "new_table"}},
+            )
+        )
+        changeset.add(AddRelationship("new_table", relationship, kind="array"))
+        changeset.add(AddPermission("new_table", "test_role", {"columns": []}))
+
+        edited = apply_changeset(sample_tables(), changeset)
+
+        assert changeset.table_names() == ["new_table"]
+        assert edited["new_table"] == {
+            "table": {"schema": "public", "name": "new_table"},
+            "array_relationships": [relationship],
+            "select_permissions": [
+                {"role": "test_role", "permission": {"columns": []}}
+            ],
+        }
+
+    def test_invalid_operations(self):
+        tables = sample_tables()
+
+        with pytest.raises(KeyError):
+            apply_changeset(tables, [RemovePermission("missing_table", "test_role")])
+        with pytest.raises(KeyError):
+            apply_changeset(tables, [SetColumns("test_table", "missing_role", [])])
+        with pytest.raises(ValueError):
+            apply_changeset(tables, [AddTable("test_table", sample_table_entry())])
+        with pytest.raises(ValueError):
+            relationship = tables["test_table"]["object_relationships"][0]
+            apply_changeset(tables, [AddRelationship("test_table", relationship)])
+        with pytest.raises(ValueError):
+            RemovePermission("test_table", "test_role", kind="upsert")
+        assert apply_changeset(
+            tables,
+            [RemovePermission("test_table", "missing_role", missing_ok=True)],
+        ) == {"test_table": tables["test_table"]}
+
+    def test_write_table_shards_writes_edited_shards(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+        write_table_shards(sample_tables(), {})
+        shards_dir = tmp_path / "metadata" / "tables" / "test_table"
+        tables = read_table_shards()
+        os.utime(shards_dir / "_table.yaml", ns=(0, 0))
+
+        write_table_shards(
+            apply_changeset(
+                tables,
+                [
+                    RemoveColumns("test_table", ("address",)),
+                    RemovePermission("test_table", "test_role_2"),
+                ],
+            ),
+            tables,
+        )
+
+        assert tables == sample_tables()
+        assert sorted(path.name for path in shards_dir.iterdir()) == [
+            "_table.yaml",
+            "test_role.yaml",
+        ]
+        assert (shards_dir / "_table.yaml").stat().st_mtime_ns == 0
+        assert read_table_shards(["test_table"])["test_table"][
+            "select_permissions"
+        ] == [
+            {"role": "test_role", "permission": {**_permission(0), "columns": ["id"]}}
+        ]
+
+    def test_sync_roles_with_tables_without_select_permissions(
+        self, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", "")
+        tables_dir = tmp_path / "metadata" / "databases" / "default" / "tables"
+        tables_dir.mkdir(parents=True)
+        enum_table = {
+            "table": {"schema": "public", "name": "enum_table"},
+            "is_enum": True,
+        }
+        test_table = sample_table_entry()
+        test_table["select_permissions"][1]["permission"]["columns"] = ["id"]
+        for table in [test_table, enum_table]:
+            table_filename = f"public_{table['table']['name']}.yaml"
+            (tables_dir / table_filename).write_text(yaml.dump(table))
+        (tables_dir / "tables.yaml").write_text(
+            yaml.dump(
+                ["!include public_test_table.yaml", "!include public_enum_table.yaml"]
+            )
+        )
+        source_of_truth_dir = tmp_path / "metadata" / "source_of_truth"
+        source_of_truth_dir.mkdir()
+        supersets = {"superset": {"new_table": {"columns": ["id"], "limit": 10}}}
+        (source_of_truth_dir / "metadata_api_data_supersets.yaml").write_text(
+            yaml.dump(supersets)
+        )
+        e2e_tests_dir = tmp_path / "tests" / "feature" / "features"
+        e2e_tests_dir.mkdir(parents=True)
+        (e2e_tests_dir / "hasura_perm_metadata.yaml").write_text("{}\n")
+
+        sync_permission_shards_by_roles("test_role", "superset")
+
+        tables = read_table_shards()
+        assert yaml.safe_load((tables_dir / "tables.yaml").read_text())[-1] == (
+            "!include public_new_table.yaml"
+        )
+        assert tables["enum_table"] == enum_table
+        assert [p["role"] for p in tables["test_table"]["select_permissions"]] == [
+            "test_role_2"
+        ]
+        assert [p["role"] for p in tables["new_table"]["select_permissions"]] == [
+            "test_role"
+        ]
+
+
+def _permission(index: int) -> dict:
+    return sample_table_entry()["select_permissions"][index]["permission"]
@@ -0,0 +1,94 @@
+from hasura_tooling.hasura_metadata_diff import (
+    ChangeKind,
+    MetadataChange,
+    diff_metadata,
+    diff_tables,
+)
+from hasura_tooling.hasura_metadata_sdk import (
+    LazyTableEntry,
+    TableEntry,
+    hasura_metadata_v2_from_dict,
+)
+from tests.samples import sample_table_entry
+
+
+def sample_changed_table_entry() -> dict:
+    table_entry = sample_table_entry()
+    table_entry["select_permissions"].reverse()
+    table_entry["select_permissions"][0]["permission"]["filter"] = {"id": {"_eq": 1}}
+    table_entry["select_permissions"][1]["permission"]["columns"] = ["id"]
+    table_entry["object_relationships"][0]["comment"] = "test_comment"
+    table_entry["insert_permissions"] = [
+        {"role": "test_role", "permission": {"columns": ["id"], "check": {}}}
+    ]
+    return table_entry
+
+
+class TestHasuraMetadataDiff:
+    def test_equal_tables_have_no_changes(self):
+        reordered = sample_table_entry()
+        reordered["select_permissions"].reverse()
+        reordered["select_permissions"][1]["permission"]["columns"].reverse()
+
+        assert (
+            diff_tables(
+                [TableEntry.from_dict(sample_table_entry())],
+                [LazyTableEntry.from_dict(reordered)],
+            )
+            == []
+        )
+
+    def test_field_level_changes(self):
+        changes = diff_tables(
+            [TableEntry.from_dict(sample_table_entry())],
+            [TableEntry.from_dict(sample_changed_table_entry())],
+        )
+
+        assert [str(change) for change in changes] == [
+            "added tables/public.test_table/insert_permissions",
+            "added tables/public.test_table/object_relationships/"
+            "test_table__remote_table/comment",
+            "modified tables/public.test_table/select_permissions/test_role/"
+            "permission/columns",
+            "modified tables/public.test_table/select_permissions/test_role_2/"
+            "permission/filter",
+        ]
+        assert changes[2] == MetadataChange(
+            ChangeKind.MODIFIED,
+            (
+                "tables",
+                "public.test_table",
+                "select_permissions",
+                "test_role",
+                "permission",
+                "columns",
+            ),
+            ["address", "id"],
+            ["id"],
+        )
+
+    def test_added_and_removed_entries(self):
+        old_table_entry = sample_table_entry()
+        new_table_entry = sample_table_entry()
+        del new_table_entry["select_permissions"][1]
+        new_table_entry["select_permissions"].append(
+            {"role": "test_role_3", "permission": {"columns": ["id"], "filter": {}}}
+        )
+        other_table_entry = sample_table_entry("test_table_2")
+
+        changes = diff_metadata(
+            hasura_metadata_v2_from_dict(
+                {"version": 2, "tables": [old_table_entry, other_table_entry]}
+            ),
+            hasura_metadata_v2_from_dict({"version": 3, "tables": [new_table_entry]}),
+        )
+
+        assert [(change.kind, change.path[-1]) for change in changes] == [
+            (ChangeKind.REMOVED, "test_role_2"),
+            (ChangeKind.ADDED, "test_role_3"),
+            (ChangeKind.REMOVED, "public.test_table_2"),
+            (ChangeKind.MODIFIED, "version"),
+        ]
+        assert changes[2].old.table.name == "test_table_2"
+        assert changes[2].new is None
+        assert (changes[3].old, changes[3].new) == (2, 3)
@@ -0,0 +1,83 @@
+import pytest
+
+from hasura_tooling.hasura_metadata_index import MetadataIndex
+from hasura_tooling.hasura_metadata_sdk import (
+    EventTriggerColumnsEnum,
+    hasura_metadata_v2_from_dict,
+)
+from tests.samples import sample_table_entry
+
+
+def sample_table_dicts() -> list:
+    remote_table_entry = {
+        "table": {"schema": "public", "name": "remote_table"},
+        "array_relationships": [
+            {
+                "name": "remote_table__test_tables",
+                "using": {
+                    "foreign_key_constraint_on": {
+                        "column": "remote_table_id",
+                        "table": {"schema": "public", "name": "test_table"},
+                    }
+                },
+            }
+        ],
+        "select_permissions": [
+            {"role": "test_role", "permission": {"columns": ["id"], "filter": {}}},
+            {"role": "test_role", "permission": {"columns": [], "filter": {}}},
+        ],
+        "insert_permissions": [
+            {"role": "test_role_2", "permission": {"columns": ["id"], "check": {}}}
+        ],
+    }
+    return [sample_table_entry(), remote_table_entry]
+
+
+class TestMetadataIndex:
+    def test_table_and_permission_lookups(self):
+        index = MetadataIndex.from_table_dicts(sample_table_dicts())
+
+        assert len(index) == 2
+        assert "remote_table" in index
+        assert index.table("test_table").table.name == "test_table"
+        assert index.permission("test_table", "test_role").permission.limit == 100
+        assert index.permission("remote_table", "test_role_2", kind="insert").role == (
+            "test_role_2"
+        )
+        with pytest.raises(KeyError):
+            index.permission("remote_table", "test_role_2")
+        with pytest.raises(KeyError):
+            index.table("missing_table")
+        with pytest.raises(ValueError):
+            index.tables_by_role("test_role", kind="upsert")
+
+    def test_role_lookups_index_first_permission(self):
+        index = MetadataIndex.from_table_dicts(sample_table_dicts())
+
+        assert index.tables_by_role("test_role") == ["test_table", "remote_table"]
+        assert index.tables_by_role("test_role_2", kind="insert") == ["remote_table"]
+        assert index.tables_by_role("missing_role") == []
+        assert index.roles_by_table("remote_table") == ["test_role"]
+        assert index.columns_by_role("test_role") == {
+            "test_table": ["address", "id"],
+            "remote_table": ["id"],
+        }
+        assert index.columns_by_role("test_role_2") == {
+            "test_table": EventTriggerColumnsEnum.EMPTY
+        }
+
+    def test_relationships_by_remote_table(self):
+        metadata = hasura_metadata_v2_from_dict(
+            {"version": 2, "tables": sample_table_dicts()}
+        )
+        index = MetadataIndex.from_metadata(metadata)
+
+        [(table_name, relationship)] = index.relationships_by_remote_table(
+            "remote_table"
+        )
+        assert table_name == "test_table"
+        assert relationship.name == "test_table__remote_table"
+        assert [
+            name for name, _ in index.relationships_by_remote_table("test_table")
+        ] == ["remote_table"]
+        assert index.relationships_by_remote_table("missing_table") == []
@@ -0,0 +1,237 @@
+import operator
+
+import pytest
+
+from hasura_tooling.hasura_metadata_sdk import (
+    EventTriggerColumnsEnum,
+    LazySelectPermissionEntry,
+    LazyTableEntry,
+    QualifiedTable,
+    SelectPermission,
+    TableEntry,
+    ValidationLevel,
+    content_fingerprint,
+    encode_class,
+    from_class,
+    lazy_table_entry_from_dict,
+    select_permission_from_dict,
+    table_entry_from_dict,
+    table_entry_to_dict,
+    trusted_to_dict,
+)
+from tests.samples import sample_table_entry
+
+
+class TestHasuraMetadataSdkDecoder:
+    def test_table_entry_round_trip(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+
+        assert table_entry.table == QualifiedTable("test_table", "public")
+        assert table_entry.array_relationships is None
+        assert [p.role for p in table_entry.select_permissions] == [
+            "test_role",
+            "test_role_2",
+        ]
+        assert table_entry.select_permissions[1].permission.columns is (
+            EventTriggerColumnsEnum.EMPTY
+        )
+        assert table_entry_from_dict(table_entry_to_dict(table_entry)) == table_entry
+
+    def test_numeric_filter_values_decode_to_float(self):
+        permission = select_permission_from_dict({"columns": [], "filter": {"id": 5}})
+
+        assert permission.filter == {"id": 5.0}
+        assert isinstance(permission.filter["id"], float)
+
+    def test_identifiers_are_interned(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+        other_table_entry = table_entry_from_dict(sample_table_entry())
+        columns = table_entry.select_permissions[0].permission.columns
+        other_columns = other_table_entry.select_permissions[0].permission.columns
+
+        assert table_entry.table.name is other_table_entry.table.name
+        assert all(map(operator.is_, columns, other_columns))
+        assert table_entry.select_permissions[0].role is (
+            other_table_entry.select_permissions[0].role
+        )
+
+    def test_dict_subclasses_are_accepted(self):
+        class CommentedDict(dict):
+            pass
+
+        permission = from_class(
+            SelectPermission, CommentedDict(columns=["id"], filter=CommentedDict())
+        )
+
+        assert permission.columns == ["id"]
+        assert permission.filter == {}
+
+    @pytest.mark.parametrize(
+        "permission",
+        [
+            {"columns": ["id"], "limit": True},
+            {"columns": ["id"], "computed_fields": ["ok", 1]},
+            {"columns": "not_a_star"},
+            {"columns": ["id"], "filter": {"_and": [{"id": {"_eq": 1}}]}},
+        ],
+    )
+    def test_invalid_optional_fields_raise_bare_assertion_error(self, permission: dict):
+        with pytest.raises(AssertionError) as err:
+            select_permission_from_dict(permission)
+
+        assert str(err.value) == ""
+
+    def test_invalid_required_field_raises(self):
+        table_entry = sample_table_entry()
+        table_entry["table"] = "test_table"
+
+        with pytest.raises(AssertionError):
+            TableEntry.from_dict(table_entry)
+
+    def test_encode_class_matches_generated_to_dict(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+
+        assert encode_class(TableEntry, table_entry) == table_entry.to_dict()
+
+        table_entry.select_permissions[0].permission.limit = "100"
+        with pytest.raises(AssertionError):
+            encode_class(TableEntry, table_entry)
+
+
+class TestValidationLevels:
+    @pytest.mark.parametrize(
+        "validation", [ValidationLevel.SHALLOW, ValidationLevel.NONE]
+    )
+    def test_valid_input_decodes_like_full_validation(
+        self, validation: ValidationLevel
+    ):
+        table_entry = from_class(TableEntry, sample_table_entry(), validation)
+
+        assert table_entry == table_entry_from_dict(sample_table_entry())
+        assert table_entry.select_permissions[1].permission.columns is (
+            EventTriggerColumnsEnum.EMPTY
+        )
+        assert isinstance(
+            table_entry.select_permissions[0].permission.computed_fields, list
+        )
+
+    def test_shallow_validation_only_checks_top_level_fields(self):
+        table_entry = sample_table_entry()
+        table_entry["select_permissions"][0]["permission"]["limit"] = "100"
+
+        decoded = from_class(TableEntry, table_entry, ValidationLevel.SHALLOW)
+
+        assert decoded.select_permissions[0].permission.limit == "100"
+        table_entry["is_enum"] = "yes"
+        with pytest.raises(AssertionError):
+            from_class(TableEntry, table_entry, ValidationLevel.SHALLOW)
+
+    def test_no_validation_keeps_invalid_values(self):
+        table_entry = sample_table_entry()
+        table_entry["is_enum"] = "yes"
+
+        assert (
+            from_class(TableEntry, table_entry, ValidationLevel.NONE).is_enum == "yes"
+        )
+
+    def test_trusted_to_dict_matches_to_dict(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+
+        assert trusted_to_dict(table_entry) == table_entry.to_dict()
+
+        table_entry.select_permissions[0].permission.limit = "100"
+        assert (
+            trusted_to_dict(table_entry)["select_permissions"][0]["permission"]["limit"]
+            == "100"
+        )
+
+
+class TestContentFingerprint:
+    def test_equal_content_has_equal_fingerprint(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+
+        assert (
+            table_entry.fingerprint()
+            == table_entry_from_dict(sample_table_entry()).fingerprint()
+        )
+        assert table_entry.fingerprint() == (
+            LazyTableEntry.from_dict(sample_table_entry()).fingerprint()
+        )
+        assert len(table_entry.fingerprint()) == 32
+
+    def test_order_and_number_formatting_are_ignored(self):
+        table_entry_dict = sample_table_entry()
+        reordered = sample_table_entry()
+        reordered["select_permissions"].reverse()
+        permission = reordered["select_permissions"][1]["permission"]
+        permission["columns"] = ["id", "address"]
+        permission["filter"] = {"id": {"_in": [2, 1.0]}, "limit": 5}
+        table_entry_dict["select_permissions"][0]["permission"]["filter"] = {
+            "limit": 5.0,
+            "id": {"_in": [1, 2.0]},
+        }
+
+        assert table_entry_from_dict(table_entry_dict).fingerprint() == (
+            table_entry_from_dict(reordered).fingerprint()
+        )
+
+    def test_changed_content_changes_fingerprint(self):
+        table_entry = table_entry_from_dict(sample_table_entry())
+        fingerprint = table_entry.fingerprint()
+        permission = table_entry.select_permissions[0].permission
+        permission_fingerprint = permission.fingerprint()
+
+        permission.columns = ["id"]
+
+        assert permission.fingerprint() != permission_fingerprint
+        assert table_entry.fingerprint() != fingerprint
+        assert (
+            content_fingerprint(table_entry.object_relationships[0])
+            == table_entry.object_relationships[0].fingerprint()
+        )
+
+
+class TestLazyTableEntry:
+    def test_decodes_fields_on_first_access(self):
+        table_entry = lazy_table_entry_from_dict(sample_table_entry())
+
+        assert table_entry.table.name == "test_table"
+        assert "table" in vars(table_entry)
+        assert "select_permissions" not in vars(table_entry)
+        assert table_entry.select_permissions[0].permission.limit == 100
+        assert table_entry.select_permissions is table_entry.select_permissions
+        assert table_entry.update_permissions is None
+
+    def test_permission_entries_decode_lazily(self):
+        table_entry = lazy_table_entry_from_dict(sample_table_entry())
+        permission_entry = table_entry.select_permissions[0]
+
+        assert isinstance(permission_entry, LazySelectPermissionEntry)
+        assert permission_entry.role == "test_role"
+        assert "permission" not in vars(permission_entry)
+        assert permission_entry.permission.columns == ["address", "id"]
+
+    def test_equals_eager_decode(self):
+        table_entry = LazyTableEntry.from_dict(sample_table_entry())
+        eager_table_entry = table_entry_from_dict(sample_table_entry())
+
+        assert table_entry == eager_table_entry
+        assert eager_table_entry == table_entry
+        assert table_entry_to_dict(table_entry) == table_entry_to_dict(
+            eager_table_entry
+        )
+
+    def test_invalid_fields_raise_on_access(self):
+        table_entry_dict = sample_table_entry()
+        table_entry_dict["is_enum"] = "yes"
+        table_entry = LazyTableEntry.from_dict(table_entry_dict)
+
+        assert table_entry.table.name == "test_table"
+        with pytest.raises(AssertionError):
+            table_entry.is_enum
+
+    def test_assigned_fields_are_kept(self):
+        table_entry = LazyTableEntry.from_dict(sample_table_entry())
+        table_entry.select_permissions = []
+
+        assert table_entry.to_dict()["select_permissions"] == []
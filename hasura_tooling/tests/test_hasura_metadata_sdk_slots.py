@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+
+from hasura_tooling import hasura_metadata_sdk, hasura_metadata_sdk_slots
+from hasura_tooling.hasura_metadata_sdk_slots import (
+    EventTriggerColumnsEnum,
+    QualifiedTable,
+    SelectPermission,
+    TableEntry,
+)
+from tests.samples import sample_table_entry
+
+
+class TestHasuraMetadataSdkSlots:
+    def test_same_to_dict_as_sdk(self):
+        table_entry = TableEntry.from_dict(sample_table_entry())
+
+        assert table_entry.to_dict() == (
+            hasura_metadata_sdk.TableEntry.from_dict(sample_table_entry()).to_dict()
+        )
+        assert TableEntry.from_dict(table_entry.to_dict()) == table_entry
+        assert table_entry.fingerprint() == (
+            hasura_metadata_sdk.TableEntry.from_dict(sample_table_entry()).fingerprint()
+        )
+
+    def test_nested_models_are_slotted(self):
+        table_entry = TableEntry.from_dict(sample_table_entry())
+        relationship = table_entry.object_relationships[0]
+
+        assert type(table_entry.table) is QualifiedTable
+        assert type(table_entry.select_permissions[0].permission) is SelectPermission
+        assert type(relationship.using.manual_configuration.remote_table) is (
+            QualifiedTable
+        )
+        assert table_entry.select_permissions[1].permission.columns is (
+            EventTriggerColumnsEnum.EMPTY
+        )
+        for model in (table_entry, table_entry.table, relationship.using):
+            assert not hasattr(model, "__dict__")
+
+    def test_every_sdk_model_has_a_slotted_counterpart(self):
+        for name, c in vars(hasura_metadata_sdk).items():
+            if isinstance(c, type) and "__dataclass_fields__" in vars(c):
+                slotted = getattr(hasura_metadata_sdk_slots, name)
+                assert slotted.__slots__ == tuple(c.__dataclass_fields__)
+
+    def test_defaults_and_pickling(self):
+        permission = SelectPermission(columns=["id"])
+
+        assert permission.filter is None
+        assert pickle.loads(pickle.dumps(permission)) == permission
+        with pytest.raises(AttributeError):
+            permission.alias = "test_alias"
+
+    def test_to_dict_validates_like_sdk(self):
+        permission = SelectPermission(columns=["id"], filter={"id": 5})
+
+        with pytest.raises(AssertionError):
+            permission.to_dict()
@@ -0,0 +1,154 @@
+import io
+import json
+
+import pytest
+import yaml
+
+from hasura_tooling.hasura_metadata_sdk import (
+    HasuraMetadataV2,
+    LazyTableEntry,
+    RemoteSchema,
+)
+from hasura_tooling.hasura_metadata_sdk_stream import (
+    iter_table_entries,
+    read_metadata_sections,
+    write_metadata_json,
+    write_metadata_yaml,
+)
+from hasura_tooling import util_yaml_dumper
+from hasura_tooling.util_yaml_dumper import UnaliasedIndentedListYamlDumper
+from tests.samples import sample_table_entry
+
+
+def sample_metadata() -> dict:
+    return {
+        "version": 2,
+        "tables": [sample_table_entry(), sample_table_entry("test_table_2")],
+        "remote_schemas": [
+            {
+                "name": "test_remote_schema",
+                "definition": {"url": "http://remote-schema", "timeout_seconds": 60},
+            }
+        ],
+    }
+
+
+class TestHasuraMetadataSdkStream:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_iter_table_entries_matches_full_decode(self, chunk_size: int):
+        metadata_json = json.dumps(sample_metadata(), indent=2)
+        metadata = HasuraMetadataV2.from_dict(json.loads(metadata_json))
+
+        for source in (io.StringIO(metadata_json), io.BytesIO(metadata_json.encode())):
+            assert (
+                list(iter_table_entries(source, chunk_size=chunk_size))
+                == metadata.tables
+            )
+
+    def test_iter_table_entries_from_path(self, tmp_path):
+        metadata_path = tmp_path / "metadata.json"
+        metadata_path.write_text(json.dumps(sample_metadata()))
+
+        table_entries = list(iter_table_entries(str(metadata_path), lazy=True))
+
+        assert [t.table.name for t in table_entries] == ["test_table", "test_table_2"]
+        assert all(isinstance(t, LazyTableEntry) for t in table_entries)
+
+    @pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+    def test_read_metadata_sections(self, chunk_size: int):
+        metadata_json = json.dumps(sample_metadata())
+
+        sections = read_metadata_sections(
+            io.StringIO(metadata_json), chunk_size=chunk_size
+        )
+
+        assert sections["version"] == 2.0
+        assert sections["remote_schemas"] == [
+            RemoteSchema.from_dict(sample_metadata()["remote_schemas"][0])
+        ]
+        assert sections["actions"] is None
+        assert sections["custom_types"] is None
+
+    @pytest.mark.parametrize("version", ["2.5", "-1.25e+3", "12E-2", "10", "0.0"])
+    def test_numbers_split_across_chunks(self, version: str):
+        metadata_json = (
+            f'{{"version": {version}, "tables": [], "actions": [{version}]}}'
+        )
+
+        for chunk_size in range(1, len(metadata_json) + 1):
+            sections = read_metadata_sections(
+                io.StringIO(metadata_json), ["version"], chunk_size=chunk_size
+            )
+
+            assert sections == {"version": json.loads(version)}, chunk_size
+
+    def test_read_metadata_sections_rejects_unknown_sections(self):
+        with pytest.raises(KeyError):
+            read_metadata_sections(io.StringIO("{}"), ["tables"])
+
+    @pytest.mark.parametrize(
+        "metadata_json",
+        ['{"tables": [{"table": ', '{"tables": [] "version": 2}', "[]"],
+    )
+    def test_malformed_json_raises(self, metadata_json: str):
+        with pytest.raises(ValueError):
+            list(iter_table_entries(io.StringIO(metadata_json), chunk_size=4))
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"indent": 2},
+            {"indent": "\t", "sort_keys": True},
+            {"separators": (",", ":")},
+        ],
+    )
+    def test_write_metadata_json_matches_json_dump(self, kwargs: dict):
+        for tables in (sample_metadata()["tables"], []):
+            metadata = HasuraMetadataV2.from_dict(
+                {**sample_metadata(), "tables": tables}
+            )
+            expected, written = io.StringIO(), io.StringIO()
+
+            json.dump(metadata.to_dict(), expected, **kwargs)
+            write_metadata_json(metadata, written, **kwargs)
+
+            assert written.getvalue() == expected.getvalue()
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"Dumper": UnaliasedIndentedListYamlDumper, "sort_keys": False},
+            {"default_flow_style": None, "explicit_start": True},
+        ],
+    )
+    def test_write_metadata_yaml_matches_yaml_dump(self, kwargs: dict):
+        for tables in (sample_metadata()["tables"], []):
+            metadata = HasuraMetadataV2.from_dict(
+                {**sample_metadata(), "tables": tables}
+            )
+            expected, written = io.StringIO(), io.StringIO()
+
+            yaml.dump(metadata.to_dict(), expected, **kwargs)
+            write_metadata_yaml(metadata, written, **kwargs)
+
+            assert written.getvalue() == expected.getvalue()
+
+    @pytest.mark.skipif(
+        not getattr(yaml, "__with_libyaml__", False), reason="needs libyaml"
+    )
+    def test_write_metadata_yaml_with_libyaml_dumpers(self):
+        metadata = HasuraMetadataV2.from_dict(sample_metadata())
+        expected, written = io.StringIO(), io.StringIO()
+
+        yaml.dump(metadata.to_dict(), expected, UnaliasedIndentedListYamlDumper)
+        write_metadata_yaml(
+            metadata, written, util_yaml_dumper.CUnaliasedIndentedListYamlDumper
+        )
+
+        assert written.getvalue() == expected.getvalue()
+        with pytest.raises(TypeError):
+            write_metadata_yaml(
+                metadata, io.StringIO(), type("CustomDumper", (yaml.CDumper,), {})
+            )
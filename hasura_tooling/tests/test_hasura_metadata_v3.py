@@ -0,0 +1,132 @@
+import pytest
+import yaml
+
+from hasura_tooling.hasura_metadata_sdk import QualifiedTable
+from hasura_tooling.hasura_metadata_v3 import (
+    HasuraMetadataV3,
+    IncludedTables,
+    resolve_include,
+)
+from tests.samples import sample_table_entry
+
+
+def write_metadata_dir(metadata_dir, table_names=("test_table", "other_table")):
+    tables_dir = metadata_dir / "databases" / "default" / "tables"
+    tables_dir.mkdir(parents=True)
+    includes = []
+    for table_name in table_names:
+        table_entry = sample_table_entry(table_name)
+        (tables_dir / f"public_{table_name}.yaml").write_text(yaml.dump(table_entry))
+        includes.append(f"!include public_{table_name}.yaml")
+    (tables_dir / "tables.yaml").write_text(yaml.dump(includes))
+    return tables_dir
+
+
+class TestHasuraMetadataV3:
+    def test_resolve_include(self):
+        assert resolve_include("!include public_t.yaml", "/m/tables") == (
+            "/m/tables/public_t.yaml"
+        )
+        assert resolve_include("!include default/tables/tables.yaml", "/m") == (
+            "/m/default/tables/tables.yaml"
+        )
+        with pytest.raises(ValueError):
+            resolve_include("public_t.yaml", "/m")
+
+    def test_table_is_read_on_first_access(self, tmp_path):
+        tables_dir = write_metadata_dir(tmp_path)
+        # unreadable, and never read
+        (tables_dir / "public_other_table.yaml").write_text("table: [")
+        source = HasuraMetadataV3.from_dir(str(tmp_path)).source("default")
+
+        table_entry = source.table_entry("test_table")
+
+        assert len(source) == 2
+        assert table_entry.table == QualifiedTable("test_table", "public")
+        assert source.table_metadata("test_table") is source.table_metadata(
+            "test_table"
+        )
+        with pytest.raises(KeyError):
+            source.table_metadata("missing_table")
+
+    def test_sources_from_databases_yaml(self, tmp_path):
+        write_metadata_dir(tmp_path)
+        databases = [
+            {
+                "name": "default",
+                "kind": "postgres",
+                "configuration": {"connection_info": {}},
+                "tables": "!include default/tables/tables.yaml",
+            }
+        ]
+        (tmp_path / "databases" / "databases.yaml").write_text(yaml.dump(databases))
+
+        metadata = HasuraMetadataV3.from_dir(str(tmp_path))
+
+        assert [source.name for source in metadata.sources] == ["default"]
+        assert metadata.source().kind == "postgres"
+        assert [table_entry.table.name for table_entry in metadata.to_v2().tables] == [
+            "test_table",
+            "other_table",
+        ]
+        with pytest.raises(KeyError):
+            metadata.source("bigquery")
+
+    def test_included_tables_are_read_on_first_access(self, tmp_path):
+        tables_dir = write_metadata_dir(
+            tmp_path, ("test_table", "other_test_table", "unread_table")
+        )
+        (tables_dir / "public_unread_table.yaml").write_text("table: [")
+        unread_table_file = (tables_dir / "public_unread_table.yaml").read_text()
+        tables = IncludedTables.from_file(str(tables_dir / "tables.yaml"))
+
+        (table,) = tables.tables_named("test_table")
+        table["select_permissions"] = []
+        tables.write()
+
+        assert len(tables) == 3
+        assert tables[0] is table
+        assert [filepath for filepath, _ in tables.read_tables()] == [
+            str(tables_dir / "public_test_table.yaml"),
+            str(tables_dir / "public_other_test_table.yaml"),
+        ]
+        assert yaml.safe_load((tables_dir / "public_test_table.yaml").read_text()) == (
+            table
+        )
+        assert (tables_dir / "public_unread_table.yaml").read_text() == (
+            unread_table_file
+        )
+        assert yaml.safe_load((tables_dir / "tables.yaml").read_text()) == [
+            "!include public_test_table.yaml",
+            "!include public_other_test_table.yaml",
+            "!include public_unread_table.yaml",
+        ]
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_included_tables_prefetch(self, tmp_path, processes):
+        tables_dir = write_metadata_dir(tmp_path)
+        tables = IncludedTables.from_file(str(tables_dir / "tables.yaml"))
+        test_table = tables[0]
+
+        tables.prefetch(processes)
+
+        assert tables[0] is test_table
+        assert [table["table"]["name"] for table in tables] == [
+            "test_table",
+            "other_table",
+        ]
+        assert len(list(tables.read_tables())) == 2
+
+    def test_included_tables_of_v2_tables_yaml(self, tmp_path):
+        tables_filepath = tmp_path / "tables.yaml"
+        tables_filepath.write_text(yaml.dump([sample_table_entry()]))
+        tables = IncludedTables.from_file(str(tables_filepath))
+
+        tables.tables_named("test_table")[0]["select_permissions"] = []
+        tables.write()
+
+        assert tables.filepath(0) is None
+        assert list(tables.read_tables()) == []
+        assert (
+            yaml.safe_load(tables_filepath.read_text())[0]["select_permissions"] == []
+        )
@@ -0,0 +1,93 @@
+import pytest
+
+from hasura_tooling.hasura_metadata_sdk import HasuraMetadataV2
+from hasura_tooling.hasura_permission_matrix import PermissionMatrix
+from tests.samples import sample_table_entry
+
+np = pytest.importorskip("numpy")
+
+
+def sample_permission_definitions() -> dict:
+    return {
+        "superset1": {
+            "table_a": {"columns": ["id", "name"]},
+            "table_b": {"columns": ["id"]},
+        },
+        "superset2": {
+            "table_a": {"columns": ["id", "email"]},
+            "table_b": {"columns": "*"},
+        },
+        "superset3": {"table_b": {"columns": ["total"]}},
+    }
+
+
+class TestHasuraPermissionMatrix:
+    def test_columns_are_interned_per_table(self):
+        matrix = PermissionMatrix.from_permission_definitions(
+            sample_permission_definitions()
+        )
+
+        assert matrix.roles == ["superset1", "superset2", "superset3"]
+        assert matrix.tables == ["table_a", "table_b"]
+        assert matrix.columns("superset2") == {
+            "table_a": ["email", "id"],
+            "table_b": ["id", "total"],
+        }
+        assert matrix.column_counts() == {
+            "superset1": 3,
+            "superset2": 4,
+            "superset3": 1,
+        }
+
+    def test_set_operations(self):
+        matrix = PermissionMatrix.from_permission_definitions(
+            sample_permission_definitions()
+        )
+
+        assert matrix.columns(matrix.union("superset1", "superset3")) == {
+            "table_a": ["id", "name"],
+            "table_b": ["id", "total"],
+        }
+        assert matrix.columns(matrix.intersection("superset1", "superset2")) == {
+            "table_a": ["id"],
+            "table_b": ["id"],
+        }
+        assert matrix.added_columns("superset2", ["superset1", "superset3"]) == {
+            "table_a": ["email"]
+        }
+        assert matrix.columns(
+            matrix.difference(matrix.union("superset1", "superset2"), "superset3")
+        ) == {"table_a": ["email", "id", "name"], "table_b": ["id"]}
+        assert matrix.shared_column_counts().tolist() == [
+            [3, 2, 0],
+            [2, 4, 1],
+            [0, 1, 1],
+        ]
+
+    def test_roles_by_column_and_table(self):
+        matrix = PermissionMatrix.from_permission_definitions(
+            sample_permission_definitions()
+        )
+
+        assert matrix.roles_with_column("table_a", "id") == ["superset1", "superset2"]
+        assert matrix.roles_with_column("table_b", "total") == [
+            "superset2",
+            "superset3",
+        ]
+        assert matrix.roles_with_table("table_a") == ["superset1", "superset2"]
+        with pytest.raises(KeyError):
+            matrix.roles_with_column("table_a", "total")
+
+    def test_from_metadata_matches_table_dicts(self):
+        table_entry = sample_table_entry()
+        metadata = HasuraMetadataV2.from_dict({"version": 2, "tables": [table_entry]})
+
+        from_metadata = PermissionMatrix.from_metadata(metadata)
+        from_table_dicts = PermissionMatrix.from_table_dicts([table_entry])
+
+        assert from_metadata.roles == from_table_dicts.roles
+        for role in from_metadata.roles:
+            assert from_metadata.columns(role) == from_table_dicts.columns(role)
+            assert np.array_equal(
+                from_metadata.access(role), from_table_dicts.access(role)
+            )
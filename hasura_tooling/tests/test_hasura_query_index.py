@@ -0,0 +1,163 @@
+import pytest
+
+from hasura_tooling.hasura_metadata_sdk import HasuraMetadataV2
+from hasura_tooling.hasura_query_index import (
+    ParsedQueryCache,
+    QueryIndex,
+    Variable,
+    parse_query,
+    query_hash,
+)
+from tests.samples import sample_table_entry
+
+TEST_QUERY = """
+query TestQuery($id: Int!) {
+  test_table(where: {id: {_eq: $id}, test_table__remote_table: {name: {_eq: "a"}}}) {
+    id
+    ...TestFields
+    test_table__remote_table { name }
+  }
+}
+fragment TestFields on test_table { address }
+"""
+
+
+def sample_metadata() -> dict:
+    remote_table_entry = {
+        "table": {"schema": "public", "name": "remote_table"},
+        "configuration": {
+            "custom_root_fields": {"select_aggregate": "remotes_stats"},
+            "custom_column_names": {"display_name": "name"},
+        },
+    }
+    query_collection = {
+        "name": "allowed-queries",
+        "definition": {
+            "queries": [
+                {"name": "test_query", "query": TEST_QUERY},
+                {
+                    "name": "remote_stats",
+                    "query": "{ remotes_stats { aggregate { max { name } } } }",
+                },
+                {"name": "broken_query", "query": "{ test_table { id "},
+            ]
+        },
+    }
+    not_allowed_collection = {
+        "name": "other-queries",
+        "definition": {"queries": [{"name": "q", "query": "{ test_table { id } }"}]},
+    }
+    return {
+        "version": 2,
+        "tables": [sample_table_entry(), remote_table_entry],
+        "query_collections": [query_collection, not_allowed_collection],
+        "allowlist": [{"collection": "allowed-queries"}],
+    }
+
+
+class TestHasuraQueryIndex:
+    def test_parse_query(self):
+        parsed_query = parse_query(TEST_QUERY)
+
+        (operation,) = parsed_query.operations
+        (field,) = operation.selections
+        assert (operation.operation, operation.name) == ("query", "TestQuery")
+        assert field.name == "test_table"
+        assert field.arguments["where"]["id"] == {"_eq": Variable("id")}
+        assert list(parsed_query.fragments) == ["TestFields"]
+        assert query_hash(TEST_QUERY) == query_hash(
+            "# same query\n" + TEST_QUERY.replace("\n", " ").replace("    ", ", ")
+        )
+        with pytest.raises(ValueError):
+            parse_query("{ test_table { id }")
+
+    def test_index_allowlisted_queries(self):
+        metadata = HasuraMetadataV2.from_dict(sample_metadata())
+
+        index = QueryIndex.from_metadata(metadata)
+
+        assert index.queries() == [
+            ("allowed-queries", "test_query"),
+            ("allowed-queries", "remote_stats"),
+        ]
+        assert list(index.errors) == [("allowed-queries", "broken_query")]
+        usage = index.usage("allowed-queries", "test_query")
+        assert usage.tables == {"test_table", "remote_table"}
+        assert usage.relationships == {("test_table", "test_table__remote_table")}
+        assert usage.columns == {
+            ("test_table", "id"),
+            ("test_table", "address"),
+            ("remote_table", "display_name"),
+        }
+        assert index.queries_using_column("remote_table", "display_name") == [
+            ("allowed-queries", "test_query"),
+            ("allowed-queries", "remote_stats"),
+        ]
+        assert index.queries_using_relationship(
+            "test_table", "test_table__remote_table"
+        ) == [("allowed-queries", "test_query")]
+
+    def test_unresolved_root_fields(self):
+        index = QueryIndex(HasuraMetadataV2.from_dict(sample_metadata()).tables)
+
+        usage = index.add(
+            "collection",
+            "query",
+            "mutation { insert_test_table(objects: [{id: 1}]) { affected_rows } "
+            "login { token } }",
+        )
+
+        assert usage.tables == {"test_table"}
+        assert usage.columns == {("test_table", "id")}
+        assert usage.unresolved_root_fields == {"login"}
+        assert usage.unresolved_relationships == frozenset()
+
+    def test_unresolved_relationships(self):
+        metadata = sample_metadata()
+        test_table_entry = metadata["tables"][0]
+        test_table_entry["object_relationships"].append(
+            {
+                "name": "test_table__fk_table",
+                "using": {"foreign_key_constraint_on": "fk_table_id"},
+            }
+        )
+        test_table_entry["remote_relationships"] = [
+            {
+                "name": "test_table__remote_schema",
+                "definition": {
+                    "hasura_fields": ["id"],
+                    "remote_schema": "remote_schema",
+                    "remote_field": {"users": {"arguments": {"id": "$id"}}},
+                },
+            }
+        ]
+        index = QueryIndex(HasuraMetadataV2.from_dict(metadata).tables)
+
+        usage = index.add(
+            "collection",
+            "query",
+            '{ test_table(where: {test_table__fk_table: {name: {_eq: "a"}}}) '
+            "{ id test_table__fk_table { name } test_table__remote_schema { name } "
+            "test_table__remote_table { name } } }",
+        )
+        index.add("collection", "resolved_query", "{ test_table { id } }")
+
+        assert usage.unresolved_relationships == {
+            ("test_table", "test_table__fk_table")
+        }
+        assert usage.columns == {("test_table", "id"), ("remote_table", "display_name")}
+        assert index.queries_with_unresolved_relationships() == [
+            ("collection", "query")
+        ]
+
+    def test_parsed_queries_are_cached_on_disk(self, tmp_path):
+        cache_path = str(tmp_path / "parsed_queries.pickle")
+        cache = ParsedQueryCache(cache_path)
+        parsed_query = cache.parse(TEST_QUERY)
+        assert cache.parse(TEST_QUERY.replace("\n", "\n ")) is parsed_query
+        cache.save()
+
+        reloaded_cache = ParsedQueryCache(cache_path)
+
+        assert len(reloaded_cache) == 1
+        assert reloaded_cache.parse(TEST_QUERY) == parsed_query
@@ -0,0 +1,61 @@
+import os
+
+from hasura_tooling.shard_hasura_tables_yaml_lib import refresh_tables_yaml_shards
+from hasura_tooling.util_file_writer import FileWriter, metadata_file_writer
+from hasura_tooling.util_yaml_dumper import dump_yaml, dump_yaml_file
+from tests.samples import sample_table_entry, write_table_files
+
+
+class TestUtilFileWriter:
+    def test_unchanged_file_is_skipped(self, tmp_path):
+        file_path = tmp_path / "test_table.yaml"
+        writer = FileWriter()
+
+        assert writer.write(str(file_path), "a: 1\n") is True
+        os.chmod(file_path, 0o640)
+        os.utime(file_path, ns=(0, 0))
+        assert writer.write(str(file_path), "a: 1\n") is False
+        assert file_path.stat().st_mtime_ns == 0
+        assert writer.write(str(file_path), "a: 2\n") is True
+        assert writer.write(str(file_path), "a: é\n") is True
+
+        assert file_path.read_text() == "a: é\n"
+        assert file_path.stat().st_mode & 0o777 == 0o640
+        assert writer.stats() == {"written": 3, "skipped": 1}
+        assert os.listdir(tmp_path) == ["test_table.yaml"]
+
+    def test_dump_yaml_file(self, tmp_path):
+        file_path = str(tmp_path / "test_table.yaml")
+        kwargs = {"default_flow_style": False, "sort_keys": False}
+        stats = metadata_file_writer().stats()
+
+        assert dump_yaml_file(file_path, sample_table_entry(), **kwargs) is True
+        assert dump_yaml_file(file_path, sample_table_entry(), **kwargs) is False
+
+        assert open(file_path).read() == dump_yaml(sample_table_entry(), **kwargs)
+        assert metadata_file_writer().stats() == {
+            "written": stats["written"] + 1,
+            "skipped": stats["skipped"] + 1,
+        }
+
+    def test_refresh_keeps_unchanged_shards(self, tmp_path, monkeypatch):
+        tables_dir = tmp_path / "metadata" / "databases" / "default" / "tables"
+        tables_dir.mkdir(parents=True)
+        write_table_files(tables_dir)
+        shards_dir = tmp_path / "metadata" / "tables"
+        (shards_dir / "removed_table").mkdir(parents=True)
+        monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", "")
+        refresh_tables_yaml_shards()
+        shard_path = shards_dir / "test_table_0" / "test_role.yaml"
+        (shards_dir / "test_table_0" / "removed_role.yaml").write_text("role: x\n")
+        os.utime(shard_path, ns=(0, 0))
+
+        tables = refresh_tables_yaml_shards()
+
+        assert sorted(tables) == sorted(os.listdir(shards_dir))
+        assert sorted(os.listdir(shards_dir / "test_table_0")) == [
+            "_table.yaml",
+            "test_role.yaml",
+        ]
+        assert shard_path.stat().st_mtime_ns == 0
@@ -1,5 +1,9 @@
 from os import path, name
 import logging
+import sys
+
+import pytest
+import yaml
 
 from hasura_tooling.util_filepath_and_fileloader import (
     sharded_tables_dir,
@@ -7,6 +11,8 @@ from hasura_tooling.util_filepath_and_fileloader import (
     end_to_end_tests_root_dir,
     relationships_end_to_end_dir,
     migrations_dir,
+    load_yaml,
+    yield_by_table_metadata_parallel,
 )
 
 
@@ -56,3 +62,42 @@ class TestUtilFilePathAndFileLoader:
         assert res
         assert "migrations" in res
         assert directory_is_valid(res)
+
+    def test_load_yaml_interns_strings(self):
+        document = """
+        role: test_role
+        permission:
+          columns: [id, address]
+          filter: {id: {_eq: X-Hasura-User-Id}}
+        """
+        res = load_yaml(document)
+        other_res = load_yaml(document)
+
+        assert res == yaml.safe_load(document)
+        assert res["role"] is other_res["role"]
+        assert res["permission"]["columns"][0] is other_res["permission"]["columns"][0]
+        assert next(iter(res["permission"]["filter"])) is sys.intern("id")
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_yield_by_table_metadata_parallel(self, tmp_path, monkeypatch, processes):
+        from hasura_tooling.check_hasura_metadata_tables_yaml import (
+            collect_tables_and_columns_from_tables_yaml,
+        )
+        from tests.samples import write_table_files
+
+        tables_dir = tmp_path / "metadata" / "databases" / "default" / "tables"
+        tables_dir.mkdir(parents=True)
+        write_table_files(tables_dir, count=12)
+        (tables_dir / "tables.yaml").write_text("- '!include public_test_table_0.yaml'")
+        monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", str(tmp_path / "cache"))
+
+        tables = yield_by_table_metadata_parallel(processes, chunk_size=5)
+
+        assert next(tables)["table"]["name"] == "test_table_0"
+        assert [table["table"]["name"] for table in tables] == [
+            f"test_table_{i}" for i in [1, 10, 11, 2, 3, 4, 5, 6, 7, 8, 9]
+        ]
+        assert collect_tables_and_columns_from_tables_yaml(processes)[
+            "test_table_3"
+        ] == {"id", "address", "*"}
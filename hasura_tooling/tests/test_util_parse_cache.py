@@ -0,0 +1,119 @@
+import os
+import sys
+
+from hasura_tooling.util_filepath_and_fileloader import (
+    load_yaml,
+    load_yaml_file,
+    metadata_parse_cache,
+    yield_by_table_metadata,
+)
+from hasura_tooling.util_parse_cache import RACY_SECONDS, ParseCache
+from tests.samples import write_table_files
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, document: str):
+        self.calls += 1
+        return load_yaml(document)
+
+
+def age(file_path: str, seconds: float = 2 * RACY_SECONDS):
+    """Moves the modification time of `file_path` back `seconds`."""
+    stat = os.stat(file_path)
+    os.utime(file_path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+class TestUtilParseCache:
+    def test_unchanged_files_are_not_parsed_again(self, tmp_path):
+        file_paths = write_table_files(tmp_path)
+        for file_path in file_paths:
+            age(file_path)
+        load = CountingLoader()
+        cache = ParseCache(str(tmp_path / "cache"), load, intern_strings=True)
+
+        parsed = [cache.load(file_path) for file_path in file_paths]
+        cached = [ParseCache(cache.cache_dir, load).load(path) for path in file_paths]
+        res = cache.load(file_paths[0])
+
+        assert load.calls == 2
+        assert cache.stats() == {"hits": 1, "misses": 2}
+        assert cached == parsed
+        assert res is not parsed[0]
+        assert res["table"]["name"] is sys.intern("test_table_0")
+
+    def test_changed_file_is_parsed_again(self, tmp_path):
+        (file_path,) = write_table_files(tmp_path, count=1)
+        age(file_path)
+        load = CountingLoader()
+        cache = ParseCache(str(tmp_path / "cache"), load)
+        cache.load(file_path)
+        with open(file_path, "a") as f:
+            f.write("is_enum: true\n")
+        age(file_path, RACY_SECONDS / 2)
+
+        # modified too recently to be cached
+        assert cache.load(file_path)["is_enum"] is True
+        assert cache.load(file_path)["is_enum"] is True
+        assert cache.stats() == {"hits": 0, "misses": 3}
+        age(file_path)
+        cache.load(file_path)
+
+        assert cache.load(file_path)["is_enum"] is True
+        assert cache.stats() == {"hits": 1, "misses": 4}
+
+    def test_content_hash_survives_touch(self, tmp_path):
+        (file_path,) = write_table_files(tmp_path, count=1)
+        (empty_file_path := tmp_path / "empty.yaml").write_text("")
+        load = CountingLoader()
+        cache = ParseCache(str(tmp_path / "cache"), load, verify_content=True)
+        parsed = cache.load(file_path)
+        assert cache.load(str(empty_file_path)) is None
+        os.utime(file_path)
+
+        assert cache.load(file_path) == parsed
+        assert cache.load(str(empty_file_path)) is None
+        assert load.calls == 2
+        assert cache.stats() == {"hits": 2, "misses": 2}
+
+    def test_load_yaml_file(self, tmp_path, monkeypatch):
+        (file_path,) = write_table_files(tmp_path, count=1)
+        age(file_path)
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", str(tmp_path / "cache"))
+        cache = metadata_parse_cache()
+
+        parsed = load_yaml_file(file_path)
+        res = load_yaml_file(file_path)
+
+        assert res == parsed == load_yaml(open(file_path).read())
+        assert cache.stats() == {"hits": 1, "misses": 1}
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", "")
+        assert metadata_parse_cache().cache_dir is None
+
+    def test_yield_by_table_metadata(self, tmp_path, monkeypatch):
+        tables_dir = tmp_path / "metadata" / "databases" / "default" / "tables"
+        tables_dir.mkdir(parents=True)
+        for file_path in write_table_files(tables_dir, count=3):
+            age(file_path)
+        (tables_dir / "tables.yaml").write_text("- '!include public_test_table_0.yaml'")
+        monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+        monkeypatch.setenv("HASURA_TOOLING_CACHE_DIR", str(tmp_path / "cache"))
+        cache = metadata_parse_cache()
+        parsed = list(yield_by_table_metadata())
+        with open(tables_dir / "public_test_table_1.yaml", "a") as f:
+            f.write("is_enum: true\n")
+        age(str(tables_dir / "public_test_table_1.yaml"))
+
+        tables = yield_by_table_metadata()
+
+        assert next(tables) == parsed[0]
+        assert cache.stats() == {"hits": 1, "misses": 3}
+        assert [table.get("is_enum") for table in tables] == [True, None]
+        assert cache.stats() == {"hits": 2, "misses": 4}
+        assert [table["table"]["name"] for table in parsed] == [
+            "test_table_0",
+            "test_table_1",
+            "test_table_2",
+        ]
@@ -0,0 +1,91 @@
+import copy
+
+import pytest
+import yaml
+
+from hasura_tooling.util_persistent_metadata import (
+    FrozenList,
+    FrozenMap,
+    assoc_in,
+    freeze,
+    thaw,
+    unwrap,
+    update_in,
+)
+from hasura_tooling.util_yaml_dumper import (
+    IndentedListYamlDumper,
+    UnaliasedIndentedListYamlDumper,
+)
+from tests.samples import sample_table_entry
+
+
+def dump(data, dumper=IndentedListYamlDumper) -> str:
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, sort_keys=False)
+
+
+class TestUtilPersistentMetadata:
+    def test_edits_share_unchanged_subtrees(self):
+        table_entry = sample_table_entry()
+        original = copy.deepcopy(table_entry)
+        table = freeze(table_entry)
+
+        edited = update_in(
+            table,
+            ("select_permissions", 0, "permission", "columns"),
+            lambda columns: columns.append("name"),
+        )
+
+        assert table == original
+        assert edited["select_permissions"][0]["permission"]["columns"] == [
+            "address",
+            "id",
+            "name",
+        ]
+        assert unwrap(edited["table"]) is unwrap(table["table"])
+        assert unwrap(edited["select_permissions"][1]) is (
+            unwrap(table["select_permissions"][1])
+        )
+        assert unwrap(edited["select_permissions"][0]["permission"]["filter"]) is (
+            unwrap(table["select_permissions"][0]["permission"]["filter"])
+        )
+
+    def test_frozen_values_are_read_only(self):
+        table = freeze(sample_table_entry())
+
+        assert isinstance(table, FrozenMap)
+        assert isinstance(table["select_permissions"], FrozenList)
+        with pytest.raises(TypeError):
+            table["table"] = {}
+        assert not hasattr(table["select_permissions"], "sort")
+
+    def test_list_and_map_edits(self):
+        columns = FrozenList(["b", "a", "c"])
+
+        assert columns.sorted() == ["a", "b", "c"]
+        assert columns.remove("a") == ["b", "c"]
+        assert columns.set(0, "d") == ["d", "a", "c"]
+        assert columns == ["b", "a", "c"]
+        with pytest.raises(ValueError):
+            columns.remove("e")
+        permission = FrozenMap(columns=columns, limit=100)
+        assert permission.delete("limit") == {"columns": ["b", "a", "c"]}
+        assert assoc_in(permission, ("limit",), 10) == {
+            "columns": ["b", "a", "c"],
+            "limit": 10,
+        }
+        assert thaw(permission) == {"columns": ["b", "a", "c"], "limit": 100}
+        assert type(thaw(permission)["columns"]) is list
+
+    def test_dumps_like_plain_yaml(self):
+        table = freeze(sample_table_entry())
+        relationship = table["object_relationships"][0]
+        edited = update_in(
+            table,
+            ("object_relationships",),
+            lambda rels: rels.append(relationship.set("name", "test_rel_2")),
+        )
+        expected = edited.thaw()
+
+        assert dump(table) == dump(sample_table_entry())
+        assert "&id" in dump(edited)
+        assert dump(edited, UnaliasedIndentedListYamlDumper) == dump(expected)
@@ -0,0 +1,32 @@
+from hasura_tooling.util_filepath_and_fileloader import load_yaml
+from hasura_tooling.util_snapshot_cache import (
+    SNAPSHOT_MAGIC,
+    read_snapshot,
+    write_snapshot,
+)
+from tests.samples import write_table_files
+
+
+class TestUtilSnapshotCache:
+    def test_snapshot_is_read_for_its_manifest(self, tmp_path):
+        file_paths = write_table_files(tmp_path)
+        snapshot_path = str(tmp_path / "cache" / "tables.pickle")
+        manifest = [(file_path, "1") for file_path in file_paths]
+        parsed = [load_yaml(open(file_path).read()) for file_path in file_paths]
+
+        write_snapshot(snapshot_path, manifest, parsed)
+
+        assert read_snapshot(snapshot_path, manifest) == parsed
+        assert read_snapshot(snapshot_path, manifest[:1]) is None
+        assert read_snapshot(snapshot_path, [(file_paths[0], "2")] + manifest[1:]) is (
+            None
+        )
+
+    def test_unreadable_snapshot_is_ignored(self, tmp_path):
+        snapshot_path = tmp_path / "tables.pickle"
+        snapshot_path.write_bytes(SNAPSHOT_MAGIC + b"\xff" * 4)
+
+        assert read_snapshot(str(snapshot_path), []) is None
+        assert read_snapshot(str(tmp_path / "missing.pickle"), []) is None
+        write_snapshot(str(snapshot_path), [], {"a": 1})
+        assert read_snapshot(str(snapshot_path), []) == {"a": 1}
@@ -0,0 +1,51 @@
+import io
+
+import pytest
+import yaml
+
+from hasura_tooling.util_persistent_metadata import freeze
+from hasura_tooling.util_yaml_dumper import (
+    IndentedListYamlDumper,
+    UnaliasedIndentedListYamlDumper,
+    dump_yaml,
+)
+from tests.samples import sample_table_entry
+
+
+def sample_documents() -> list:
+    table_entry = sample_table_entry()
+    table_entry["select_permissions"][0]["permission"]["filter"] = {
+        "_or": [{"id": {"_in": ["1", "", "02"]}}, {"address": {"_is_null": True}}]
+    }
+    return [
+        table_entry,
+        [table_entry, [["nested", ["sequences"]], {"a": [{"b": []}]}]],
+        {"comment": "a long comment " * 10, "id": "1"},
+        {"comment": "first line\nsecond line"},
+        {"": "empty key", "é": "non-ASCII"},
+        {"key": "x" * 200},
+    ]
+
+
+class TestUtilYamlDumper:
+    @pytest.mark.parametrize("document", sample_documents())
+    @pytest.mark.parametrize("sort_keys", [False, True])
+    def test_dump_yaml_is_byte_identical(self, document, sort_keys):
+        kwargs = {"default_flow_style": False, "sort_keys": sort_keys}
+
+        res = dump_yaml(document, Dumper=IndentedListYamlDumper, **kwargs)
+
+        assert res == yaml.dump(document, Dumper=IndentedListYamlDumper, **kwargs)
+
+    def test_dump_yaml_to_stream_unaliased(self):
+        shared_columns = ["id", "address"]
+        document = freeze(
+            {"a": {"columns": shared_columns}, "b": [{"columns": shared_columns}]}
+        )
+        stream = io.StringIO()
+
+        assert dump_yaml(document, stream, UnaliasedIndentedListYamlDumper) is None
+        assert stream.getvalue() == yaml.dump(
+            document, Dumper=UnaliasedIndentedListYamlDumper
+        )
+        assert "&" not in stream.getvalue()
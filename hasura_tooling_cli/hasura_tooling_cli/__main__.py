@@ -1,3 +1,4 @@
+import atexit
 import click
 import logging
 from os import environ
@@ -16,6 +17,8 @@ from hasura_tooling.shard_hasura_tables_yaml_lib import (
     refresh_tables_yaml_shards,
 )
 from hasura_tooling.create_bq_metadata_by_role import create_bq_api_metadata_by_role
+from hasura_tooling.util_file_writer import metadata_file_writer
+from hasura_tooling.util_filepath_and_fileloader import metadata_parse_cache
 from hasura_tooling.remote_schema_permissions import (
     add_remote_schema_permissions,
     remove_remote_schema_permissions,
@@ -134,7 +137,8 @@ def shard(refresh: bool):
     """
     Shards hasura metadata, which breaks down git diffs by file and makes it more reviewable in PRs.
 
-    Additional Details: refreshes shards -- Deletes all shards and recreates them from hasura metadata.
+    Additional Details: refreshes shards -- Recreates all shards from hasura metadata and deletes the
+    outdated ones. Shards whose contents are unchanged are not rewritten.
     Invoked by hasura_tooling at the start of beginning of the workflow to ensure consistency.
 
     NOTE:
@@ -154,7 +158,7 @@ def shard(refresh: bool):
 
     Options:
 
-    -r, --refresh: whether to delete all contents of shards directory (`servers/graphql2/metadata/tables/),
+    -r, --refresh: whether to delete the outdated contents of shards directory (`servers/graphql2/metadata/tables/),
     or to just only shard hasura metadata and update shards. DEFAULTS TO TRUE.
 
     The risk of not refreshing: if there are extraneous shards those shards will remain and cause regressions.
@@ -208,4 +212,10 @@ if __name__ == "__main__":
     """
     logging.getLogger().setLevel(environ.get("LOGLEVEL", "INFO"))
     logging.info("Tooling Maturity Level: Alpha")
+    atexit.register(
+        lambda: logging.debug(f"Metadata parse cache: {metadata_parse_cache().stats()}")
+    )
+    atexit.register(
+        lambda: logging.info(f"Metadata files: {metadata_file_writer().stats()}")
+    )
     cli()
@@ -1,14 +1,26 @@
 import yaml
 import logging
 import os
-import copy
 
 from hasura_tooling.util_filepath_and_fileloader import (
     sharded_tables_dir,
     api_data_supersets_metadata,
     supersets_metadata_filepath,
 )
-from hasura_tooling.util_yaml_dumper import IndentedListYamlDumper
+from hasura_tooling.hasura_metadata_changeset import (
+    Changeset,
+    RemoveColumns,
+    apply_changeset,
+)
+from hasura_tooling.shard_hasura_tables_yaml_lib import (
+    read_table_shards,
+    write_table_shards,
+)
+from hasura_tooling.util_persistent_metadata import freeze, update_in
+from hasura_tooling.util_yaml_dumper import (
+    IndentedListYamlDumper,
+    UnaliasedIndentedListYamlDumper,
+)
 
 
 def deprecated_columns_metadata() -> list:
@@ -59,7 +71,10 @@ def deprecate_relationships():
         )
         with open(table_yaml_header_file, "r") as p:
             table_yaml_contents = yaml.safe_load(p)
-        table_yaml_contents_output = copy.deepcopy(table_yaml_contents)
+        # edits return new versions that share the unchanged relationships. the
+        # replacement relationship shares `using` with the deprecated one, hence the
+        # unaliased dumper.
+        table_yaml_contents_output = freeze(table_yaml_contents)
         replacement_rel_metadata = []
         replacement_rel_type = ""
         if "object_relationships" in table_yaml_contents:
@@ -73,7 +88,7 @@ def deprecate_relationships():
                     logging.info(
                         f"matching relationship found: {row['origin_table']}.{row['rel_name']}"
                     )
-                    replacement_rel_metadata = copy.deepcopy(obj_rel)
+                    replacement_rel_metadata = freeze(obj_rel)
                     replacement_rel_type = "object"
                     # relationships are unique when grouped by origin_table & rel_name, so it's safe to assume
                     # if a relationship is found under obj_rels, it's the only rel to be updated for that metadata_row,
@@ -89,8 +104,10 @@ def deprecate_relationships():
                             == row["remote_table"]
                         ) or (row["replacement_rel_name"] == "n/a"):
                             # if replacement relationship exists, delete to-be-deprecated relationship
-                            table_yaml_contents_output["object_relationships"].remove(
-                                obj_rel
+                            table_yaml_contents_output = update_in(
+                                table_yaml_contents_output,
+                                ("object_relationships",),
+                                lambda rels: rels.remove(obj_rel),
                             )
                             logging.info(
                                 f"replacement relationship found, removing {row['rel_name']}"
@@ -112,7 +129,7 @@ def deprecate_relationships():
                         logging.info(
                             f"matching relationship found: {row['origin_table']}.{row['rel_name']}"
                         )
-                        replacement_rel_metadata = copy.deepcopy(array_rel)
+                        replacement_rel_metadata = freeze(array_rel)
                         replacement_rel_type = "array"
                         rel_found = True
                         for array_rel2 in table_yaml_contents["array_relationships"]:
@@ -124,9 +141,11 @@ def deprecate_relationships():
                                 == row["remote_table"]
                             ) or (row["replacement_rel_name"] == "n/a"):
                                 # if replacement relationship exists, delete to-be-deprecated relationship
-                                table_yaml_contents_output[
-                                    "array_relationships"
-                                ].remove(array_rel)
+                                table_yaml_contents_output = update_in(
+                                    table_yaml_contents_output,
+                                    ("array_relationships",),
+                                    lambda rels: rels.remove(array_rel),
+                                )
                                 logging.info(
                                     f"replacement relationship found, removing {row['rel_name']}"
                                 )
@@ -141,9 +160,13 @@ def deprecate_relationships():
         # only if relationship is found and not replaced yet
         if not rel_replaced:
             logging.info("No replacement relationship found...")
-            replacement_rel_metadata["name"] = row["replacement_rel_name"]
-            table_yaml_contents_output[f"{replacement_rel_type}_relationships"].append(
-                replacement_rel_metadata
+            replacement_rel_metadata = replacement_rel_metadata.set(
+                "name", row["replacement_rel_name"]
+            )
+            table_yaml_contents_output = update_in(
+                table_yaml_contents_output,
+                (f"{replacement_rel_type}_relationships",),
+                lambda rels: rels.append(replacement_rel_metadata),
             )
             replacement_rels_created += 1
             replacement_rels_list.append(
@@ -153,7 +176,7 @@ def deprecate_relationships():
             yaml.dump(
                 table_yaml_contents_output,
                 w,
-                Dumper=IndentedListYamlDumper,
+                Dumper=UnaliasedIndentedListYamlDumper,
                 default_flow_style=False,
                 sort_keys=False,
             )
@@ -163,33 +186,22 @@ def deprecate_relationships():
 
 def deprecate_columns():
     deprec_cols_metadata = deprecated_columns_metadata()
-    sharded_tables_dir = sharded_tables_dir()
+    # deprecations are batched, so each role shard is read and written at most once
+    shard_tables = read_table_shards(
+        {row["table_name"] for row in deprec_cols_metadata}
+    )
+    changeset = Changeset()
     for row in deprec_cols_metadata:
-        table_name = row["table_name"]
-        for subdir, dirs, files in os.walk(
-            os.path.join(sharded_tables_dir, table_name)
-        ):
-            for role_shard_yaml in files:
-                if role_shard_yaml != "_table.yaml":
-                    role_shard_yaml_filepath = os.path.join(
-                        sharded_tables_dir, table_name, role_shard_yaml
-                    )
-                    with open(role_shard_yaml_filepath, "r") as p:
-                        table_yaml_contents = yaml.safe_load(p)
-                    for column in table_yaml_contents["permission"]["columns"]:
-                        if column == row["column_name"]:
-                            table_yaml_contents["permission"]["columns"].remove(column)
-                            with open(role_shard_yaml_filepath, "w") as role_shard_yaml:
-                                yaml.dump(
-                                    table_yaml_contents,
-                                    role_shard_yaml,
-                                    Dumper=IndentedListYamlDumper,
-                                    default_flow_style=False,
-                                    sort_keys=False,
-                                )
-                            logging.info(
-                                f"matching column found & deprecating: {row['table_name']}.{row['column_name']}"
-                            )
+        table_metadata = shard_tables.get(row["table_name"])
+        if table_metadata is None:
+            continue
+        for role_perm_def in table_metadata.get("select_permissions") or []:
+            if row["column_name"] in role_perm_def["permission"]["columns"]:
+                logging.info(
+                    f"matching column found & deprecating: {row['table_name']}.{row['column_name']}"
+                )
+        changeset.add(RemoveColumns(row["table_name"], (row["column_name"],)))
+    write_table_shards(apply_changeset(shard_tables, changeset), shard_tables)
 
 
 def deprecate_columns_in_supersets():
@@ -201,7 +213,7 @@ def deprecate_columns_in_supersets():
         else:
             consolidated_deprec_dict[row["table_name"]].append(row["column_name"])
     supersets_metadata = api_data_supersets_metadata()
-    supersets_metadata_output = copy.deepcopy(supersets_metadata)
+    supersets_metadata_output = freeze(supersets_metadata)
     for superset, table_perm_def in supersets_metadata.items():
         if superset == "superset1":
             for table, perm_def in table_perm_def.items():
@@ -209,9 +221,11 @@ def deprecate_columns_in_supersets():
                     if "columns" in perm_def.keys():
                         for column in perm_def["columns"]:
                             if column in consolidated_deprec_dict[table]:
-                                supersets_metadata_output[superset][table][
-                                    "columns"
-                                ].remove(column)
+                                supersets_metadata_output = update_in(
+                                    supersets_metadata_output,
+                                    (superset, table, "columns"),
+                                    lambda columns: columns.remove(column),
+                                )
     with open(supersets_metadata_filepath(), "w") as w:
         yaml.dump(
             supersets_metadata_output,
@@ -0,0 +1,50 @@
+import yaml
+
+from hasura_tooling.shard_hasura_tables_yaml_lib import (
+    read_table_shards,
+    write_table_shards,
+)
+from hasura_tooling_cli import deprecate_relationships_and_columns
+
+
+def sample_enum_table():
+    return {"table": {"schema": "public", "name": "enum_table"}, "is_enum": True}
+
+
+def sample_tables():
+    return {
+        "test_table": {
+            "table": {"schema": "public", "name": "test_table"},
+            "select_permissions": [
+                {
+                    "role": "test_role",
+                    "permission": {"columns": ["id", "name"], "filter": {}},
+                }
+            ],
+        },
+    }
+
+
+def test_deprecate_columns_with_header_only_shards(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRAPHQL2_ROOTDIR", str(tmp_path))
+    monkeypatch.setattr(
+        deprecate_relationships_and_columns,
+        "deprecated_columns_metadata",
+        lambda: [
+            {"table_name": "enum_table", "column_name": "name"},
+            {"table_name": "test_table", "column_name": "name"},
+        ],
+    )
+    write_table_shards(sample_tables(), {})
+    # header-only shard, as shard_hasura_tables_yaml writes them for enum tables
+    enum_table_dir = tmp_path / "metadata" / "tables" / "enum_table"
+    enum_table_dir.mkdir()
+    (enum_table_dir / "_table.yaml").write_text(yaml.dump(sample_enum_table()))
+
+    deprecate_relationships_and_columns.deprecate_columns()
+
+    tables = read_table_shards()
+    assert tables["enum_table"] == sample_enum_table()
+    assert tables["test_table"]["select_permissions"] == [
+        {"role": "test_role", "permission": {"columns": ["id"], "filter": {}}}
+    ]
@@ -2,8 +2,8 @@ import pytest
 import logging
 import yaml
 import itertools
-from typing import Dict
 
+from hasura_tooling.hasura_metadata_index import MetadataIndex
 from hasura_tooling.hasura_metadata_sdk import (
     table_entry_from_dict,
     select_permission_from_dict,
@@ -29,25 +29,8 @@ def tables_yaml_with_hasura_obj_model():
 
 
 @pytest.fixture(scope="session")
-def tables_and_roles_hash_dict(tables_yaml_with_hasura_obj_model: list):
-    hash_dict: Dict[str, dict] = dict()
-    for table_entry in tables_yaml_with_hasura_obj_model:
-        table_name = table_entry.table.name
-        hash_dict[table_name] = {
-            "index": tables_yaml_with_hasura_obj_model.index(table_entry)
-        }
-        hash_dict[table_name]["roles"] = dict()
-        if table_entry.select_permissions:
-            for role in table_entry.select_permissions:
-                role_name = role.role
-                hash_dict[table_name]["roles"][
-                    role_name
-                ] = table_entry.select_permissions.index(role)
-        else:
-            logging.warning(
-                f"No select_permissions in {table_name}. Skipping roles hash dict creation."
-            )
-    return hash_dict
+def metadata_index(tables_yaml_with_hasura_obj_model: list):
+    return MetadataIndex(tables_yaml_with_hasura_obj_model)
 
 
 # @pytest.fixture(scope='session')
@@ -68,18 +51,11 @@ def setup_ui_access_roles_lkp_table_permdef_requirements() -> list:
 def test_ui_access_roles_lkp_table_permdef_requirements(
     lkp_table_name: str,
     ui_role: str,
-    tables_yaml_with_hasura_obj_model: list,
     domain_rules: dict,
-    tables_and_roles_hash_dict: dict,
+    metadata_index: MetadataIndex,
 ):
-    assert ui_role in tables_and_roles_hash_dict[lkp_table_name]["roles"]
-    table_entry = tables_yaml_with_hasura_obj_model[
-        tables_and_roles_hash_dict[lkp_table_name]["index"]
-    ]
-    roles_hash_dict = tables_and_roles_hash_dict[lkp_table_name]["roles"]
-    role_permissions = table_entry.select_permissions[
-        roles_hash_dict[ui_role]
-    ].permission
+    assert ui_role in metadata_index.roles_by_table(lkp_table_name)
+    role_permissions = metadata_index.permission(lkp_table_name, ui_role).permission
     lkp_permdef_req = select_permission_from_dict(
         domain_rules["test_ui_roles_lkp_tables_permdef"][
             "lkp_permdef_reqs_for_ui_roles"
@@ -108,10 +84,9 @@ def setup_inactive_roles_have_no_permissions() -> list:
 
 @pytest.mark.parametrize("inactive_role", setup_inactive_roles_have_no_permissions())
 def test_inactive_roles_have_no_permissions(
-    inactive_role: str, tables_and_roles_hash_dict: dict
+    inactive_role: str, metadata_index: MetadataIndex
 ):
-    for table_name in tables_and_roles_hash_dict:
-        assert inactive_role not in tables_and_roles_hash_dict[table_name]["roles"]
+    assert metadata_index.tables_by_role(inactive_role) == []
 
 
 def setup_private_tables_only_accessible_by_owner_and_superuser() -> list:
@@ -143,14 +118,14 @@ def superuser_roles(domain_rules: dict):
 def test_private_tables_only_accessible_by_owner_and_superuser(
     analogous_private_roles: list,
     private_table: str,
-    tables_and_roles_hash_dict: dict,
+    metadata_index: MetadataIndex,
     superuser_roles: list,
 ):
     roles_allowed_to_access_private_table = set(analogous_private_roles).union(
         set(superuser_roles)
     )
     assert (
-        set(tables_and_roles_hash_dict[private_table]["roles"])
+        set(metadata_index.roles_by_table(private_table))
         - roles_allowed_to_access_private_table
         == set()
     )
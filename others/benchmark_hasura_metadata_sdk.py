@@ -0,0 +1,272 @@
+"""
+Benchmarks of the hasura_metadata_sdk models against a large, synthetic metadata set.
+
+Usage (hasura_tooling must be importable, ie. REPO_ROOTDIR set):
+    python others/benchmark_hasura_metadata_sdk.py [n_tables] [n_roles] [n_columns]
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from hasura_tooling import hasura_metadata_sdk, hasura_metadata_sdk_slots
+from hasura_tooling.hasura_metadata_sdk_stream import iter_table_entries
+from hasura_tooling.util_filepath_and_fileloader import load_yaml
+
+
+def synthetic_table(i: int, n_tables: int, n_roles: int, n_columns: int) -> Dict:
+    columns = [f"column_{j}" for j in range(n_columns)]
+    return {
+        "table": {"schema": "public", "name": f"table_{i}"},
+        "object_relationships": [
+            {
+                "name": f"table_{i}__table_{(i + k) % n_tables}",
+                "using": {
+                    "manual_configuration": {
+                        "column_mapping": {"id": f"table_{i}_id"},
+                        "remote_table": {
+                            "schema": "public",
+                            "name": f"table_{(i + k) % n_tables}",
+                        },
+                    }
+                },
+            }
+            for k in range(1, 4)
+        ],
+        "array_relationships": [
+            {
+                "name": f"table_{i}__table_{(i + k) % n_tables}s",
+                "using": {
+                    "manual_configuration": {
+                        "column_mapping": {f"table_{i}_id": "id"},
+                        "remote_table": {
+                            "schema": "public",
+                            "name": f"table_{(i + k) % n_tables}",
+                        },
+                    }
+                },
+            }
+            for k in range(4, 6)
+        ],
+        "select_permissions": [
+            {
+                "role": f"role_{r}",
+                "permission": {
+                    "columns": columns[: n_columns // 2 + r % (n_columns // 2)],
+                    "filter": (
+                        {"column_1": {"_eq": "X-Hasura-User-Id"}} if r % 3 == 0 else {}
+                    ),
+                    "limit": 100,
+                    "allow_aggregations": r % 2 == 0,
+                    "computed_fields": [],
+                },
+            }
+            for r in range(n_roles)
+        ],
+    }
+
+
+def synthetic_metadata(
+    n_tables: int = 500, n_roles: int = 40, n_columns: int = 30
+) -> Dict:
+    return {
+        "version": 2,
+        "tables": [
+            synthetic_table(i, n_tables, n_roles, n_columns) for i in range(n_tables)
+        ],
+    }
+
+
+def measure_allocated_bytes(build: Callable[[], object]) -> int:
+    """Bytes still allocated by the object `build` returns, excluding temporaries."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return allocated
+
+
+def measure_peak_bytes(run: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def string_stats(obj: Any) -> Dict[str, int]:
+    """Counts the string references reachable from `obj`, the distinct string objects they
+    point to, and the bytes those objects hold.
+    """
+    stats = {"references": 0, "objects": 0, "bytes": 0}
+    seen_strings = set()
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, str):
+            stats["references"] += 1
+            if id(x) not in seen_strings:
+                seen_strings.add(id(x))
+                stats["objects"] += 1
+                stats["bytes"] += sys.getsizeof(x)
+        elif isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, list):
+            stack.extend(x)
+        elif hasattr(x, "__dataclass_fields__"):
+            stack.extend(getattr(x, name) for name in x.__dataclass_fields__)
+    return stats
+
+
+def benchmark_string_interning(metadata: Dict) -> List[Dict]:
+    # json.loads creates a string object per occurrence of every value, like a yaml load
+    parsed_metadata = json.loads(json.dumps(metadata))
+    yaml_tables = yaml.dump(metadata["tables"][:50])
+    return [
+        {
+            "data": "json.loads",
+            **string_stats(parsed_metadata),
+        },
+        {
+            "data": "HasuraMetadataV2.from_dict",
+            **string_stats(
+                hasura_metadata_sdk.HasuraMetadataV2.from_dict(parsed_metadata)
+            ),
+        },
+        {
+            "data": "yaml.safe_load (50 tables)",
+            **string_stats(yaml.safe_load(yaml_tables)),
+        },
+        {
+            "data": "load_yaml (50 tables)",
+            **string_stats(load_yaml(yaml_tables)),
+        },
+    ]
+
+
+def benchmark_slots_memory(metadata: Dict) -> List[Dict]:
+    results = []
+    for sdk in (hasura_metadata_sdk, hasura_metadata_sdk_slots):
+        results.append(
+            {
+                "variant": sdk.__name__.rsplit(".", 1)[-1],
+                "bytes": measure_allocated_bytes(
+                    lambda: sdk.HasuraMetadataV2.from_dict(metadata)
+                ),
+            }
+        )
+    return results
+
+
+def measure_seconds(run: Callable[[], object], repeat: int = 5) -> float:
+    return min(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def benchmark_lazy_table_entry_scans(metadata: Dict) -> List[Dict]:
+    tables = metadata["tables"]
+    scans = {
+        "full decode": lambda table_entry: table_entry.to_dict(),
+        "name-only scan": lambda table_entry: table_entry.table.name,
+        "role-only scan": lambda table_entry: [
+            p.role for p in table_entry.select_permissions or []
+        ],
+    }
+    results = []
+    for scan, read in scans.items():
+        for from_dict in (
+            hasura_metadata_sdk.TableEntry.from_dict,
+            hasura_metadata_sdk.LazyTableEntry.from_dict,
+        ):
+            results.append(
+                {
+                    "scan": scan,
+                    "variant": from_dict.__qualname__.split(".")[0],
+                    "seconds": measure_seconds(
+                        lambda: [read(from_dict(table)) for table in tables]
+                    ),
+                }
+            )
+    return results
+
+
+def benchmark_streaming_peak_memory(metadata: Dict) -> List[Dict]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        metadata_path = os.path.join(tmp_dir, "metadata.json")
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f)
+
+        def full_decode():
+            with open(metadata_path) as f:
+                return hasura_metadata_sdk.hasura_metadata_v2_from_dict(json.load(f))
+
+        def streaming_scan():
+            for table_entry in iter_table_entries(metadata_path):
+                table_entry.table.name
+
+        return [
+            {
+                "reader": "json.load + from_dict",
+                "bytes": measure_peak_bytes(full_decode),
+            },
+            {
+                "reader": "iter_table_entries",
+                "bytes": measure_peak_bytes(streaming_scan),
+            },
+        ]
+
+
+def main():
+    if {"-h", "--help"} & set(sys.argv[1:]):
+        print(__doc__.strip())
+        return
+    n_tables, n_roles, n_columns = (
+        int(arg) for arg in (sys.argv[1:] + ["500", "40", "30"])[:3]
+    )
+    metadata = synthetic_metadata(n_tables, n_roles, n_columns)
+    print(f"{n_tables} tables x {n_roles} select permissions x {n_columns} columns")
+    results = benchmark_slots_memory(metadata)
+    baseline = results[0]["bytes"]
+    for result in results:
+        print(
+            f"{result['variant']:<28} {result['bytes'] / 2 ** 20:8.1f} MiB"
+            f"  ({result['bytes'] / baseline:.0%})"
+        )
+    print()
+    results = benchmark_lazy_table_entry_scans(metadata)
+    for eager, lazy in zip(results[::2], results[1::2]):
+        print(
+            f"{eager['scan']:<16} {eager['variant']} {eager['seconds']:7.3f}s"
+            f"  {lazy['variant']} {lazy['seconds']:7.3f}s"
+            f"  ({lazy['seconds'] / eager['seconds']:.0%})"
+        )
+    print()
+    results = benchmark_string_interning(metadata)
+    for result in results:
+        print(
+            f"{result['data']:<28} {result['references']:>9} str references"
+            f" {result['objects']:>9} str objects {result['bytes'] / 2 ** 20:8.1f} MiB"
+        )
+    print()
+    results = benchmark_streaming_peak_memory(metadata)
+    for result in results:
+        print(f"{result['reader']:<28} {result['bytes'] / 2 ** 20:8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()